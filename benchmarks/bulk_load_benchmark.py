@@ -0,0 +1,195 @@
+"""
+Benchmark for bulk chunk ingest.
+
+Loads synthetic research chunks into a scratch copy of research_chunks
+three ways and reports rows per second:
+
+- rest-style: 100-row upserts with vectors as JSON arrays, merged through
+  json_populate_recordset the way PostgREST executes the Supabase
+  client's upsert (HTTP overhead excluded, so this flatters the old path)
+- executemany: pipelined single-row upserts with binary vectors
+- copy: binary COPY into a staging table plus one set-based upsert
+  (rag.bulk_load.copy_upsert, used by VectorStorage.store_research_chunks)
+
+Requires a PostgreSQL database with pgvector; the scratch table is created
+and dropped by the benchmark.
+
+Usage:
+    python benchmarks/bulk_load_benchmark.py --database-url postgresql://...
+    python benchmarks/bulk_load_benchmark.py --chunks 10000 --dimensions 1536
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Tuple
+
+import asyncpg
+import numpy as np
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rag.bulk_load import copy_upsert  # noqa: E402
+from rag.vector_codec import register_vector_codecs  # noqa: E402
+
+TABLE = "bulk_load_benchmark_chunks"
+
+COLUMNS = (
+    "id",
+    "content",
+    "embedding",
+    "metadata",
+    "keyword",
+    "chunk_index",
+    "source_id",
+    "created_at",
+)
+
+UPDATES = ", ".join(f"{c} = EXCLUDED.{c}" for c in COLUMNS if c != "id")
+
+
+def make_records(count: int, dimensions: int) -> List[Tuple[Any, ...]]:
+    """Build reproducible chunk rows with normalized float32 embeddings."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((count, dimensions)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    created_at = datetime.now(timezone.utc)
+    return [
+        (
+            f"bench_{i}",
+            f"Synthetic chunk {i} about blood sugar and insulin response. " * 8,
+            vectors[i],
+            json.dumps({"chunk_index": i, "source": "benchmark"}),
+            "benchmark",
+            i,
+            f"source_{i // 20}",
+            created_at,
+        )
+        for i in range(count)
+    ]
+
+
+async def rest_style(conn: asyncpg.Connection, records) -> None:
+    """Reference: 100-row JSON upserts, as the Supabase client sent them."""
+    for i in range(0, len(records), 100):
+        payload = json.dumps(
+            [
+                {
+                    "id": r[0],
+                    "content": r[1],
+                    "embedding": r[2].tolist(),
+                    "metadata": json.loads(r[3]),
+                    "keyword": r[4],
+                    "chunk_index": r[5],
+                    "source_id": r[6],
+                    "created_at": r[7].isoformat(),
+                }
+                for r in records[i : i + 100]
+            ]
+        )
+        await conn.execute(
+            f"""
+            INSERT INTO {TABLE} ({", ".join(COLUMNS)})
+            SELECT {", ".join(COLUMNS)}
+            FROM json_populate_recordset(NULL::{TABLE}, $1::json)
+            ON CONFLICT (id) DO UPDATE SET {UPDATES}
+            """,
+            payload,
+        )
+
+
+async def executemany(conn: asyncpg.Connection, records) -> None:
+    """Pipelined single-row upserts with binary vectors."""
+    placeholders = ", ".join(f"${i + 1}" for i in range(len(COLUMNS)))
+    await conn.executemany(
+        f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+        f"ON CONFLICT (id) DO UPDATE SET {UPDATES}",
+        records,
+    )
+
+
+async def copy(conn: asyncpg.Connection, records) -> None:
+    """Binary COPY into staging plus a set-based upsert."""
+    stored = await copy_upsert(conn, TABLE, COLUMNS, records)
+    assert len(stored) == len(records)
+
+
+async def timed(
+    conn: asyncpg.Connection,
+    load: Callable[[asyncpg.Connection, Any], Awaitable[None]],
+    records,
+) -> float:
+    """Return seconds for one load into an empty table."""
+    await conn.execute(f"TRUNCATE {TABLE}")
+    start = time.perf_counter()
+    await load(conn, records)
+    elapsed = time.perf_counter() - start
+    assert await conn.fetchval(f"SELECT count(*) FROM {TABLE}") == len(records)
+    return elapsed
+
+
+async def run(database_url: str, chunks: int, dimensions: int) -> None:
+    """Run every loader and print a summary."""
+    conn = await asyncpg.connect(database_url, statement_cache_size=0)
+    await register_vector_codecs(conn)
+    try:
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await conn.execute(f"""
+            CREATE TABLE {TABLE} (
+                id TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                embedding vector({dimensions}) NOT NULL,
+                metadata JSONB DEFAULT '{{}}',
+                keyword TEXT,
+                chunk_index INTEGER NOT NULL,
+                source_id TEXT,
+                created_at TIMESTAMPTZ DEFAULT NOW(),
+                updated_at TIMESTAMPTZ DEFAULT NOW()
+            )
+            """)
+        records = make_records(chunks, dimensions)
+
+        print(f"\n== {chunks:,} chunks, {dimensions} dimensions ==")
+        baseline = None
+        for name, load in (
+            ("rest-style", rest_style),
+            ("executemany", executemany),
+            ("copy", copy),
+        ):
+            elapsed = await timed(conn, load, records)
+            baseline = baseline or elapsed
+            print(
+                f"{name:<12} {elapsed:7.2f} s  {chunks / elapsed:9,.0f} rows/s  "
+                f"{baseline / elapsed:5.1f}x"
+            )
+    finally:
+        await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await conn.close()
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("DATABASE_URL"),
+        help="PostgreSQL URL (default: $DATABASE_URL)",
+    )
+    parser.add_argument("--chunks", type=int, default=10_000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    asyncio.run(run(args.database_url, args.chunks, args.dimensions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Offline benchmark for the ingest and retrieval pipeline.
+
+Chunks synthetic research documents with TextProcessor, embeds them with the
+deterministic local backend (no network or API key needed) and searches the
+result with SimilarityIndex, reporting throughput for each stage. Chunking is
+timed both on the event loop and through the multi-core IngestionPipeline.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py
+    python benchmarks/pipeline_benchmark.py --documents 2000 --dimensions 512
+    python benchmarks/pipeline_benchmark.py --words 20000 --workers 8
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rag.backends import HashingEmbeddingBackend  # noqa: E402
+from rag.config import RAGConfig  # noqa: E402
+from rag.ingest import IngestDocument, IngestionPipeline  # noqa: E402
+from rag.processor import TextProcessor  # noqa: E402
+from rag.similarity import SimilarityIndex  # noqa: E402
+
+VOCABULARY = (
+    "blood sugar insulin glucose diet exercise study trial patients results "
+    "metabolic health risk reduction clinical evidence fiber protein sleep "
+    "stress weight cardiovascular inflammation marker response dose weeks"
+).split()
+
+
+def synthetic_documents(count: int, words: int, seed: int = 0) -> List[str]:
+    """Build reproducible pseudo-research documents."""
+    rng = np.random.default_rng(seed)
+    documents = []
+    for _ in range(count):
+        tokens = rng.choice(VOCABULARY, size=words)
+        sentences = [
+            " ".join(tokens[i : i + 12]).capitalize() + "." for i in range(0, words, 12)
+        ]
+        documents.append(" ".join(sentences))
+    return documents
+
+
+async def time_ingestion(pipeline: IngestionPipeline, texts: List[str]) -> float:
+    """Return the wall time to turn ``texts`` into embedding batches."""
+    start = time.perf_counter()
+    async for _ in pipeline.iter_batches(
+        (IngestDocument(text) for text in texts), batch_size=100
+    ):
+        pass
+    return time.perf_counter() - start
+
+
+async def run(
+    documents: int, words: int, dimensions: int, queries: int, workers: int
+) -> None:
+    """Run each pipeline stage once and print a summary."""
+    # Only chunking settings are read, so skip credential validation
+    config = RAGConfig.model_construct(
+        supabase_url="", supabase_service_key="", embedding_backend="local"
+    )
+    processor = TextProcessor(config)
+    backend = HashingEmbeddingBackend(dimensions)
+    texts = synthetic_documents(documents, words)
+
+    start = time.perf_counter()
+    chunks = [chunk for text in texts for chunk in processor.chunk_text(text)]
+    chunk_time = time.perf_counter() - start
+
+    # Full ingestion (chunks, key phrases, statistics) on the event loop
+    # versus worker processes; pool startup is excluded
+    inline_time = await time_ingestion(
+        IngestionPipeline(processor, workers=workers, parallel_min_chars=10**12),
+        texts,
+    )
+    pipeline = IngestionPipeline(processor, workers=workers, parallel_min_chars=0)
+    list(pipeline._get_executor().map(len, [""] * pipeline.workers * 4))
+    pool_time = await time_ingestion(pipeline, texts)
+    pipeline.close()
+
+    start = time.perf_counter()
+    batch = await backend.embed([chunk.content for chunk in chunks])
+    embed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = SimilarityIndex(list(range(len(chunks))), np.stack(batch.vectors))
+    index_time = time.perf_counter() - start
+
+    query_texts = [" ".join(VOCABULARY[i : i + 4]) for i in range(queries)]
+    query_vectors = np.stack([backend.embed_text(q) for q in query_texts])
+    start = time.perf_counter()
+    index.search_batch(query_vectors, top_k=10)
+    search_time = time.perf_counter() - start
+
+    print(f"\n== {documents:,} documents, {len(chunks):,} chunks, {dimensions} dims ==")
+    print(f"chunking:   {chunk_time:8.2f} s ({len(chunks) / chunk_time:,.0f} chunks/s)")
+    print(f"ingest:     {inline_time:8.2f} s on the event loop")
+    print(
+        f"ingest:     {pool_time:8.2f} s with {pipeline.workers} workers "
+        f"({inline_time / pool_time:.1f}x)"
+    )
+    print(f"embedding:  {embed_time:8.2f} s ({len(chunks) / embed_time:,.0f} chunks/s)")
+    print(f"indexing:   {index_time * 1000:8.1f} ms")
+    print(
+        f"search:     {search_time * 1000:8.1f} ms for {queries} queries "
+        f"({search_time / queries * 1000:.2f} ms/query)"
+    )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--words", type=int, default=1200)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per core")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run(args.documents, args.words, args.dimensions, args.queries, args.workers)
+    )
+
+
+if __name__ == "__main__":
+    main()
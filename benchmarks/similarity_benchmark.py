@@ -0,0 +1,110 @@
+"""
+Benchmark for in-process similarity search.
+
+Compares the per-candidate loop previously used by
+EmbeddingGenerator.find_most_similar with the vectorized SimilarityIndex
+at 10k and 100k candidates of 1536 dimensions.
+
+Usage:
+    python benchmarks/similarity_benchmark.py
+    python benchmarks/similarity_benchmark.py --sizes 10000 100000 --queries 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rag.similarity import SimilarityIndex  # noqa: E402
+
+
+def loop_top_k(
+    query: List[float], candidates: List[Tuple[int, List[float]]], top_k: int
+) -> List[Tuple[int, float]]:
+    """Reference implementation: one cosine computation per candidate."""
+    similarities = []
+    for identifier, embedding in candidates:
+        vec1 = np.array(query)
+        vec2 = np.array(embedding)
+        norm1 = np.linalg.norm(vec1)
+        norm2 = np.linalg.norm(vec2)
+        similarity = float(np.dot(vec1, vec2) / (norm1 * norm2))
+        similarities.append((identifier, similarity))
+
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def time_call(func, repeat: int = 3) -> float:
+    """Return the best wall time of ``repeat`` calls in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size: int, dimensions: int, queries: int, top_k: int, loop_limit: int):
+    """Run the benchmark for one candidate count and print a summary."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((size, dimensions)).astype(np.float32)
+    query_matrix = rng.standard_normal((queries, dimensions)).astype(np.float32)
+
+    print(f"\n== {size:,} candidates x {dimensions} dims, top_k={top_k} ==")
+
+    build_time = time_call(lambda: SimilarityIndex(list(range(size)), vectors), 1)
+    index = SimilarityIndex(list(range(size)), vectors)
+    print(f"index build:            {build_time * 1000:9.1f} ms")
+
+    single = time_call(lambda: index.search(query_matrix[0], top_k=top_k))
+    print(f"vectorized, 1 query:    {single * 1000:9.2f} ms")
+
+    batch = time_call(lambda: index.search_batch(query_matrix, top_k=top_k))
+    print(
+        f"vectorized, {queries} queries: {batch * 1000:9.2f} ms "
+        f"({batch / queries * 1000:.2f} ms/query)"
+    )
+
+    if size <= loop_limit:
+        candidates = [(i, vectors[i].tolist()) for i in range(size)]
+        query = query_matrix[0].tolist()
+        loop = time_call(lambda: loop_top_k(query, candidates, top_k), 1)
+        print(f"python loop, 1 query:   {loop * 1000:9.1f} ms")
+        print(f"speedup (single query): {loop / single:9.1f}x")
+
+        # Sanity check that both paths agree on the winners
+        expected = [i for i, _ in loop_top_k(query, candidates, top_k)]
+        actual = [i for i, _ in index.search(query_matrix[0], top_k=top_k)]
+        print(f"same top-{top_k}:           {expected == actual}")
+    else:
+        print(f"python loop skipped (size > --loop-limit {loop_limit:,})")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=16)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument(
+        "--loop-limit",
+        type=int,
+        default=20_000,
+        help="Largest size for which the slow (list-based) reference loop is timed",
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.dimensions, args.queries, args.top_k, args.loop_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark for pgvector parameter encoding.
+
+Compares the text format previously sent to PostgreSQL
+(``'[0.1,0.2,...]'`` built with ``str()`` per element and parsed back on
+read) with the binary ``vector``/``halfvec`` codecs registered on the
+asyncpg pool. Reports CPU time per vector and bytes on the wire.
+
+Usage:
+    python benchmarks/vector_codec_benchmark.py
+    python benchmarks/vector_codec_benchmark.py --dimensions 512 1536 3072
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rag.vector_codec import (  # noqa: E402
+    decode_halfvec,
+    decode_vector,
+    encode_halfvec,
+    encode_vector,
+)
+
+
+def text_encode(vector) -> str:
+    """Reference: the previous query parameter formatting."""
+    return f"[{','.join(str(x) for x in vector)}]"
+
+
+def text_decode(text: str) -> np.ndarray:
+    """Reference: parse pgvector's text output."""
+    return np.array([float(x) for x in text[1:-1].split(",")], dtype=np.float32)
+
+
+def per_call_us(func, number: int) -> float:
+    """Return microseconds per call of ``func``."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def run(dimensions: int, number: int) -> None:
+    """Run the benchmark for one vector size and print a summary."""
+    rng = np.random.default_rng(0)
+    vector = rng.standard_normal(dimensions).astype(np.float32)
+    as_list = vector.tolist()
+
+    text = text_encode(as_list)
+    binary = encode_vector(vector)
+    half = encode_halfvec(vector)
+
+    rows = [
+        (
+            "text (list)",
+            per_call_us(lambda: text_encode(as_list), number),
+            per_call_us(lambda: text_decode(text), number),
+            len(text.encode()),
+        ),
+        (
+            "binary vector",
+            per_call_us(lambda: encode_vector(vector), number),
+            per_call_us(lambda: decode_vector(binary), number),
+            len(binary),
+        ),
+        (
+            "binary halfvec",
+            per_call_us(lambda: encode_halfvec(vector), number),
+            per_call_us(lambda: decode_halfvec(half), number),
+            len(half),
+        ),
+    ]
+
+    print(f"\n== {dimensions} dimensions ==")
+    print(f"{'format':<16}{'encode us':>12}{'decode us':>12}{'bytes':>10}")
+    for name, encode_us, decode_us, size in rows:
+        print(f"{name:<16}{encode_us:>12.1f}{decode_us:>12.1f}{size:>10,}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[512, 1536, 3072])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    for dimensions in args.dimensions:
+        run(dimensions, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,9 @@ CLI commands, extracted from main.py to improve modularity.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone
+from itertools import groupby
 from pathlib import Path
 from typing import Optional
 
@@ -131,6 +133,9 @@ async def handle_cache_stats(detailed: bool):
                     console.print(
                         f"Cache misses: [yellow]{retriever_stats['cache_misses']:,}[/yellow]"
                     )
+                    console.print(
+                        f"In-process hits: [green]{retriever_stats['in_process_hits']:,}[/green]"
+                    )
                     console.print(
                         f"Hit rate: [{'green' if retriever_stats['hit_rate'] > 0.5 else 'yellow'}]"
                         f"{retriever_stats['hit_rate']:.1%}[/{'green' if retriever_stats['hit_rate'] > 0.5 else 'yellow'}]"
@@ -220,6 +225,13 @@ async def handle_cache_clear(
                 older_than_days=older_than, keyword=keyword
             )
 
+            # Retrievers in this process must not keep serving cleared
+            # research; clear everything, since findings served for a
+            # similar keyword may come from a deleted entry
+            from rag.retriever import ResearchRetriever
+
+            ResearchRetriever.invalidate_findings_caches()
+
             console.print(
                 f"\n[green]✅ Cleared {deleted_count:,} cache entries[/green]"
             )
@@ -306,6 +318,158 @@ async def handle_cache_warm(topic: str, variations: int, verbose: bool):
         raise click.exceptions.Exit(1)
 
 
+async def handle_cache_import(file_path: Path, keyword: Optional[str], batch_size: int):
+    """Bulk import documents from a JSON Lines file into the research cache."""
+    from rag.embeddings import EmbeddingGenerator
+    from rag.ingest import IngestDocument, IngestionPipeline
+    from rag.processor import TextProcessor
+
+    rag_config = get_rag_config()
+    processor = TextProcessor(rag_config)
+    pipeline = IngestionPipeline(
+        processor,
+        workers=rag_config.ingest_workers,
+        parallel_min_chars=rag_config.ingest_parallel_min_chars,
+    )
+    counts = {"documents": 0, "skipped": 0, "chunks": 0}
+
+    def read_documents():
+        """Yield documents from the file, one line at a time."""
+        with open(file_path, encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    # Earlier batches are already stored, so keep going
+                    logger.warning(f"Skipping line {line_number}: invalid JSON ({e})")
+                    counts["skipped"] += 1
+                    continue
+
+                text = record.get("text") or record.get("content")
+                document_keyword = record.get("keyword") or keyword
+                if not text or not document_keyword:
+                    logger.warning(f"Skipping line {line_number}: no text or keyword")
+                    counts["skipped"] += 1
+                    continue
+
+                counts["documents"] += 1
+                yield IngestDocument(
+                    text=text,
+                    metadata={
+                        **record.get("metadata", {}),
+                        "keyword": document_keyword,
+                    },
+                    source_id=record.get("source_id"),
+                )
+
+    try:
+        console.print(f"\n[bold blue]📥 Importing {file_path}[/bold blue]")
+        start = time.perf_counter()
+
+        async with VectorStorage(rag_config) as storage:
+            embeddings = EmbeddingGenerator()
+
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                task = progress.add_task("[cyan]Importing chunks", total=None)
+
+                async for batch in pipeline.iter_batches(read_documents(), batch_size):
+                    results = await embeddings.generate_embeddings(
+                        [chunk.content for chunk in batch]
+                    )
+
+                    # Chunks arrive in document order, so each keyword is
+                    # one contiguous run within the batch
+                    pairs = zip(batch, results)
+                    for chunk_keyword, group in groupby(
+                        pairs, key=lambda pair: pair[0].metadata["keyword"]
+                    ):
+                        chunks, vectors = zip(*group)
+                        stored = await storage.store_research_chunks(
+                            list(chunks), list(vectors), chunk_keyword
+                        )
+                        counts["chunks"] += len(stored)
+
+                    progress.update(
+                        task,
+                        description=f"[cyan]Imported {counts['chunks']:,} chunks",
+                    )
+
+        elapsed = time.perf_counter() - start
+        console.print(
+            f"\n[green]✅ Imported {counts['chunks']:,} chunks from "
+            f"{counts['documents']:,} documents in {elapsed:.1f}s "
+            f"({counts['chunks'] / max(elapsed, 1e-9):,.0f} chunks/s)[/green]"
+        )
+        if counts["skipped"]:
+            console.print(
+                f"[yellow]Skipped {counts['skipped']:,} lines with invalid JSON "
+                f"or without text or keyword[/yellow]"
+            )
+
+    except Exception as e:
+        console.print(f"[red]❌ Import failed: {e}[/red]")
+        raise click.exceptions.Exit(1)
+
+    finally:
+        pipeline.close()
+
+
+async def handle_cache_optimize(rebuild: bool, dry_run: bool):
+    """Tune the vector index for the current table size and ANALYZE."""
+    try:
+        rag_config = get_rag_config()
+
+        async with VectorStorage(rag_config) as storage:
+            console.print("\n[bold blue]🔧 Optimizing vector index[/bold blue]")
+            report = await storage.optimize_indexes(rebuild=rebuild, dry_run=dry_run)
+
+        current = report["current"]
+        planned = report["planned"]
+        console.print(f"Rows indexed: [cyan]{report['rows']:,}[/cyan]")
+        if current:
+            options = ", ".join(f"{k}={v}" for k, v in current["options"].items())
+            state = "" if current["valid"] else " [red](invalid)[/red]"
+            console.print(
+                f"Current index: [cyan]{current['method']}[/cyan] "
+                f"[dim]{options}[/dim]{state}"
+            )
+        else:
+            console.print("Current index: [yellow]none[/yellow]")
+        console.print(
+            f"Planned index: [cyan]hnsw[/cyan] "
+            f"[dim]m={planned['m']}, ef_construction={planned['ef_construction']}[/dim]"
+        )
+
+        if dry_run:
+            action = "rebuild" if report["would_rebuild"] else "keep"
+            console.print(
+                f"[dim]DRY RUN - would {action} the index and run ANALYZE[/dim]"
+            )
+        else:
+            action = "Rebuilt" if report["rebuilt"] else "Kept"
+            console.print(
+                f"\n[green]✅ {action} index and analyzed tables in "
+                f"{report['seconds']:.1f}s[/green]"
+            )
+
+        if report["configured_ef_search"] != report["recommended_ef_search"]:
+            console.print(
+                f"[dim]Tip: VECTOR_SEARCH_EF_SEARCH="
+                f"{report['recommended_ef_search']} suits this table size "
+                f"(currently {report['configured_ef_search']})[/dim]"
+            )
+
+    except Exception as e:
+        console.print(f"[red]❌ Optimize failed: {e}[/red]")
+        raise click.exceptions.Exit(1)
+
+
 async def handle_export_cache_metrics(format: str, output_path: Optional[Path]):
     """Export cache metrics in specified format."""
     try:
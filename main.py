@@ -11,7 +11,7 @@ import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Awaitable, Optional
 
 import click
 from rich.console import Console
@@ -30,6 +30,7 @@ from config import get_config
 from rag.config import get_rag_config
 from rag.retriever import ResearchRetriever
 from rag.storage import VectorStorage
+from research_agent.tools import close_retriever
 from workflow import WorkflowOrchestrator
 
 # Import CLI handlers
@@ -38,6 +39,8 @@ from cli.cache_handlers import (
     handle_cache_stats,
     handle_cache_clear,
     handle_cache_warm,
+    handle_cache_import,
+    handle_cache_optimize,
     handle_export_cache_metrics,
 )
 
@@ -182,7 +185,9 @@ def generate(
 
     try:
         # Create and run the workflow
-        asyncio.run(_run_generation(keyword, output_dir, dry_run, quiet))
+        asyncio.run(
+            _closing_retriever(_run_generation(keyword, output_dir, dry_run, quiet))
+        )
 
     except KeyboardInterrupt:
         console.print("\n[yellow]⚠️  Generation cancelled by user[/yellow]")
@@ -194,6 +199,25 @@ def generate(
         raise click.exceptions.Exit(1)
 
 
+async def _closing_retriever(work: Awaitable[Any]) -> Any:
+    """
+    Run a command's async work, then close the research cache retriever.
+
+    The retriever buffers cache hits and writes them in the background;
+    closing it inside the same event loop writes the rest before exit.
+
+    Args:
+        work: Coroutine of the command
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        return await work
+    finally:
+        await close_retriever()
+
+
 async def _run_generation(
     keyword: str, output_dir: Optional[Path], dry_run: bool, quiet: bool = False
 ):
@@ -587,8 +611,10 @@ def batch(
     # Run the batch processing
     try:
         asyncio.run(
-            _run_batch_generation(
-                keywords, output_dir, parallel, dry_run, continue_on_error, progress
+            _closing_retriever(
+                _run_batch_generation(
+                    keywords, output_dir, parallel, dry_run, continue_on_error, progress
+                )
             )
         )
     except KeyboardInterrupt:
@@ -738,6 +764,12 @@ def cache():
 
         # Pre-populate cache with research
         $ seo-content cache warm "diabetes management"
+
+        # Bulk load documents from a JSON Lines file
+        $ seo-content cache import documents.jsonl --keyword "blood sugar"
+
+        # Tune the vector index after large imports
+        $ seo-content cache optimize
     """
     pass
 
@@ -850,7 +882,73 @@ def cache_warm(topic: str, variations: int, verbose: bool):
         # Show detailed progress
         $ seo-content cache warm "nutrition" --verbose
     """
-    asyncio.run(handle_cache_warm(topic, variations, verbose))
+    asyncio.run(_closing_retriever(handle_cache_warm(topic, variations, verbose)))
+
+
+@cache.command("import")
+@click.argument(
+    "file_path", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--keyword",
+    "-k",
+    type=str,
+    help="Keyword for documents that do not set their own",
+)
+@click.option(
+    "--batch-size",
+    "-b",
+    default=500,
+    type=click.IntRange(1, 10_000),
+    help="Chunks embedded and stored per batch (default: 500)",
+)
+def cache_import(file_path: Path, keyword: Optional[str], batch_size: int):
+    """
+    Bulk import documents from FILE_PATH into the research cache.
+
+    FILE_PATH is a JSON Lines file with one document per line. Each document
+    needs "text" (or "content") and may set "keyword", "source_id" and
+    "metadata". Documents are chunked, embedded and written with PostgreSQL
+    COPY, which is much faster than storing research one keyword at a time.
+
+    \b
+    Examples:
+        # Import documents for one keyword
+        $ seo-content cache import papers.jsonl --keyword "insulin resistance"
+
+        # Documents carry their own keywords; use larger batches
+        $ seo-content cache import crawl.jsonl --batch-size 2000
+    """
+    asyncio.run(handle_cache_import(file_path, keyword, batch_size))
+
+
+@cache.command("optimize")
+@click.option(
+    "--rebuild", is_flag=True, help="Rebuild the vector index even if it fits"
+)
+@click.option(
+    "--dry-run", is_flag=True, help="Show the planned index without changing it"
+)
+def cache_optimize(rebuild: bool, dry_run: bool):
+    """
+    Tune the research cache's vector index and refresh statistics.
+
+    Sizes the HNSW index on research_chunks for the current number of rows,
+    rebuilds it concurrently when it is missing, IVFFlat or built with other
+    parameters, and runs ANALYZE. Run it after large imports.
+
+    \b
+    Examples:
+        # Rebuild if needed and analyze
+        $ seo-content cache optimize
+
+        # See what would change
+        $ seo-content cache optimize --dry-run
+
+        # Force a fresh index build
+        $ seo-content cache optimize --rebuild
+    """
+    asyncio.run(handle_cache_optimize(rebuild, dry_run))
 
 
 @cache.command("metrics")
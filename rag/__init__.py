@@ -7,23 +7,27 @@ response times.
 """
 
 # Import configuration first as other modules depend on it
-from .config import RAGConfig, get_rag_config
+from .config import RAGConfig, get_rag_config  # isort: skip
 
 # Import main components
+from .chunk_filter import ChunkFilter
 from .embeddings import EmbeddingGenerator, EmbeddingResult
 from .processor import TextChunk, TextProcessor
 from .retriever import ResearchRetriever, RetrievalStatistics
+from .similarity import SimilarityIndex
 from .storage import VectorStorage
 
 __all__ = [
     "RAGConfig",
     "get_rag_config",
+    "ChunkFilter",
     "EmbeddingGenerator",
     "EmbeddingResult",
     "TextProcessor",
     "TextChunk",
     "ResearchRetriever",
     "RetrievalStatistics",
+    "SimilarityIndex",
     "VectorStorage",
 ]
 
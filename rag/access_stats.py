@@ -0,0 +1,77 @@
+"""
+Write-behind Access Statistics for the RAG Cache.
+
+Cache hits are counted in memory and written to ``cache_entries`` in
+periodic batches instead of updating the row on every hit. This keeps the
+exact-hit lookup read-only (no row lock or WAL write on the critical
+path) and avoids lost increments when many requests hit the same key.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Hits per cache key: [hit count, most recent access]
+PendingStats = Dict[str, Tuple[int, datetime]]
+
+# Applies a batch of buffered hits in one atomic statement
+FLUSH_ACCESS_STATS_QUERY = """
+    UPDATE cache_entries AS e
+    SET hit_count = e.hit_count + v.hits,
+        last_accessed = GREATEST(e.last_accessed, v.last_accessed)
+    FROM unnest($1::text[], $2::int[], $3::timestamptz[])
+        AS v(id, hits, last_accessed)
+    WHERE e.id = v.id
+"""
+
+
+class AccessStatsBuffer:
+    """Aggregates cache hits per key until they are flushed."""
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._pending: Dict[str, List] = {}
+
+    def record(self, cache_key: str, accessed_at: Optional[datetime] = None) -> None:
+        """
+        Count one hit for a cache key.
+
+        Args:
+            cache_key: Key of the cache entry that was served
+            accessed_at: Time of the hit (defaults to now)
+        """
+        accessed_at = accessed_at or datetime.now(timezone.utc)
+        entry = self._pending.get(cache_key)
+        if entry is None:
+            self._pending[cache_key] = [1, accessed_at]
+        else:
+            entry[0] += 1
+            entry[1] = max(entry[1], accessed_at)
+
+    def drain(self) -> PendingStats:
+        """Remove and return everything buffered so far."""
+        pending, self._pending = self._pending, {}
+        return {key: (hits, accessed) for key, (hits, accessed) in pending.items()}
+
+    def restore(self, pending: PendingStats) -> None:
+        """Put drained stats back, e.g. after a failed flush."""
+        for cache_key, (hits, accessed_at) in pending.items():
+            entry = self._pending.get(cache_key)
+            if entry is None:
+                self._pending[cache_key] = [hits, accessed_at]
+            else:
+                entry[0] += hits
+                entry[1] = max(entry[1], accessed_at)
+
+    def __len__(self) -> int:
+        """Number of cache keys with pending hits."""
+        return len(self._pending)
+
+
+def flush_parameters(pending: PendingStats) -> Tuple[List, List, List]:
+    """Split drained stats into the arrays taken by FLUSH_ACCESS_STATS_QUERY."""
+    keys = list(pending)
+    return (
+        keys,
+        [pending[key][0] for key in keys],
+        [pending[key][1] for key in keys],
+    )
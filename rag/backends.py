@@ -0,0 +1,180 @@
+"""
+Embedding Backends for RAG System.
+
+Providers that turn text into vectors behind a common interface, so the
+embedding generator, caches and storage work the same whether vectors come
+from OpenAI or from a deterministic local model used for offline
+benchmarking and load testing.
+"""
+
+import logging
+import re
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from .config import EMBEDDING_MODEL_DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class EmbeddingBatch:
+    """Vectors returned by a backend for one request."""
+
+    vectors: List[Any]
+    tokens: Optional[int] = None
+
+
+class EmbeddingBackend(ABC):
+    """Interface implemented by embedding providers."""
+
+    # Identifier stored with results and used in cache keys
+    model: str
+    dimensions: int
+
+    # Whether requests count against the shared API rate limits
+    rate_limited: bool = False
+
+    @abstractmethod
+    async def embed(self, inputs: Union[str, List[str]]) -> EmbeddingBatch:
+        """
+        Embed one text or a list of texts in a single request.
+
+        Args:
+            inputs: Stripped, non-empty text or texts
+
+        Returns:
+            One vector per input in input order, plus billed tokens if known
+        """
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """Embeddings from the OpenAI API."""
+
+    rate_limited = True
+
+    def __init__(self, client: Any, model: str, dimensions: int):
+        """Initialize with an ``AsyncOpenAI`` client."""
+        self.client = client
+        self.model = model
+        self.dimensions = dimensions
+
+    @staticmethod
+    def _usage_tokens(response: Any) -> Optional[int]:
+        """Token count billed for a response, if the API reported it."""
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "prompt_tokens", None)
+        if isinstance(tokens, int) and tokens > 0:
+            return tokens
+        return None
+
+    async def embed(self, inputs: Union[str, List[str]]) -> EmbeddingBatch:
+        """Embed texts with one API request."""
+        # Ask for base64 so vectors decode straight into float32 buffers
+        request: Dict[str, Any] = {
+            "model": self.model,
+            "input": inputs,
+            "encoding_format": "base64",
+        }
+        # text-embedding-3 models return shortened vectors on request
+        if self.dimensions != EMBEDDING_MODEL_DIMENSIONS.get(self.model):
+            request["dimensions"] = self.dimensions
+
+        response = await self.client.embeddings.create(**request)
+
+        count = 1 if isinstance(inputs, str) else len(inputs)
+        if len(response.data) != count:
+            raise ValueError(
+                f"Embedding API returned {len(response.data)} vectors "
+                f"for {count} inputs"
+            )
+
+        # The API tags each vector with its input index; fall back to
+        # response order when the index is unavailable
+        vectors: List[Any] = [None] * count
+        for position, item in enumerate(response.data):
+            index = getattr(item, "index", position)
+            if not isinstance(index, int) or not 0 <= index < count:
+                index = position
+            vectors[index] = item.embedding
+
+        return EmbeddingBatch(vectors=vectors, tokens=self._usage_tokens(response))
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic local embeddings from hashed n-gram projection.
+
+    Words, word bigrams and character trigrams are hashed (CRC32, stable
+    across processes and runs) into signed buckets and L2-normalized. Texts
+    sharing vocabulary land close together, which is enough to exercise
+    chunking, caching, storage and similarity search realistically without
+    network access or API cost.
+    """
+
+    model = "local-ngram-hash"
+
+    _word_pattern = re.compile(r"\w+")
+
+    def __init__(self, dimensions: int = 1536):
+        """Initialize with the output vector size."""
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> List[str]:
+        """Extract the n-gram features hashed into the vector."""
+        words = self._word_pattern.findall(text.lower())
+        features = list(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+
+        # Punctuation-only text still gets a stable, non-zero vector
+        return features or [text]
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text synchronously."""
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode()) for feature in self._features(text)),
+            dtype=np.uint32,
+        )
+        buckets = (hashes % self.dimensions).astype(np.intp)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        np.add.at(vector, buckets, signs)
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    async def embed(self, inputs: Union[str, List[str]]) -> EmbeddingBatch:
+        """Embed texts locally."""
+        texts = [inputs] if isinstance(inputs, str) else inputs
+        return EmbeddingBatch(vectors=[self.embed_text(text) for text in texts])
+
+
+def create_backend(
+    name: str, model: str, dimensions: int, client: Any = None
+) -> EmbeddingBackend:
+    """
+    Create the embedding backend selected in configuration.
+
+    Args:
+        name: Backend name (``openai`` or ``local``)
+        model: OpenAI model name
+        dimensions: Output vector size
+        client: ``AsyncOpenAI`` client for the OpenAI backend
+
+    Returns:
+        Configured embedding backend
+    """
+    if name == "local":
+        logger.info("Using deterministic local embedding backend")
+        return HashingEmbeddingBackend(dimensions)
+    return OpenAIEmbeddingBackend(client, model, dimensions)
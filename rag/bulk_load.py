@@ -0,0 +1,93 @@
+"""
+Bulk Loading for RAG Storage.
+
+Writes many rows through PostgreSQL's binary COPY protocol into a
+temporary staging table, then merges them into the target table with a
+single set-based INSERT ... ON CONFLICT. COPY avoids per-row statement
+overhead and, with the binary pgvector codec, sends embeddings as raw
+floats, which makes it the fastest way to load thousands of chunks.
+"""
+
+import logging
+from typing import Any, List, Sequence
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+async def copy_upsert(
+    connection: asyncpg.Connection,
+    table: str,
+    columns: Sequence[str],
+    records: Sequence[Sequence[Any]],
+    key: str = "id",
+    update: bool = True,
+) -> List[Any]:
+    """
+    Load records with COPY and merge them into a table.
+
+    Runs in one transaction: rows are copied into a temporary table shaped
+    like ``table`` (so omitted columns take their defaults), then inserted
+    with ``ON CONFLICT (key)`` either updating the existing row or leaving
+    it untouched.
+
+    Args:
+        connection: Connection with the pgvector codecs registered
+        table: Target table
+        columns: Column names, in the order of each record's values
+        records: Rows to write; keys must be unique within the load
+        key: Conflict column, also used to report the stored rows
+        update: Overwrite existing rows (True) or skip them (False)
+
+    Returns:
+        Keys of the rows written, in input order
+    """
+    if not records:
+        return []
+
+    staging = _quote(f"_bulk_{table}")
+    column_list = ", ".join(_quote(column) for column in columns)
+    key_column = _quote(key)
+
+    if update:
+        assignments = ", ".join(
+            f"{_quote(column)} = EXCLUDED.{_quote(column)}"
+            for column in columns
+            if column != key
+        )
+        on_conflict = f"DO UPDATE SET {assignments}"
+    else:
+        on_conflict = "DO NOTHING"
+
+    async with connection.transaction():
+        await connection.execute(
+            f"CREATE TEMP TABLE {staging} "
+            f"(LIKE {_quote(table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        await connection.copy_records_to_table(
+            f"_bulk_{table}", records=records, columns=list(columns)
+        )
+        rows = await connection.fetch(
+            f"INSERT INTO {_quote(table)} ({column_list}) "
+            f"SELECT {column_list} FROM {staging} "
+            f"ON CONFLICT ({key_column}) {on_conflict} "
+            f"RETURNING {key_column}"
+        )
+        # Dropped now too, in case this ran inside an outer transaction
+        await connection.execute(f"DROP TABLE {staging}")
+
+    # Compared as text so UUID keys match whether given as str or UUID
+    written = {str(row[key]) for row in rows}
+    key_index = list(columns).index(key)
+    stored = [
+        record[key_index] for record in records if str(record[key_index]) in written
+    ]
+
+    logger.debug(f"Bulk loaded {len(stored)} of {len(records)} rows into {table}")
+    return stored
@@ -0,0 +1,91 @@
+"""
+Topic Embeddings for Semantic Cache Matching.
+
+Every cache entry gets one row in ``cache_topics``. The row holds a single
+embedding that blends the keyword's embedding with the centroid of the
+entry's chunk embeddings. Finding the cached research closest to a new
+keyword is then one nearest-neighbour lookup over a few thousand topics
+instead of a search through every stored chunk, and a topic with many
+chunks can no longer crowd out the others.
+
+The table and its index are created by sql/cache_topics.sql.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Live (unexpired) topics considered per lookup; the best one above the
+# threshold wins
+TOPIC_CANDIDATES = 5
+
+# Mean of the embeddings of a cache entry's chunks (NULL without chunks)
+TOPIC_CENTROID_QUERY = """
+    SELECT avg(c.embedding)
+    FROM cache_entries AS e
+    JOIN research_chunks AS c ON c.id = ANY(e.chunk_ids)
+    WHERE e.id = $1
+"""
+
+UPSERT_TOPIC_QUERY = """
+    INSERT INTO cache_topics (id, keyword, embedding, updated_at)
+    VALUES ($1, $2, $3, NOW())
+    ON CONFLICT (id) DO UPDATE
+    SET keyword = EXCLUDED.keyword,
+        embedding = EXCLUDED.embedding,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# The live cache entry whose topic is most similar to {query}, with the
+# similarity added. $2 is the threshold, $3 the number of candidate topics.
+# Expired entries are skipped inside the nearest-neighbour scan, so topics
+# that wait for cleanup_cache cannot take up the candidate slots
+SIMILAR_ENTRY_QUERY = """
+    SELECT *
+    FROM (
+        SELECT e.*, 1 - (t.embedding <=> {query}::vector) AS similarity
+        FROM cache_topics AS t
+        JOIN cache_entries AS e ON e.id = t.id
+        WHERE e.expires_at > NOW()
+        ORDER BY t.embedding <=> {query}::vector
+        LIMIT $3
+    ) AS candidates
+    WHERE similarity >= $2
+    ORDER BY similarity DESC
+    LIMIT 1
+"""
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to length 1 (zero vectors are returned unchanged)."""
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def topic_embedding(
+    keyword_embedding: np.ndarray, centroid: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Blend a keyword embedding with its chunks' centroid.
+
+    Both parts are normalized first so they carry equal weight; the
+    centroid of normalized vectors is shorter than 1 and would otherwise
+    count for less the more its chunks differ.
+
+    Args:
+        keyword_embedding: Embedding of the cached keyword
+        centroid: Mean embedding of the entry's chunks, if it has any
+
+    Returns:
+        Unit-length float32 topic embedding
+    """
+    keyword_unit = _unit(np.asarray(keyword_embedding, dtype=np.float32))
+    if centroid is None:
+        return keyword_unit
+    centroid = np.asarray(centroid, dtype=np.float32)
+    if centroid.shape != keyword_unit.shape:
+        raise ValueError(
+            f"Centroid has {centroid.size} dimensions, "
+            f"keyword embedding {keyword_unit.size}"
+        )
+    return _unit(keyword_unit + _unit(centroid)).astype(np.float32)
@@ -0,0 +1,94 @@
+"""
+Structured Filters for Chunk Similarity Search.
+
+A ChunkFilter turns metadata constraints into SQL predicates that are
+placed inside the nearest-neighbour query, next to its ORDER BY ... LIMIT.
+The database can then prune with them (through the keyword and expression
+indexes, or a partial vector index) instead of the caller discarding rows
+from an unfiltered top-k that the LIMIT already cut short.
+
+The expressions below must match the indexes created by
+sql/research_chunks_filter_indexes.sql exactly for PostgreSQL to use them.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Metadata fields promoted to indexed expressions
+SOURCE_TYPE_EXPRESSION = "(metadata->>'source_type')"
+CREDIBILITY_EXPRESSION = "((metadata->>'credibility_score')::real)"
+
+
+@dataclass(frozen=True)
+class ChunkFilter:
+    """
+    Constraints a chunk must meet to be returned by a similarity search.
+
+    Empty fields do not constrain; set fields are combined with AND.
+
+    Attributes:
+        keywords: Chunks stored for any of these keywords
+        source_types: Chunk types, e.g. "academic_source" or "statistics"
+        source_ids: Chunks from any of these sources
+        min_credibility: Minimum source credibility score (0-1); chunks
+            without a score are excluded
+        metadata: Key/value pairs the JSONB metadata must contain
+    """
+
+    keywords: Sequence[str] = ()
+    source_types: Sequence[str] = ()
+    source_ids: Sequence[str] = ()
+    min_credibility: Optional[float] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+    def to_sql(self, first_param: int) -> Tuple[str, List[Any]]:
+        """
+        Build the predicates and their arguments.
+
+        Args:
+            first_param: Number of the first placeholder to use ($n)
+
+        Returns:
+            Tuple of (conditions joined with AND, or "" if none; arguments)
+        """
+        conditions: List[str] = []
+        args: List[Any] = []
+
+        def add(template: str, value: Any) -> None:
+            conditions.append(template.format(f"${first_param + len(args)}"))
+            args.append(value)
+
+        if self.keywords:
+            add("keyword = ANY({}::text[])", list(self.keywords))
+        if self.source_types:
+            add(
+                f"{SOURCE_TYPE_EXPRESSION} = ANY({{}}::text[])", list(self.source_types)
+            )
+        if self.source_ids:
+            add("source_id = ANY({}::text[])", list(self.source_ids))
+        if self.min_credibility is not None:
+            add(f"{CREDIBILITY_EXPRESSION} >= {{}}::real", self.min_credibility)
+        if self.metadata:
+            add("metadata @> {}::jsonb", json.dumps(self.metadata))
+
+        return " AND ".join(conditions), args
+
+
+def filter_clause(
+    filters: Optional[ChunkFilter], first_param: int
+) -> Tuple[str, List[Any]]:
+    """
+    Render an optional filter as a WHERE clause.
+
+    Args:
+        filters: Filter to apply, or None
+        first_param: Number of the first placeholder to use ($n)
+
+    Returns:
+        Tuple of ("WHERE ..." or "", arguments)
+    """
+    if filters is None:
+        return "", []
+    conditions, args = filters.to_sql(first_param)
+    return (f"WHERE {conditions}" if conditions else ""), args
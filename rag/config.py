@@ -12,6 +12,13 @@ from dotenv import load_dotenv
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Native output dimensions of each supported embedding model
+EMBEDDING_MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
 # Load environment variables (can be disabled for testing)
 if os.getenv("DISABLE_DOTENV") != "true":
     load_dotenv()
@@ -33,18 +40,63 @@ class RAGConfig(BaseSettings):
     )
 
     # Embedding Configuration
+    embedding_backend: str = Field(
+        default="openai",
+        description="Embedding provider: openai, or local for deterministic "
+        "offline vectors (benchmarking and load tests)",
+    )
     embedding_model_name: str = Field(
         default="text-embedding-3-small", description="OpenAI embedding model to use"
     )
     embedding_dimensions: int = Field(
-        default=1536, description="Dimensions of the embedding vector"
+        default=1536,
+        ge=1,
+        description="Dimensions of the embedding vector (text-embedding-3 models "
+        "can return shortened vectors, e.g. 256 or 512)",
+    )
+    embedding_storage_precision: str = Field(
+        default="float32",
+        description="Precision searched in research_chunks: float32, float16 "
+        "(halfvec) or binary (bit quantization)",
+    )
+    embedding_rerank_factor: int = Field(
+        default=4,
+        ge=1,
+        le=50,
+        description="Candidates fetched per result from a quantized index and "
+        "re-ranked at full precision (1 disables)",
     )
     embedding_batch_size: int = Field(
         default=100, ge=1, le=2048, description="Batch size for embedding generation"
     )
+    embedding_max_batch_tokens: int = Field(
+        default=250_000,
+        ge=1,
+        le=300_000,
+        description="Token budget for a single multi-input embedding request",
+    )
     embedding_max_retries: int = Field(
         default=3, ge=1, le=10, description="Maximum retries for embedding API calls"
     )
+    embedding_requests_per_minute: int = Field(
+        default=3_000,
+        ge=1,
+        description="Embedding API request limit per minute shared by all workers",
+    )
+    embedding_tokens_per_minute: int = Field(
+        default=1_000_000,
+        ge=1,
+        description="Embedding API token limit per minute shared by all workers",
+    )
+    embedding_cache_path: Optional[str] = Field(
+        default=".cache/embeddings.sqlite3",
+        description="SQLite file for the persistent embedding cache (empty disables)",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=50_000,
+        ge=1,
+        description="Maximum embeddings kept in the persistent cache before LRU eviction",
+    )
 
     # Text Processing Configuration
     chunk_size: int = Field(
@@ -56,6 +108,27 @@ class RAGConfig(BaseSettings):
     min_chunk_size: int = Field(
         default=100, ge=10, description="Minimum chunk size to process"
     )
+    ingest_workers: int = Field(
+        default=0,
+        ge=0,
+        le=64,
+        description="Worker processes for chunking large documents (0 = one per CPU core)",
+    )
+    ingest_parallel_min_chars: int = Field(
+        default=100_000,
+        ge=0,
+        description="Documents at least this long are processed off the event loop",
+    )
+    near_duplicate_index_path: str = Field(
+        default="",
+        description="SimHash index of stored chunks used to skip near-duplicates, e.g. .cache/near_duplicates.sqlite3 (empty disables)",
+    )
+    near_duplicate_max_distance: int = Field(
+        default=3,
+        ge=0,
+        le=15,
+        description="Maximum differing SimHash bits (of 64) for chunks treated as near-duplicates",
+    )
 
     # Cache Configuration
     cache_similarity_threshold: float = Field(
@@ -70,6 +143,46 @@ class RAGConfig(BaseSettings):
     cache_max_age_days: int = Field(
         default=30, ge=1, description="Maximum cache retention in days"
     )
+    cache_stale_grace_hours: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Hours past expiry an entry is still served while it is re-researched in the background (0 disables)",
+    )
+    cache_max_background_refreshes: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Maximum background refreshes of stale cache entries running at once",
+    )
+    access_stats_flush_seconds: float = Field(
+        default=5.0,
+        gt=0.0,
+        le=300.0,
+        description="Interval for writing buffered cache hit counts to the database",
+    )
+    findings_cache_size: int = Field(
+        default=256,
+        ge=0,
+        description="Research findings kept in memory per retriever (0 disables)",
+    )
+    findings_cache_ttl_seconds: float = Field(
+        default=300.0,
+        ge=0.0,
+        description="Seconds findings are served from memory before the database is asked again",
+    )
+    speculative_cache_lookup: bool = Field(
+        default=False,
+        description="Embed the keyword and search semantically while the exact cache lookup runs",
+    )
+    research_lock_enabled: bool = Field(
+        default=False,
+        description="Serialize research of a keyword across processes with a PostgreSQL advisory lock",
+    )
+    research_lock_timeout_seconds: float = Field(
+        default=300.0,
+        gt=0.0,
+        description="Seconds to wait for the research lock before researching anyway",
+    )
 
     # Search Configuration
     max_search_results: int = Field(
@@ -81,6 +194,19 @@ class RAGConfig(BaseSettings):
     similarity_threshold: float = Field(
         default=0.7, ge=0.0, le=1.0, description="Minimum similarity for search results"
     )
+    vector_search_ef_search: int = Field(
+        default=100,
+        ge=1,
+        le=1000,
+        description="HNSW candidate list size per search (hnsw.ef_search); "
+        "raised to the number of rows requested when smaller",
+    )
+    vector_search_probes: int = Field(
+        default=10,
+        ge=1,
+        le=1000,
+        description="IVFFlat lists scanned per search (ivfflat.probes)",
+    )
 
     # Performance Configuration
     connection_pool_size: int = Field(
@@ -166,15 +292,43 @@ class RAGConfig(BaseSettings):
     @field_validator("embedding_model_name")
     def validate_embedding_model(cls, v: str) -> str:
         """Validate embedding model name."""
-        valid_models = [
-            "text-embedding-3-small",
-            "text-embedding-3-large",
-            "text-embedding-ada-002",
-        ]
+        valid_models = list(EMBEDDING_MODEL_DIMENSIONS)
         if v not in valid_models:
             raise ValueError(f"Invalid embedding model. Must be one of: {valid_models}")
         return v
 
+    @field_validator("embedding_dimensions")
+    def validate_embedding_dimensions(cls, v: int, info) -> int:
+        """Ensure the model can produce vectors of the requested size."""
+        model = info.data.get("embedding_model_name", "text-embedding-3-small")
+        native = EMBEDDING_MODEL_DIMENSIONS.get(model, v)
+        if v > native:
+            raise ValueError(f"{model} produces at most {native} dimensions, got {v}")
+        if v != native and not model.startswith("text-embedding-3"):
+            raise ValueError(f"{model} only supports {native} dimensions")
+        return v
+
+    @field_validator("embedding_backend")
+    def validate_embedding_backend(cls, v: str) -> str:
+        """Validate the embedding provider name."""
+        valid_backends = ["openai", "local"]
+        if v not in valid_backends:
+            raise ValueError(
+                f"Invalid embedding backend. Must be one of: {valid_backends}"
+            )
+        return v
+
+    @field_validator("embedding_storage_precision")
+    def validate_embedding_storage_precision(cls, v: str) -> str:
+        """Validate the vector storage precision."""
+        valid_precisions = ["float32", "float16", "binary"]
+        if v not in valid_precisions:
+            raise ValueError(
+                f"Invalid embedding storage precision. Must be one of: "
+                f"{valid_precisions}"
+            )
+        return v
+
     def get_supabase_config(self) -> dict:
         """Get Supabase client configuration."""
         return {
@@ -191,10 +345,18 @@ class RAGConfig(BaseSettings):
     def get_embedding_config(self) -> dict:
         """Get embedding generation configuration."""
         return {
+            "backend": self.embedding_backend,
             "model": self.embedding_model_name,
             "dimensions": self.embedding_dimensions,
+            "storage_precision": self.embedding_storage_precision,
+            "rerank_factor": self.embedding_rerank_factor,
             "batch_size": self.embedding_batch_size,
+            "max_batch_tokens": self.embedding_max_batch_tokens,
             "max_retries": self.embedding_max_retries,
+            "requests_per_minute": self.embedding_requests_per_minute,
+            "tokens_per_minute": self.embedding_tokens_per_minute,
+            "cache_path": self.embedding_cache_path,
+            "cache_max_entries": self.embedding_cache_max_entries,
         }
 
     def get_chunk_config(self) -> dict:
@@ -203,6 +365,10 @@ class RAGConfig(BaseSettings):
             "chunk_size": self.chunk_size,
             "chunk_overlap": self.chunk_overlap,
             "min_chunk_size": self.min_chunk_size,
+            "ingest_workers": self.ingest_workers,
+            "ingest_parallel_min_chars": self.ingest_parallel_min_chars,
+            "near_duplicate_index_path": self.near_duplicate_index_path,
+            "near_duplicate_max_distance": self.near_duplicate_max_distance,
         }
 
     def get_drive_config(self) -> dict:
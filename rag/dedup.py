@@ -0,0 +1,478 @@
+"""
+Near-duplicate Chunk Detection for RAG System.
+
+The same paragraphs show up in search excerpts, extracted content and
+crawled pages across many keywords. Each chunk gets a 64-bit SimHash over
+its word shingles, and chunks within a few bits of an already stored chunk
+reuse that chunk (and its embedding) instead of being embedded and stored
+again.
+
+Fingerprints are kept in a SQLite LSH index: each fingerprint is split into
+``max_distance + 1`` bands, so by the pigeonhole principle any fingerprint
+within ``max_distance`` bits shares at least one band exactly. Lookups only
+compare against fingerprints sharing a band, which keeps them fast as the
+corpus grows.
+
+The index is a file on the local machine while the chunks live in the
+shared database, so it can point at chunks that were deleted elsewhere.
+plan_stored_duplicates confirms matches against the database before they
+are reused. The index is off unless NEAR_DUPLICATE_INDEX_PATH is set.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_word_pattern = re.compile(r"\w+")
+
+# Words per shingle; three keeps word order without being brittle
+SHINGLE_SIZE = 3
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of text.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        Unsigned 64-bit fingerprint
+    """
+    words = _word_pattern.findall(text.lower())
+    if len(words) >= SHINGLE_SIZE:
+        shingles = [
+            " ".join(words[i : i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        ]
+    else:
+        shingles = [" ".join(words) or text]
+
+    hashes = np.frombuffer(
+        b"".join(
+            hashlib.blake2b(shingle.encode(), digest_size=8).digest()
+            for shingle in shingles
+        ),
+        dtype=np.uint8,
+    ).reshape(-1, 8)
+
+    # Each bit is set when most shingle hashes have it set
+    bits = np.unpackbits(hashes, axis=1)
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed INTEGER."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+@dataclass(slots=True)
+class DeduplicationPlan:
+    """Which inputs to embed and store, and which reuse existing chunks."""
+
+    fingerprints: List[int]
+    # Existing chunk ID per input, if a stored near-duplicate was found
+    matches: List[Optional[str]]
+    # Earlier input position per input, if it repeats one in this batch
+    copies: List[Optional[int]]
+
+    @property
+    def new_positions(self) -> List[int]:
+        """Positions of inputs that must be embedded and stored."""
+        return [
+            i
+            for i, (match, copy) in enumerate(zip(self.matches, self.copies))
+            if match is None and copy is None
+        ]
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of inputs that reuse another chunk."""
+        return len(self.fingerprints) - len(self.new_positions)
+
+    def drop_matches(self, chunk_ids: Collection[str]) -> int:
+        """
+        Store inputs matched to these chunks after all.
+
+        Args:
+            chunk_ids: Matched chunk IDs that must not be reused
+
+        Returns:
+            Number of inputs no longer matched
+        """
+        dropped = 0
+        for position, match in enumerate(self.matches):
+            if match is not None and match in chunk_ids:
+                self.matches[position] = None
+                dropped += 1
+        return dropped
+
+    def resolve_ids(self, stored_ids: Sequence[str]) -> List[str]:
+        """
+        Map stored IDs back onto every input.
+
+        Args:
+            stored_ids: IDs of the stored inputs, in ``new_positions`` order
+
+        Returns:
+            One chunk ID per input, in input order
+        """
+        ids: List[Optional[str]] = list(self.matches)
+        for position, chunk_id in zip(self.new_positions, stored_ids):
+            ids[position] = chunk_id
+        for position, copy in enumerate(self.copies):
+            if copy is not None:
+                ids[position] = ids[copy]
+        return [chunk_id for chunk_id in ids if chunk_id is not None]
+
+
+class NearDuplicateIndex:
+    """
+    SQLite-backed LSH index of chunk fingerprints.
+
+    Entries are grouped by namespace (the table the chunk lives in), carry
+    the keyword and creation time of their chunk, and are dropped by chunk
+    ID when cleanup deletes the chunks they point to.
+    """
+
+    def __init__(self, path: str, max_distance: int = 3):
+        """Open (or create) the index database at ``path``."""
+        self.path = path
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.duplicates_found = 0
+        self.lookups = 0
+
+        # Bit offsets of each band; the last band takes the remainder
+        width = 64 // self.bands
+        self._band_shifts = [64 - width * (i + 1) for i in range(self.bands)]
+        self._band_shifts[-1] = 0
+        self._band_masks = [
+            (1 << ((64 - width * i) - shift)) - 1
+            for i, shift in enumerate(self._band_shifts)
+        ]
+
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                id INTEGER PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                fingerprint INTEGER NOT NULL,
+                keyword TEXT,
+                created_at REAL NOT NULL,
+                UNIQUE (namespace, chunk_id)
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprint_bands (
+                namespace TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                entry_id INTEGER NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fingerprint_bands "
+            "ON fingerprint_bands (namespace, band, value)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fingerprint_bands_entry "
+            "ON fingerprint_bands (entry_id)"
+        )
+        self._conn.commit()
+
+        logger.info(f"Opened near-duplicate index at {path}")
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        """Split a fingerprint into its LSH bands."""
+        return [
+            (fingerprint >> shift) & mask
+            for shift, mask in zip(self._band_shifts, self._band_masks)
+        ]
+
+    def _lookup(self, namespace: str, fingerprint: int) -> Optional[str]:
+        """Find the closest stored chunk within ``max_distance`` bits."""
+        bands = self._band_values(fingerprint)
+        condition = " OR ".join(["(b.band = ? AND b.value = ?)"] * self.bands)
+        params: List[Any] = [namespace]
+        for band, value in enumerate(bands):
+            params.extend((band, value))
+
+        rows = self._conn.execute(
+            "SELECT DISTINCT f.chunk_id, f.fingerprint "
+            "FROM fingerprint_bands b JOIN fingerprints f ON f.id = b.entry_id "
+            f"WHERE b.namespace = ? AND ({condition})",
+            params,
+        ).fetchall()
+
+        best: Optional[Tuple[int, str]] = None
+        for chunk_id, stored in rows:
+            distance = hamming_distance(fingerprint, stored & ((1 << 64) - 1))
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, chunk_id)
+        return best[1] if best else None
+
+    def plan(self, namespace: str, texts: Sequence[str]) -> DeduplicationPlan:
+        """
+        Decide which texts are near-duplicates of stored or earlier chunks.
+
+        Args:
+            namespace: Table the chunks are stored in
+            texts: Chunk contents in order
+
+        Returns:
+            DeduplicationPlan for the texts
+        """
+        fingerprints = [simhash(text) for text in texts]
+        matches: List[Optional[str]] = []
+        copies: List[Optional[int]] = []
+
+        # Fingerprints of new inputs in this batch, by band
+        batch_bands: Dict[Tuple[int, int], List[int]] = {}
+
+        with self._lock:
+            for position, fingerprint in enumerate(fingerprints):
+                match = self._lookup(namespace, fingerprint)
+                copy = None
+                if match is None:
+                    bands = self._band_values(fingerprint)
+                    for band, value in enumerate(bands):
+                        for earlier in batch_bands.get((band, value), ()):
+                            distance = hamming_distance(
+                                fingerprint, fingerprints[earlier]
+                            )
+                            if distance <= self.max_distance:
+                                copy = earlier
+                                break
+                        if copy is not None:
+                            break
+                    if copy is None:
+                        for band, value in enumerate(bands):
+                            batch_bands.setdefault((band, value), []).append(position)
+
+                matches.append(match)
+                copies.append(copy)
+
+            plan = DeduplicationPlan(fingerprints, matches, copies)
+            self.lookups += len(texts)
+            self.duplicates_found += plan.duplicate_count
+
+        if plan.duplicate_count:
+            logger.info(
+                f"Reusing {plan.duplicate_count} of {len(texts)} near-duplicate "
+                f"chunks in {namespace}"
+            )
+        return plan
+
+    def add(
+        self,
+        namespace: str,
+        plan: DeduplicationPlan,
+        stored_ids: Sequence[str],
+        keyword: Optional[str] = None,
+    ) -> None:
+        """
+        Record the chunks stored for a plan.
+
+        Args:
+            namespace: Table the chunks were stored in
+            plan: Plan the chunks were stored for
+            stored_ids: IDs of the stored inputs, in ``new_positions`` order
+            keyword: Research keyword the chunks belong to
+        """
+        now = time.time()
+        with self._lock:
+            for position, chunk_id in zip(plan.new_positions, stored_ids):
+                # Re-stored chunks replace their previous fingerprint
+                self._delete_entries(
+                    "namespace = ? AND chunk_id = ?", [namespace, chunk_id]
+                )
+
+                fingerprint = plan.fingerprints[position]
+                cursor = self._conn.execute(
+                    "INSERT INTO fingerprints "
+                    "(namespace, chunk_id, fingerprint, keyword, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (namespace, chunk_id, _to_signed(fingerprint), keyword, now),
+                )
+                entry_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO fingerprint_bands "
+                    "(namespace, band, value, entry_id) VALUES (?, ?, ?, ?)",
+                    [
+                        (namespace, band, value, entry_id)
+                        for band, value in enumerate(self._band_values(fingerprint))
+                    ],
+                )
+            self._conn.commit()
+
+    def reject_matches(
+        self, namespace: str, plan: DeduplicationPlan, chunk_ids: Collection[str]
+    ) -> int:
+        """
+        Drop matches to chunks that no longer exist, from a plan and the index.
+
+        Args:
+            namespace: Namespace the plan was made in
+            plan: Plan whose matches to drop
+            chunk_ids: IDs of the missing chunks
+
+        Returns:
+            Number of inputs no longer matched
+        """
+        with self._lock:
+            dropped = plan.drop_matches(chunk_ids)
+            self.duplicates_found -= dropped
+            self._forget(namespace, chunk_ids)
+            self._conn.commit()
+        return dropped
+
+    def forget(self, namespace: str, chunk_ids: Collection[str]) -> int:
+        """
+        Drop entries whose chunks were deleted.
+
+        Args:
+            namespace: Table the chunks were deleted from
+            chunk_ids: IDs of the deleted chunks
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = self._forget(namespace, chunk_ids)
+            self._conn.commit()
+        return removed
+
+    def _forget(self, namespace: str, chunk_ids: Collection[str]) -> int:
+        """Delete entries for the given chunks (caller holds the lock)."""
+        return sum(
+            self._delete_entries(
+                "namespace = ? AND chunk_id = ?", [namespace, chunk_id]
+            )
+            for chunk_id in chunk_ids
+        )
+
+    def _delete_entries(self, condition: str, params: List[Any]) -> int:
+        """Delete matching entries and their bands (caller holds the lock)."""
+        self._conn.execute(
+            "DELETE FROM fingerprint_bands WHERE entry_id IN "
+            f"(SELECT id FROM fingerprints WHERE {condition})",
+            params,
+        )
+        return self._conn.execute(
+            f"DELETE FROM fingerprints WHERE {condition}", params
+        ).rowcount
+
+    def __len__(self) -> int:
+        """Number of indexed chunks."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "indexed_chunks": len(self),
+            "lookups": self.lookups,
+            "near_duplicates_reused": self.duplicates_found,
+            "max_distance": self.max_distance,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+async def plan_stored_duplicates(
+    index: NearDuplicateIndex,
+    namespace: str,
+    texts: Sequence[str],
+    existing_ids: Callable[[List[str]], Awaitable[Collection[str]]],
+) -> DeduplicationPlan:
+    """
+    Plan texts against the index, reusing only chunks the database still has.
+
+    Args:
+        index: Near-duplicate index
+        namespace: Namespace to match within
+        texts: Chunk contents in order
+        existing_ids: Returns which of the given chunk IDs are stored
+
+    Returns:
+        DeduplicationPlan whose matches all exist
+    """
+    plan = index.plan(namespace, texts)
+    matched = {match for match in plan.matches if match is not None}
+    if not matched:
+        return plan
+
+    missing = matched - set(await existing_ids(sorted(matched)))
+    if missing:
+        dropped = index.reject_matches(namespace, plan, missing)
+        logger.info(
+            f"Storing {dropped} chunks again whose near-duplicates in "
+            f"{namespace} were deleted"
+        )
+    return plan
+
+
+# Shared indexes, one per database file
+_indexes: Dict[str, NearDuplicateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_near_duplicate_index(path: str, max_distance: int = 3) -> NearDuplicateIndex:
+    """Get or create the process-wide near-duplicate index for ``path``."""
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = NearDuplicateIndex(path, max_distance=max_distance)
+            _indexes[path] = index
+        return index
+
+
+def open_near_duplicate_index(config: Any) -> Optional[NearDuplicateIndex]:
+    """Open the configured index, or None if disabled or unavailable."""
+    path = getattr(config, "near_duplicate_index_path", None)
+    if not path or not isinstance(path, str):
+        return None
+
+    try:
+        return get_near_duplicate_index(
+            path, max_distance=config.near_duplicate_max_distance
+        )
+    except Exception as e:
+        # Deduplication is an optimization - never fail because of it
+        logger.warning(f"Near-duplicate index unavailable: {e}")
+        return None
@@ -6,14 +6,21 @@ with features for batch processing, caching, and cost tracking.
 """
 
 import asyncio
+import atexit
+import base64
 import hashlib
 import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from openai import AsyncOpenAI
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -23,28 +30,97 @@ from tenacity import (
 
 from config import get_config
 
+from .backends import EmbeddingBackend, create_backend
 from .config import get_rag_config
+from .ratelimit import (
+    RateGovernor,
+    get_rate_governor,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+from .similarity import SimilarityIndex
+from .singleflight import SingleFlight, SingleFlightAbandoned
 
 logger = logging.getLogger(__name__)
 
 
-class EmbeddingResult(BaseModel):
-    """Result from embedding generation."""
-
-    text: str = Field(description="Original text that was embedded")
-    embedding: List[float] = Field(description="Embedding vector")
-    model: str = Field(description="Model used for embedding")
-    token_count: int = Field(description="Number of tokens processed")
+def as_vector(embedding: Union[np.ndarray, Sequence[float], str]) -> np.ndarray:
+    """
+    Convert an embedding to a read-only, contiguous float32 vector.
+
+    Float32 arrays are wrapped without copying. Strings are treated as the
+    base64 payload returned by the embeddings API.
+
+    Args:
+        embedding: Array, sequence of floats or base64-encoded float32 buffer
+
+    Returns:
+        One-dimensional float32 numpy array
+    """
+    if isinstance(embedding, str):
+        vector = np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+    else:
+        vector = np.ascontiguousarray(embedding, dtype=np.float32).reshape(-1)
+
+    # Shared between caches and results, so guard against in-place edits
+    if vector.flags.writeable:
+        vector.flags.writeable = False
+    return vector
+
+
+@dataclass(slots=True, eq=False)
+class EmbeddingResult:
+    """
+    Result from embedding generation.
+
+    The vector is held as a contiguous float32 array (6 KB for 1536
+    dimensions instead of ~50 KB of boxed floats), so similarity math,
+    caching and storage encoding can use it without copying.
+    """
+
+    text: str
+    embedding: np.ndarray
+    model: str
+    token_count: int
+
+    def __post_init__(self) -> None:
+        """Normalize the embedding to a float32 vector."""
+        self.embedding = as_vector(self.embedding)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare results by value."""
+        if not isinstance(other, EmbeddingResult):
+            return NotImplemented
+        return (
+            self.text == other.text
+            and self.model == other.model
+            and self.token_count == other.token_count
+            and np.array_equal(self.embedding, other.embedding)
+        )
 
     def to_numpy(self) -> np.ndarray:
-        """Convert embedding to numpy array."""
-        # Convert the embedding list to numpy array for calculations
-        return np.array(self.embedding)
+        """Return the embedding as a float32 numpy array (no copy)."""
+        return self.embedding
+
+    def to_list(self) -> List[float]:
+        """Convert embedding to a list of floats for JSON boundaries."""
+        return self.embedding.tolist()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "text": self.text,
+            "embedding": self.to_list(),
+            "model": self.model,
+            "token_count": self.token_count,
+        }
 
 
 class EmbeddingCache(BaseModel):
     """In-memory cache for embeddings."""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     cache: Dict[str, EmbeddingResult] = Field(default_factory=dict)
     hit_count: int = Field(default=0, description="Number of cache hits")
     miss_count: int = Field(default=0, description="Number of cache misses")
@@ -91,6 +167,222 @@ class EmbeddingCache(BaseModel):
         return (self.hit_count / total) * 100
 
 
+class PersistentEmbeddingCache:
+    """
+    SQLite-backed embedding cache shared across runs and processes.
+
+    Vectors are stored as float32 blobs keyed by (model, dimensions, text
+    hash). The database runs in WAL mode so parallel workers can read while
+    another process writes, and the least recently used entries are evicted
+    once ``max_entries`` is exceeded.
+
+    Lookups only read. The access times they refresh are buffered and
+    written in one statement with the next store, on close or exit, or once
+    ``touch_batch_size`` hits are pending, so a hit never waits on a
+    write lock held by another process.
+    """
+
+    def __init__(
+        self, path: str, max_entries: int = 50_000, touch_batch_size: int = 256
+    ):
+        """Open (or create) the cache database at ``path``."""
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_batch_size = touch_batch_size
+        self.hit_count = 0
+        self.miss_count = 0
+
+        # Access times of hits not yet written, by key
+        self._pending_touches: Dict[Tuple[str, int, str], float] = {}
+
+        # One connection per process, serialized across threads
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                token_count INTEGER NOT NULL,
+                last_accessed REAL NOT NULL,
+                PRIMARY KEY (model, dimensions, text_hash)
+            ) WITHOUT ROWID
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_accessed "
+            "ON embeddings (last_accessed)"
+        )
+        self._conn.commit()
+        self._entry_count = self._count()
+
+        logger.info(f"Opened persistent embedding cache at {path}")
+
+    @staticmethod
+    def get_hash(text: str) -> str:
+        """Generate hash for text."""
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _count(self) -> int:
+        """Count stored embeddings."""
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get(self, text: str, model: str, dimensions: int) -> Optional[EmbeddingResult]:
+        """Get embedding from the persistent cache and queue an LRU refresh."""
+        key = (model, dimensions, self.get_hash(text))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector, token_count FROM embeddings "
+                "WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                key,
+            ).fetchone()
+
+            if row is None:
+                self.miss_count += 1
+                return None
+
+            self.hit_count += 1
+            self._pending_touches[key] = time.time()
+            if len(self._pending_touches) >= self.touch_batch_size:
+                self._write_touches()
+                self._conn.commit()
+
+        return EmbeddingResult(
+            text=text,
+            embedding=np.frombuffer(row[0], dtype=np.float32),
+            model=model,
+            token_count=row[1],
+        )
+
+    def put(self, result: EmbeddingResult, dimensions: int) -> None:
+        """Store embedding in the persistent cache, evicting old entries if full."""
+        vector = as_vector(result.embedding).tobytes()
+        with self._lock:
+            # Eviction must see recent hits as recently used
+            self._write_touches()
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, dimensions, text_hash, vector, token_count, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    result.model,
+                    dimensions,
+                    self.get_hash(result.text),
+                    vector,
+                    result.token_count,
+                    time.time(),
+                ),
+            )
+            self._entry_count += cursor.rowcount
+            if self._entry_count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _write_touches(self) -> None:
+        """Write buffered access times; the caller commits."""
+        if not self._pending_touches:
+            return
+
+        self._conn.executemany(
+            "UPDATE embeddings SET last_accessed = ? "
+            "WHERE model = ? AND dimensions = ? AND text_hash = ?",
+            [(accessed, *key) for key, accessed in self._pending_touches.items()],
+        )
+        self._pending_touches.clear()
+
+    def flush(self) -> None:
+        """Write buffered access times now, e.g. at interpreter exit."""
+        with self._lock:
+            try:
+                self._write_touches()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # Access times only order eviction - losing them is harmless
+                logger.debug(f"Could not write embedding access times: {e}")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to 90% of capacity."""
+        # Other processes may have written too, so recount before deleting
+        self._entry_count = self._count()
+        overflow = self._entry_count - int(self.max_entries * 0.9)
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE (model, dimensions, text_hash) IN ("
+            "SELECT model, dimensions, text_hash FROM embeddings "
+            "ORDER BY last_accessed LIMIT ?)",
+            (overflow,),
+        )
+        self._entry_count -= overflow
+        logger.debug(f"Evicted {overflow} embeddings from persistent cache")
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._pending_touches.clear()
+            self._entry_count = 0
+            self.hit_count = 0
+            self.miss_count = 0
+
+    def __len__(self) -> int:
+        """Number of stored embeddings."""
+        with self._lock:
+            return self._count()
+
+    @property
+    def hit_rate(self) -> float:
+        """Calculate cache hit rate."""
+        total = self.hit_count + self.miss_count
+        if total == 0:
+            return 0.0
+        return (self.hit_count / total) * 100
+
+    def close(self) -> None:
+        """Write buffered access times and close the database connection."""
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+            self._conn.close()
+
+
+# Shared persistent caches, one per database file
+_persistent_caches: Dict[str, PersistentEmbeddingCache] = {}
+_persistent_caches_lock = threading.Lock()
+
+
+def get_persistent_cache(
+    path: str, max_entries: int = 50_000
+) -> PersistentEmbeddingCache:
+    """Get or create the process-wide persistent cache for ``path``."""
+    with _persistent_caches_lock:
+        cache = _persistent_caches.get(path)
+        if cache is None:
+            cache = PersistentEmbeddingCache(path, max_entries=max_entries)
+            _persistent_caches[path] = cache
+            # Shared caches stay open for the life of the process
+            atexit.register(cache.flush)
+        return cache
+
+
+# Embedding requests in flight across all generators in this process
+_inflight_embeddings: SingleFlight[EmbeddingResult] = SingleFlight()
+
+_backoff = wait_exponential(multiplier=1, min=4, max=60)
+
+
+def _retry_wait(retry_state) -> float:
+    """Back off exponentially, except after 429s the rate governor paces."""
+    if is_rate_limit_error(retry_state.outcome.exception()):
+        return 0.0
+    return _backoff(retry_state)
+
+
 class CostTracker(BaseModel):
     """Track embedding generation costs."""
 
@@ -120,7 +412,7 @@ class CostTracker(BaseModel):
 
 
 class EmbeddingGenerator:
-    """Generate embeddings using OpenAI's API with caching and retry logic."""
+    """Generate embeddings through the configured backend with caching and retries."""
 
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the embedding generator."""
@@ -128,26 +420,137 @@ class EmbeddingGenerator:
         self.rag_config = get_rag_config()
         self.main_config = get_config()
 
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(api_key=api_key or self.main_config.openai_api_key)
-
         # Initialize cache and cost tracker
         self.cache = EmbeddingCache()
         self.cost_tracker = CostTracker()
 
-        # Set model from RAG config
-        self.model = self.rag_config.embedding_model_name
+        # Select the embedding provider (OpenAI unless configured otherwise)
+        backend_name = self.rag_config.embedding_backend
+        client = None
+        if backend_name != "local":
+            client = AsyncOpenAI(api_key=api_key or self.main_config.openai_api_key)
+        self.backend: EmbeddingBackend = create_backend(
+            backend_name,
+            model=self.rag_config.embedding_model_name,
+            dimensions=self.rag_config.embedding_dimensions,
+            client=client,
+        )
+
+        # Results and cache keys are tagged with the backend's model
+        self.model = self.backend.model
+        self.dimensions = self.backend.dimensions
+
+        # Shared on-disk cache behind the per-instance memory cache
+        self.persistent_cache = self._open_persistent_cache()
+
+        # One RPM/TPM budget for every generator using this model
+        self.rate_governor: Optional[RateGovernor] = None
+        if self.backend.rate_limited:
+            self.rate_governor = get_rate_governor(
+                self.model,
+                requests_per_minute=self.rag_config.embedding_requests_per_minute,
+                tokens_per_minute=self.rag_config.embedding_tokens_per_minute,
+            )
 
         logger.info(f"Initialized EmbeddingGenerator with model: {self.model}")
 
+    @property
+    def client(self) -> Any:
+        """OpenAI client used by the backend (None for local backends)."""
+        return getattr(self.backend, "client", None)
+
+    @client.setter
+    def client(self, client: Any) -> None:
+        """Swap the OpenAI client, e.g. for a mock in tests."""
+        self.backend.client = client
+
+    def _open_persistent_cache(self) -> Optional[PersistentEmbeddingCache]:
+        """Open the shared persistent cache, or None if disabled or unavailable."""
+        path = self.rag_config.embedding_cache_path
+        if not path:
+            return None
+
+        try:
+            return get_persistent_cache(
+                path, max_entries=self.rag_config.embedding_cache_max_entries
+            )
+        except Exception as e:
+            # The disk cache is an optimization - never fail because of it
+            logger.warning(f"Persistent embedding cache unavailable: {e}")
+            return None
+
+    def _flight_key(self, text: str) -> Tuple[str, int, str]:
+        """Key identifying an in-flight embedding request for text."""
+        return (self.model, self.dimensions, hashlib.sha256(text.encode()).hexdigest())
+
+    def _get_cached(self, text: str) -> Optional[EmbeddingResult]:
+        """Look up text in the memory cache, then the persistent cache."""
+        cached_result = self.cache.get(text)
+        if cached_result or self.persistent_cache is None:
+            return cached_result
+
+        try:
+            cached_result = self.persistent_cache.get(text, self.model, self.dimensions)
+        except Exception as e:
+            logger.warning(f"Persistent embedding cache lookup failed: {e}")
+            return None
+
+        if cached_result:
+            self.cache.put(text, cached_result)
+        return cached_result
+
+    def _put_cached(self, text: str, result: EmbeddingResult) -> None:
+        """Store result in the memory cache and the persistent cache."""
+        self.cache.put(text, result)
+        if self.persistent_cache is None:
+            return
+
+        try:
+            self.persistent_cache.put(result, self.dimensions)
+        except Exception as e:
+            logger.warning(f"Persistent embedding cache write failed: {e}")
+
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count for text."""
         # Rough estimation: ~4 characters per token for English text
         return max(1, len(text) // 4)
 
+    async def _create_embeddings(
+        self, inputs: Union[str, List[str]], estimated_tokens: int
+    ) -> Tuple[List[Any], int]:
+        """
+        Request embeddings from the backend under the shared rate governor.
+
+        Args:
+            inputs: Text or texts to embed
+            estimated_tokens: Estimated input tokens, reserved before sending
+
+        Returns:
+            Tuple of (vectors in input order, billed tokens)
+        """
+        governor = self.rate_governor
+        try:
+            if governor is not None:
+                await governor.acquire(estimated_tokens)
+            batch = await self.backend.embed(inputs)
+        except BaseException as e:
+            # A 429 drains the buckets anyway; other failures (timeouts,
+            # 5xx, cancellation) were not billed, so return the estimate
+            if governor is not None:
+                if is_rate_limit_error(e):
+                    governor.throttle(retry_after_seconds(e))
+                else:
+                    governor.release(estimated_tokens)
+            raise
+
+        tokens = batch.tokens or estimated_tokens
+        if governor is not None:
+            governor.settle(estimated_tokens, tokens)
+        return batch.vectors, tokens
+
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=60),
+        wait=_retry_wait,
         retry=retry_if_exception_type(Exception),
     )
     async def _generate_single_embedding(self, text: str) -> EmbeddingResult:
@@ -159,22 +562,14 @@ class EmbeddingGenerator:
 
         # Make API call
         logger.debug(f"Generating embedding for text of length: {len(text)}")
-        response = await self.client.embeddings.create(
-            model=self.model,
-            input=text,
+        vectors, token_count = await self._create_embeddings(
+            text, self._estimate_tokens(text)
         )
 
-        # Extract embedding data
-        embedding_data = response.data[0]
-        embedding = embedding_data.embedding
-
-        # Estimate tokens (API doesn't return usage for embeddings)
-        token_count = self._estimate_tokens(text)
-
         # Create result
         result = EmbeddingResult(
             text=text,
-            embedding=embedding,
+            embedding=vectors[0],
             model=self.model,
             token_count=token_count,
         )
@@ -187,22 +582,138 @@ class EmbeddingGenerator:
     async def generate_embedding(self, text: str) -> EmbeddingResult:
         """Generate embedding for a single text."""
         # Check cache first
-        cached_result = self.cache.get(text)
+        cached_result = self._get_cached(text)
         if cached_result:
             return cached_result
 
-        # Generate new embedding
-        result = await self._generate_single_embedding(text)
-
-        # Cache the result
-        self.cache.put(text, result)
+        # Share the request with any concurrent caller embedding the same text
+        key = self._flight_key(text.strip())
+        future, leader = _inflight_embeddings.claim(key)
+        if not leader:
+            try:
+                result = await _inflight_embeddings.wait(future)
+            except SingleFlightAbandoned:
+                return await self.generate_embedding(text)
+            self.cache.put(text, result)
+            return result
+
+        try:
+            # Generate new embedding
+            result = await self._generate_single_embedding(text)
+
+            # Cache the result
+            self._put_cached(text, result)
+        except Exception as e:
+            SingleFlight.reject(future, e)
+            raise
+        else:
+            SingleFlight.resolve(future, result)
+        finally:
+            _inflight_embeddings.release(key, future)
 
         return result
 
+    def _pack_batches(
+        self, texts: List[str], batch_size: int, max_tokens: int
+    ) -> List[List[int]]:
+        """
+        Pack text positions into request-sized batches.
+
+        Each batch holds at most ``batch_size`` inputs and at most
+        ``max_tokens`` estimated tokens. A text that exceeds the budget on
+        its own is sent alone and left for the API to accept or reject.
+
+        Args:
+            texts: Texts to pack
+            batch_size: Maximum number of inputs per request
+            max_tokens: Maximum estimated tokens per request
+
+        Returns:
+            List of batches, each a list of positions into ``texts``
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for position, text in enumerate(texts):
+            tokens = self._estimate_tokens(text)
+
+            # Close the current batch if this text would overflow it
+            if current and (
+                len(current) >= batch_size or current_tokens + tokens > max_tokens
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+
+            current.append(position)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=_retry_wait,
+        retry=retry_if_exception_type(Exception),
+        reraise=True,
+    )
+    async def _generate_batch_embeddings(
+        self, texts: List[str]
+    ) -> List[EmbeddingResult]:
+        """
+        Generate embeddings for several texts in a single API request.
+
+        Retries apply to this request only, so a failing batch never
+        re-sends batches that already succeeded.
+
+        Args:
+            texts: Non-empty, stripped texts to embed
+
+        Returns:
+            Embedding results in the same order as ``texts``
+        """
+        logger.debug(f"Requesting embeddings for batch of {len(texts)} texts")
+        estimates = [self._estimate_tokens(text) for text in texts]
+        vectors, total_tokens = await self._create_embeddings(texts, sum(estimates))
+
+        # Usage is only reported per request, so per-text counts stay estimates
+        results = []
+        for text, embedding, token_count in zip(texts, vectors, estimates):
+            results.append(
+                EmbeddingResult(
+                    text=text,
+                    embedding=embedding,
+                    model=self.model,
+                    token_count=token_count,
+                )
+            )
+
+        # One request regardless of how many inputs it carried
+        self.cost_tracker.add_usage(total_tokens)
+
+        return results
+
     async def generate_embeddings(
         self, texts: List[str], batch_size: Optional[int] = None
     ) -> List[EmbeddingResult]:
-        """Generate embeddings for multiple texts in batches."""
+        """
+        Generate embeddings for multiple texts using multi-input requests.
+
+        Duplicate texts are embedded once, cached texts are resolved first,
+        and texts already being embedded by a concurrent caller await that
+        request. The rest are packed into requests bounded by
+        ``batch_size`` inputs and the configured token budget.
+
+        Args:
+            texts: Texts to embed (empty texts are skipped)
+            batch_size: Maximum inputs per request (defaults to config)
+
+        Returns:
+            List of EmbeddingResult objects in input order
+        """
         # Use RAG config batch size if not specified
         if batch_size is None:
             batch_size = self.rag_config.embedding_batch_size
@@ -212,33 +723,95 @@ class EmbeddingGenerator:
         if not texts:
             return []
 
-        # Collect results
-        results = []
-
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-
-            # Create tasks for parallel processing
-            tasks = [self.generate_embedding(text) for text in batch]
-
-            # Wait for all embeddings in batch
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Handle results and exceptions
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    logger.error(
-                        f"Failed to generate embedding for text {i+j}: {result}"
-                    )
-                    # Re-raise the exception
-                    raise result
-                results.append(result)
-
-            # Log progress
-            logger.info(f"Generated embeddings for batch {i//batch_size + 1}")
+        # Resolve each distinct text from cache or an in-flight request
+        resolved: Dict[str, EmbeddingResult] = {}
+        owned: Dict[str, asyncio.Future] = {}
+        shared: Dict[str, asyncio.Future] = {}
+        for text in dict.fromkeys(texts):
+            cached_result = self._get_cached(text)
+            if cached_result:
+                resolved[text] = cached_result
+                continue
+
+            future, leader = _inflight_embeddings.claim(self._flight_key(text))
+            if leader:
+                owned[text] = future
+            else:
+                shared[text] = future
+
+        try:
+            if owned:
+                resolved.update(await self._embed_owned(owned, batch_size))
+        finally:
+            for text, future in owned.items():
+                _inflight_embeddings.release(self._flight_key(text), future)
+
+        for text, future in shared.items():
+            try:
+                result = await _inflight_embeddings.wait(future)
+            except SingleFlightAbandoned:
+                result = await self.generate_embedding(text)
+            self.cache.put(text, result)
+            resolved[text] = result
+
+        return [resolved[text] for text in texts]
+
+    async def _embed_owned(
+        self, owned: Dict[str, asyncio.Future], batch_size: int
+    ) -> Dict[str, EmbeddingResult]:
+        """
+        Embed texts this call leads, publishing results to waiting callers.
+
+        Args:
+            owned: Texts mapped to the shared futures this call must resolve
+            batch_size: Maximum inputs per request
+
+        Returns:
+            Mapping of text to its embedding result
+        """
+        pending_texts = list(owned)
+        batches = self._pack_batches(
+            pending_texts,
+            batch_size=batch_size,
+            max_tokens=self.rag_config.embedding_max_batch_tokens,
+        )
 
-        return results
+        # Send all packed batches concurrently
+        tasks = [
+            self._generate_batch_embeddings([pending_texts[j] for j in batch])
+            for batch in batches
+        ]
+        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Cache every successful batch before surfacing any failure
+        resolved: Dict[str, EmbeddingResult] = {}
+        first_error: Optional[BaseException] = None
+        for batch_number, (batch, outcome) in enumerate(
+            zip(batches, batch_results), start=1
+        ):
+            if isinstance(outcome, BaseException):
+                logger.error(
+                    f"Failed to generate embeddings for batch {batch_number}: "
+                    f"{outcome}"
+                )
+                for j in batch:
+                    SingleFlight.reject(owned[pending_texts[j]], outcome)
+                first_error = first_error or outcome
+                continue
+
+            for result in outcome:
+                self._put_cached(result.text, result)
+                SingleFlight.resolve(owned[result.text], result)
+                resolved[result.text] = result
+
+            logger.info(
+                f"Generated embeddings for batch {batch_number} ({len(batch)} texts)"
+            )
+
+        if first_error is not None:
+            raise first_error
+
+        return resolved
 
     def calculate_similarity(
         self, embedding1: List[float], embedding2: List[float]
@@ -267,20 +840,26 @@ class EmbeddingGenerator:
         query_embedding: List[float],
         embeddings: List[Tuple[str, List[float]]],
         top_k: int = 5,
+        threshold: Optional[float] = None,
     ) -> List[Tuple[str, float]]:
-        """Find most similar embeddings to a query."""
-        # Calculate similarities for all embeddings
-        similarities = []
+        """
+        Find most similar embeddings to a query.
 
-        for identifier, embedding in embeddings:
-            similarity = self.calculate_similarity(query_embedding, embedding)
-            similarities.append((identifier, similarity))
+        Candidates are scored in a single matrix product; callers that
+        search the same candidates repeatedly should build a
+        ``SimilarityIndex`` once and reuse it.
 
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            query_embedding: Query vector
+            embeddings: (identifier, vector) candidates
+            top_k: Maximum number of results
+            threshold: Optional minimum similarity
 
-        # Return top k results
-        return similarities[:top_k]
+        Returns:
+            List of (identifier, similarity) tuples, most similar first
+        """
+        index = SimilarityIndex.from_pairs(embeddings)
+        return index.search(query_embedding, top_k=top_k, threshold=threshold)
 
     def get_statistics(self) -> Dict[str, any]:
         """Get usage statistics."""
@@ -290,6 +869,14 @@ class EmbeddingGenerator:
             "cache_hits": self.cache.hit_count,
             "cache_misses": self.cache.miss_count,
             "cached_embeddings": len(self.cache.cache),
+            "coalesced_requests": _inflight_embeddings.coalesced_count,
+            **(self.rate_governor.get_statistics() if self.rate_governor else {}),
+            "persistent_cache_hits": (
+                self.persistent_cache.hit_count if self.persistent_cache else 0
+            ),
+            "persistent_cache_misses": (
+                self.persistent_cache.miss_count if self.persistent_cache else 0
+            ),
             "total_tokens": self.cost_tracker.total_tokens,
             "total_requests": self.cost_tracker.total_requests,
             "total_cost_usd": f"${self.cost_tracker.total_cost:.4f}",
@@ -24,13 +24,37 @@ from supabase.lib.client_options import ClientOptions
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from .storage import VectorStorage
+from .bulk_load import copy_upsert
+from .chunk_filter import ChunkFilter
 from .config import get_rag_config
+from .dedup import open_near_duplicate_index, plan_stored_duplicates
 from .embeddings import EmbeddingResult, EmbeddingGenerator
 from .processor import TextChunk
 from models import AcademicSource, ExtractedContent, CrawledPage, DomainAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Columns of content_chunks written by _process_and_store_chunks
+_CONTENT_CHUNK_COLUMNS = (
+    "id",
+    "source_id",
+    "chunk_text",
+    "chunk_number",
+    "chunk_overlap",
+    "chunk_metadata",
+    "chunk_type",
+    "chunk_embedding",
+)
+
+# Declared dimensions of content_chunks.chunk_embedding (NULL without the
+# table, -1 for a vector column without fixed dimensions)
+_CHUNK_EMBEDDING_DIMENSIONS_QUERY = """
+    SELECT atttypmod
+    FROM pg_attribute
+    WHERE attrelid = to_regclass('content_chunks')
+      AND attname = 'chunk_embedding'
+"""
+
 
 class EnhancedVectorStorage(VectorStorage):
     """
@@ -53,6 +77,12 @@ class EnhancedVectorStorage(VectorStorage):
         self.embedding_queue_batch = 10
         self.relationship_threshold = 0.7
 
+        # Created on first use so storage works without embedding credentials
+        self._embedding_generator: Optional[EmbeddingGenerator] = None
+
+        # Set once content_chunks is known to fit the configured embeddings
+        self._chunk_dimensions_checked = False
+
         logger.info("Initialized EnhancedVectorStorage with Phase 3 capabilities")
 
     # ============================================
@@ -590,54 +620,108 @@ class EnhancedVectorStorage(VectorStorage):
                 query_embedding, limit=limit
             )
 
-            if not include_related:
-                return [
-                    {"primary": chunk, "related": []} for chunk, _ in primary_results
-                ]
-
-            # Get unique source IDs from results
-            source_ids = list(
-                set(
-                    chunk.get("source_id")
-                    for chunk, _ in primary_results
-                    if chunk.get("source_id")
-                )
+            return await self._attach_related_sources(
+                primary_results, include_related, relationship_types, {}
             )
 
-            # Get related sources for each
-            results_with_related = []
-            for chunk, similarity in primary_results:
-                source_id = chunk.get("source_id")
-                if source_id:
-                    related = await self.get_related_sources(
+        except Exception as e:
+            logger.error(f"Failed to search with relationships: {e}")
+            return []
+
+    async def bulk_search_with_relationships(
+        self,
+        query_embeddings: List[List[float]],
+        include_related: bool = True,
+        relationship_types: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Semantic search with related sources for several query vectors.
+
+        Primary results for all queries come from one bulk_search statement,
+        and related sources are fetched once per source across the batch.
+
+        Args:
+            query_embeddings: Query vectors
+            include_related: Whether to include related sources
+            relationship_types: Types of relationships to include
+            limit: Maximum primary results per query
+
+        Returns:
+            Search results with related sources, one list per query vector
+        """
+        try:
+            primary_results = await self.bulk_search(
+                query_embeddings, limit_per_query=limit
+            )
+
+            related_by_source: Dict[str, List[Dict[str, Any]]] = {}
+            return [
+                await self._attach_related_sources(
+                    results, include_related, relationship_types, related_by_source
+                )
+                for results in primary_results
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to search with relationships: {e}")
+            return [[] for _ in query_embeddings]
+
+    async def _attach_related_sources(
+        self,
+        primary_results: List[Tuple[Dict[str, Any], float]],
+        include_related: bool,
+        relationship_types: Optional[List[str]],
+        related_by_source: Dict[str, List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Pair primary search results with their related sources.
+
+        Args:
+            primary_results: (chunk_data, similarity) search results
+            include_related: Whether to include related sources
+            relationship_types: Types of relationships to include
+            related_by_source: Related sources already fetched, by source ID
+
+        Returns:
+            Search results with related sources
+        """
+        if not include_related:
+            return [{"primary": chunk, "related": []} for chunk, _ in primary_results]
+
+        # Get related sources for each
+        results_with_related = []
+        for chunk, similarity in primary_results:
+            source_id = chunk.get("source_id")
+            if source_id:
+                if source_id not in related_by_source:
+                    related_by_source[source_id] = await self.get_related_sources(
                         source_id,
                         relationship_type=(
                             relationship_types[0] if relationship_types else None
                         ),
                     )
-                    results_with_related.append(
-                        {
-                            "primary": chunk,
-                            "similarity": similarity,
-                            "related": related[:3],  # Limit related sources
-                        }
-                    )
-                else:
-                    results_with_related.append(
-                        {"primary": chunk, "similarity": similarity, "related": []}
-                    )
-
-            return results_with_related
+                related = related_by_source[source_id]
+                results_with_related.append(
+                    {
+                        "primary": chunk,
+                        "similarity": similarity,
+                        "related": related[:3],  # Limit related sources
+                    }
+                )
+            else:
+                results_with_related.append(
+                    {"primary": chunk, "similarity": similarity, "related": []}
+                )
 
-        except Exception as e:
-            logger.error(f"Failed to search with relationships: {e}")
-            return []
+        return results_with_related
 
     async def hybrid_search(
         self,
         keyword: str,
         embedding: List[float],
         weights: Optional[Dict[str, float]] = None,
+        filters: Optional[ChunkFilter] = None,
     ) -> List[Dict[str, Any]]:
         """
         Combined keyword + vector search.
@@ -646,6 +730,8 @@ class EnhancedVectorStorage(VectorStorage):
             keyword: Search keyword
             embedding: Query embedding
             weights: Weights for combining scores
+            filters: Chunk constraints applied inside the vector search; its
+                min_credibility also applies to the keyword search
 
         Returns:
             Combined search results
@@ -655,10 +741,16 @@ class EnhancedVectorStorage(VectorStorage):
 
         try:
             # Keyword search
-            keyword_results = await self.search_by_criteria(keyword=keyword, limit=50)
+            keyword_results = await self.search_by_criteria(
+                keyword=keyword,
+                min_credibility=filters.min_credibility if filters else None,
+                limit=50,
+            )
 
-            # Vector search
-            vector_results = await self.search_similar_chunks(embedding, limit=50)
+            # Vector search, filtered in the database so the 50 rows all match
+            vector_results = await self.search_similar_chunks(
+                embedding, limit=50, filters=filters
+            )
 
             # Combine and score results
             combined_scores = {}
@@ -880,14 +972,16 @@ class EnhancedVectorStorage(VectorStorage):
         chunk_size: int = 500,
         chunk_overlap: int = 50,
     ) -> List[str]:
-        """Process content into chunks and store with embeddings."""
-        try:
-            # For now, skip actual embedding generation in tests
-            # In production, you would use:
-            # embedding_generator = EmbeddingGenerator(self.config)
-            # embeddings = await embedding_generator.generate_embeddings(chunk_texts)
+        """
+        Process content into chunks and store with embeddings.
 
-            # Simple text chunking without embeddings for testing
+        Raises:
+            ValueError: If content_chunks stores other embedding dimensions
+                than EMBEDDING_DIMENSIONS
+        """
+        await self._check_chunk_embedding_dimensions()
+
+        try:
             chunks = []
             text_length = len(content)
             start = 0
@@ -896,38 +990,73 @@ class EnhancedVectorStorage(VectorStorage):
                 end = min(start + chunk_size, text_length)
                 chunk_text = content[start:end]
 
-                # Create mock embedding for testing (normally would use OpenAI)
-                import numpy as np
-
-                np.random.seed(hash(chunk_text) % 2**32)
-                mock_embedding = np.random.randn(1536)
-                mock_embedding = (
-                    mock_embedding / np.linalg.norm(mock_embedding)
-                ).tolist()
-
-                chunks.append(
-                    {
-                        "source_id": source_id,
-                        "chunk_text": chunk_text,
-                        "chunk_embedding": mock_embedding,
-                        "chunk_number": len(chunks) + 1,
-                        "chunk_overlap": chunk_overlap,
-                        "chunk_metadata": json.dumps(
-                            {"start_char": start, "end_char": end}
-                        ),
-                        "chunk_type": "content",
-                    }
-                )
+                if chunk_text.strip():
+                    chunks.append(
+                        {
+                            "source_id": source_id,
+                            "chunk_text": chunk_text,
+                            "chunk_number": len(chunks) + 1,
+                            "chunk_overlap": chunk_overlap,
+                            "chunk_metadata": json.dumps(
+                                {"start_char": start, "end_char": end}
+                            ),
+                            "chunk_type": "content",
+                        }
+                    )
 
                 # Move to next chunk with overlap
                 start = end - chunk_overlap if end < text_length else end
 
-            # Store chunks in batches
+            # Content this source already stored (e.g. after a re-crawl)
+            # reuses the existing chunk instead of being embedded again.
+            # Matches stay within the source, since chunks belong to one
+            plan = None
+            namespace = f"content_chunks:{source_id}"
+            index = open_near_duplicate_index(self.config)
+            if index is not None:
+                try:
+                    plan = await plan_stored_duplicates(
+                        index,
+                        namespace,
+                        [chunk["chunk_text"] for chunk in chunks],
+                        self._existing_content_chunk_ids,
+                    )
+                    chunks = [chunks[i] for i in plan.new_positions]
+                except Exception as e:
+                    logger.warning(f"Near-duplicate lookup failed: {e}")
+
             stored_ids = []
-            for i in range(0, len(chunks), self.batch_size):
-                batch = chunks[i : i + self.batch_size]
-                result = self.supabase.table("content_chunks").insert(batch).execute()
-                stored_ids.extend([r["id"] for r in result.data])
+            if chunks:
+                # Embed through the configured backend (OpenAI or local)
+                embeddings = await self._get_embedding_generator().generate_embeddings(
+                    [chunk["chunk_text"] for chunk in chunks]
+                )
+                for chunk, embedding in zip(chunks, embeddings):
+                    # IDs are assigned here so they are known without
+                    # reading rows back
+                    chunk["id"] = str(uuid4())
+                    # Sent through the binary pgvector codec
+                    chunk["chunk_embedding"] = embedding.embedding
+
+                # Store chunks with one COPY and a set-based insert
+                async with self.get_connection() as conn:
+                    stored_ids = await copy_upsert(
+                        conn,
+                        "content_chunks",
+                        _CONTENT_CHUNK_COLUMNS,
+                        [
+                            [chunk[column] for column in _CONTENT_CHUNK_COLUMNS]
+                            for chunk in chunks
+                        ],
+                        update=False,
+                    )
+
+            if plan is not None:
+                try:
+                    index.add(namespace, plan, stored_ids)
+                except Exception as e:
+                    logger.warning(f"Near-duplicate index update failed: {e}")
+                stored_ids = list(dict.fromkeys(plan.resolve_ids(stored_ids)))
 
             return stored_ids
 
@@ -935,6 +1064,52 @@ class EnhancedVectorStorage(VectorStorage):
             logger.error(f"Failed to process and store chunks: {e}")
             return []
 
+    async def _existing_content_chunk_ids(self, chunk_ids: List[str]) -> List[str]:
+        """Return the given content chunk IDs that are still stored."""
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(
+                "SELECT id::text FROM content_chunks WHERE id = ANY($1::uuid[])",
+                chunk_ids,
+            )
+        return [row["id"] for row in rows]
+
+    async def _check_chunk_embedding_dimensions(self) -> None:
+        """
+        Make sure content_chunks can store the configured embeddings.
+
+        Checked once per instance, before any content is embedded. If the
+        database cannot be reached, the check is retried on the next call.
+
+        Raises:
+            ValueError: If chunk_embedding has other dimensions than
+                EMBEDDING_DIMENSIONS
+        """
+        if self._chunk_dimensions_checked:
+            return
+
+        try:
+            async with self.get_connection() as conn:
+                dimensions = await conn.fetchval(_CHUNK_EMBEDDING_DIMENSIONS_QUERY)
+        except Exception as e:
+            logger.warning(f"Could not check content_chunks dimensions: {e}")
+            return
+
+        expected = self.config.embedding_dimensions
+        if dimensions is not None and dimensions > 0 and dimensions != expected:
+            raise ValueError(
+                f"content_chunks.chunk_embedding stores {dimensions} dimensions "
+                f"but EMBEDDING_DIMENSIONS is {expected}; resize it with "
+                "sql/research_chunks_compact_embeddings.sql"
+            )
+
+        self._chunk_dimensions_checked = True
+
+    def _get_embedding_generator(self) -> EmbeddingGenerator:
+        """Get the embedding generator, creating it on first use."""
+        if self._embedding_generator is None:
+            self._embedding_generator = EmbeddingGenerator()
+        return self._embedding_generator
+
     async def _get_source_relationships(self, source_id: str) -> List[Dict]:
         """Get all relationships for a source."""
         try:
@@ -0,0 +1,161 @@
+"""
+In-Process Findings Cache.
+
+Keeps recently returned ResearchFindings in memory, keyed by normalized
+keyword, in front of ResearchRetriever.retrieve_or_research. An agent that
+calls the search tool several times for the same query within a run (or a
+batch that repeats keywords) gets the findings without a database round
+trip.
+
+Entries expire after a fixed time so research refreshed by another
+process is picked up, and the least recently used entry is dropped when
+the cache is full. `seo-content cache clear` invalidates the cache.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from models import ResearchFindings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Normalize a keyword the way cache_entries.keyword_normalized is."""
+    return keyword.lower().strip()
+
+
+class FindingsCache:
+    """
+    TTL and size bounded LRU cache of research findings.
+
+    Cached findings are returned as stored, not copied; callers must not
+    modify them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached keywords (0 disables the cache)
+            ttl_seconds: Seconds an entry is served after it was stored
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, ResearchFindings]]" = (
+            OrderedDict()
+        )
+
+        # Hit metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, keyword: str) -> Optional[ResearchFindings]:
+        """
+        Get cached findings for a keyword.
+
+        Args:
+            keyword: Search keyword
+
+        Returns:
+            Cached findings or None if missing or expired
+        """
+        if not self.enabled:
+            return None
+
+        key = normalize_keyword(keyword)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, findings = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return findings
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, keyword: str, findings: ResearchFindings) -> None:
+        """
+        Cache findings for a keyword.
+
+        Args:
+            keyword: Search keyword the findings were returned for
+            findings: Findings to cache
+        """
+        if not self.enabled:
+            return
+
+        key = normalize_keyword(keyword)
+        self._entries[key] = (self._clock() + self.ttl_seconds, findings)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, keyword: Optional[str] = None) -> int:
+        """
+        Remove cached findings.
+
+        Args:
+            keyword: Keyword to remove (None removes everything)
+
+        Returns:
+            Number of entries removed
+        """
+        if keyword is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            removed = int(
+                self._entries.pop(normalize_keyword(keyword), None) is not None
+            )
+
+        self.invalidations += removed
+        if removed:
+            logger.debug(f"Invalidated {removed} in-process findings cache entries")
+        return removed
+
+    def __len__(self) -> int:
+        """Number of cached keywords, including expired ones not yet removed."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Calculate cache hit rate."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return (self.hits / total) * 100
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": f"{self.hit_rate:.1f}%",
+        }
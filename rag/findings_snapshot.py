@@ -0,0 +1,68 @@
+"""
+Serialized ResearchFindings Snapshots for Cache Entries.
+
+A cache entry stores its findings twice: as chunks (searchable, shared
+between entries) and as one compact snapshot of the whole ResearchFindings
+object. An exact cache hit decodes the snapshot instead of fetching every
+chunk and rebuilding the findings from chunk metadata.
+
+A snapshot is one version byte followed by the findings' JSON, compressed
+with zlib. Snapshots with another version are ignored, and the entry is
+rebuilt from its chunks as before. Bump SNAPSHOT_VERSION whenever
+ResearchFindings or AcademicSource change in a way old snapshots do not fit.
+
+The column is created by sql/cache_entries_findings_snapshot.sql.
+"""
+
+import zlib
+from typing import Optional
+
+from models import ResearchFindings
+
+SNAPSHOT_VERSION = 1
+
+# A current snapshot as it starts in PostgreSQL's hex output for bytea
+# (also how to_jsonb renders it), used to skip fetching chunks in SQL
+SNAPSHOT_HEX_PREFIX = f"\\x{SNAPSHOT_VERSION:02x}"
+
+
+def encode_findings(findings: ResearchFindings) -> bytes:
+    """
+    Serialize research findings into a versioned, compressed snapshot.
+
+    Args:
+        findings: Research findings to store
+
+    Returns:
+        Snapshot bytes
+    """
+    payload = zlib.compress(findings.model_dump_json().encode())
+    return bytes([SNAPSHOT_VERSION]) + payload
+
+
+def decode_findings(snapshot: bytes) -> Optional[ResearchFindings]:
+    """
+    Restore research findings from a snapshot.
+
+    pydantic-core parses the JSON straight into the models in one pass.
+    That is faster than json.loads followed by model_construct, which
+    skips validation but builds every AcademicSource in Python.
+
+    Args:
+        snapshot: Snapshot bytes
+
+    Returns:
+        ResearchFindings, or None if the snapshot has another version
+
+    Raises:
+        ValueError: If the snapshot is corrupt
+    """
+    if not snapshot or snapshot[0] != SNAPSHOT_VERSION:
+        return None
+
+    try:
+        payload = zlib.decompress(snapshot[1:])
+    except zlib.error as e:
+        raise ValueError(f"Corrupt findings snapshot: {e}") from e
+
+    return ResearchFindings.model_validate_json(payload)
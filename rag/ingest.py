@@ -0,0 +1,225 @@
+"""
+Multi-core Ingestion Stage for RAG System.
+
+Moves CPU-bound text processing (normalization, sentence splitting,
+chunking, key-phrase and statistics extraction) off the event loop into a
+process pool, so batch crawls scale with CPU cores instead of stalling
+concurrent I/O. Small documents are processed inline, where shipping them
+to another process would cost more than it saves.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from tools import extract_key_statistics
+
+from .processor import TextChunk, TextProcessor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class IngestDocument:
+    """A raw document waiting to be chunked."""
+
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    source_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class IngestedDocument:
+    """Chunks and extracted features for one document."""
+
+    chunks: List[TextChunk]
+    key_phrases: List[str]
+    statistics: List[str]
+
+
+def ingest_document(
+    processor: TextProcessor, document: IngestDocument
+) -> IngestedDocument:
+    """
+    Process one document (runs in a worker process for large documents).
+
+    Args:
+        processor: Processor carrying the chunking settings
+        document: Document to process
+
+    Returns:
+        Ready-to-embed chunks plus key phrases and statistics
+    """
+    chunks = processor.chunk_text(document.text, metadata=document.metadata)
+    if document.source_id:
+        for chunk in chunks:
+            chunk.source_id = document.source_id
+
+    return IngestedDocument(
+        chunks=chunks,
+        key_phrases=processor.extract_key_phrases(document.text),
+        statistics=extract_key_statistics(document.text),
+    )
+
+
+class IngestionPipeline:
+    """
+    Process-pool ingestion stage feeding the embedding batcher.
+
+    Documents are submitted to worker processes a bounded number at a time
+    and their chunks are regrouped into embedding batches in document order.
+    New documents are only submitted as the consumer pulls batches, so a
+    slow embedding API applies back-pressure instead of letting chunked
+    documents pile up in memory.
+    """
+
+    def __init__(
+        self,
+        processor: TextProcessor,
+        workers: int = 0,
+        parallel_min_chars: int = 100_000,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            processor: Processor used inline and shipped to workers
+            workers: Worker processes (0 = one per CPU core)
+            parallel_min_chars: Documents at least this long use the pool
+        """
+        self.processor = processor
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min_chars = parallel_min_chars
+
+        # Documents in flight; two per worker keeps every core busy while
+        # the next result is being consumed
+        self.max_pending = self.workers * 2
+
+        # Created on first large document
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the worker pool, starting it on first use."""
+        if self._executor is None:
+            # spawn avoids forking a process that runs an event loop and
+            # client threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started ingestion pool with {self.workers} workers")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, size: int) -> T:
+        """
+        Run a CPU-bound function, in the pool if the input is large.
+
+        Args:
+            func: Picklable function (or bound method) to call
+            *args: Picklable arguments
+            size: Input size in characters, compared to ``parallel_min_chars``
+
+        Returns:
+            The function's result
+        """
+        if size < self.parallel_min_chars:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), partial(func, *args)
+            )
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; start a fresh one next time
+            logger.warning("Ingestion pool broke, processing inline")
+            self._executor = None
+            return func(*args)
+
+    def _submit(self, document: IngestDocument) -> "asyncio.Future[IngestedDocument]":
+        """Start processing a document and return its future."""
+        return asyncio.ensure_future(
+            self.run(ingest_document, self.processor, document, size=len(document.text))
+        )
+
+    async def iter_documents(
+        self, documents: Iterable[IngestDocument]
+    ) -> AsyncIterator[IngestedDocument]:
+        """
+        Process documents concurrently, yielding results in input order.
+
+        Args:
+            documents: Documents to process (may be a lazy iterator)
+
+        Yields:
+            One IngestedDocument per input document
+        """
+        iterator = iter(documents)
+        pending: Deque["asyncio.Future[IngestedDocument]"] = deque()
+
+        try:
+            for document in iterator:
+                pending.append(self._submit(document))
+                if len(pending) >= self.max_pending:
+                    break
+
+            while pending:
+                result = await pending.popleft()
+
+                # Refill the window only as results are consumed
+                document = next(iterator, None)
+                if document is not None:
+                    pending.append(self._submit(document))
+
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def iter_batches(
+        self, documents: Iterable[IngestDocument], batch_size: int
+    ) -> AsyncIterator[List[TextChunk]]:
+        """
+        Process documents into ready-to-embed chunk batches.
+
+        Args:
+            documents: Documents to process (may be a lazy iterator)
+            batch_size: Maximum chunks per batch
+
+        Yields:
+            Lists of at most ``batch_size`` chunks, in document order
+        """
+        batch: List[TextChunk] = []
+        async for result in self.iter_documents(documents):
+            for chunk in result.chunks:
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -7,9 +7,11 @@ for efficient embedding generation and storage.
 
 import logging
 import re
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from models import AcademicSource, ResearchFindings
 
@@ -18,7 +20,27 @@ from .config import RAGConfig
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Abbreviations whose trailing dot does not end a sentence
+_ABBREVIATIONS = (
+    "Dr",
+    "Mr",
+    "Mrs",
+    "Ms",
+    "Prof",
+    "Sr",
+    "Jr",
+    "Inc",
+    "Ltd",
+    "Corp",
+    "Co",
+    "i.e",
+    "e.g",
+    "vs",
+    "etc",
+)
+
+
+@dataclass(slots=True)
 class TextChunk:
     """Represents a processed text chunk ready for embedding."""
 
@@ -46,9 +68,17 @@ class TextProcessor:
         self.chunk_overlap = config.chunk_overlap
         self.min_chunk_size = config.min_chunk_size
 
-        # Compile regex patterns for efficiency
-        self._sentence_endings = re.compile(r"[.!?]+\s+")
+        # Compile regex patterns for efficiency. Sentence endings skip the
+        # dot of known abbreviations with one fixed-width lookbehind each,
+        # so the text never has to be rewritten before splitting. The
+        # leading lookahead keeps the lookbehinds off ordinary characters.
+        abbreviations = "".join(
+            rf"(?<!\b{re.escape(abbreviation)})" for abbreviation in _ABBREVIATIONS
+        )
+        self._sentence_endings = re.compile(r"(?=[.!?])" + abbreviations + r"[.!?]+\s+")
         self._whitespace = re.compile(r"\s+")
+        self._control_chars = re.compile(r"[\x00-\x08\x0e-\x1b]")
+        self._word = re.compile(r"\S+")
         self._url_pattern = re.compile(r"https?://\S+")
 
     def chunk_text(
@@ -64,73 +94,111 @@ class TextProcessor:
         Returns:
             List of TextChunk objects
         """
-        if not text or len(text.strip()) < self.min_chunk_size:
-            return []
+        chunks = list(self.iter_chunks(text, metadata))
 
-        # Clean and normalize text
-        text = self._normalize_text(text)
+        # The total is only known once the stream is exhausted
+        total = len(chunks)
+        for chunk in chunks:
+            chunk.metadata["total_chunks"] = total
 
-        # Split into sentences for better chunking
-        sentences = self._split_sentences(text)
+        return chunks
 
-        # Create chunks
-        chunks = self._create_chunks_from_sentences(sentences)
+    def iter_chunks(
+        self, text: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[TextChunk]:
+        """
+        Lazily split text into overlapping chunks.
 
-        # Create TextChunk objects
-        result = []
-        base_metadata = metadata or {}
+        Produces the same chunks as ``chunk_text`` without materializing the
+        sentence or chunk lists, so multi-megabyte documents can be fed to
+        the embedding batcher as they are chunked. Chunk metadata omits
+        ``total_chunks``, which is unknown until the stream ends.
 
-        for i, chunk_text in enumerate(chunks):
-            chunk_metadata = {
-                **base_metadata,
-                "chunk_index": i,
-                "total_chunks": len(chunks),
-                "chunk_size": len(chunk_text),
-                "processed_at": datetime.utcnow().isoformat(),
-            }
+        Args:
+            text: Text to chunk
+            metadata: Optional metadata to attach to chunks
+
+        Yields:
+            TextChunk objects in document order
+        """
+        if not text or len(text.strip()) < self.min_chunk_size:
+            return
 
-            result.append(
-                TextChunk(content=chunk_text, metadata=chunk_metadata, chunk_index=i)
+        # Built once per document and shared by every chunk
+        base_metadata = MappingProxyType(
+            {**(metadata or {}), "processed_at": datetime.utcnow().isoformat()}
+        )
+
+        # Sentences are split from the raw text and normalized one at a time,
+        # so no whole-document normalized copy is built
+        text = self._control_chars.sub("", text).strip()
+        sentences = self._iter_sentences(text)
+
+        for i, content in enumerate(self._iter_chunk_texts(sentences)):
+            yield TextChunk(
+                content=content,
+                metadata={
+                    **base_metadata,
+                    "chunk_index": i,
+                    "chunk_size": len(content),
+                },
+                chunk_index=i,
             )
 
-        return result
+    @staticmethod
+    def batch_chunks(
+        chunks: Iterable[TextChunk], batch_size: int
+    ) -> Iterator[List[TextChunk]]:
+        """
+        Group a chunk stream into embedding-sized batches.
+
+        Args:
+            chunks: Chunks, typically from ``iter_chunks``
+            batch_size: Maximum chunks per batch
+
+        Yields:
+            Lists of at most ``batch_size`` chunks
+        """
+        batch: List[TextChunk] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for consistent processing."""
-        # Replace multiple whitespaces with single space
-        text = self._whitespace.sub(" ", text)
+        # Remove control characters first so they cannot leave double spaces
+        text = self._control_chars.sub("", text)
 
-        # Remove control characters
-        text = "".join(char for char in text if ord(char) >= 32 or char == "\n")
+        # Replace all whitespace runs (including line breaks) with one space
+        text = self._whitespace.sub(" ", text)
 
-        # Normalize line breaks
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text.strip()
 
-        # Collapse multiple line breaks
-        text = re.sub(r"\n{3,}", "\n\n", text)
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        """Yield whitespace-normalized sentences one at a time."""
+        whitespace = self._whitespace
+        start = 0
+        for match in self._sentence_endings.finditer(text):
+            sentence = whitespace.sub(" ", text[start : match.start()]).strip()
+            if sentence:
+                yield sentence
+            start = match.end()
 
-        return text.strip()
+        sentence = whitespace.sub(" ", text[start:]).strip()
+        if sentence:
+            yield sentence
 
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
-        # Handle common abbreviations
-        text = re.sub(r"\b(Dr|Mr|Mrs|Ms|Prof|Sr|Jr)\.\s*", r"\1<DOT> ", text)
-        text = re.sub(r"\b(Inc|Ltd|Corp|Co)\.\s*", r"\1<DOT> ", text)
-        text = re.sub(r"\b(i\.e|e\.g|vs|etc)\.\s*", r"\1<DOT> ", text)
-
-        # Split by sentence endings
-        sentences = self._sentence_endings.split(text)
+        return list(self._iter_sentences(text))
 
-        # Restore dots
-        sentences = [s.replace("<DOT>", ".") for s in sentences]
-
-        # Filter empty sentences
-        return [s.strip() for s in sentences if s.strip()]
-
-    def _create_chunks_from_sentences(self, sentences: List[str]) -> List[str]:
-        """Create chunks from sentences with overlap."""
-        chunks = []
-        current_chunk = []
+    def _iter_chunk_texts(self, sentences: Iterable[str]) -> Iterator[str]:
+        """Yield chunk strings built from sentences with overlap."""
+        current_chunk: Deque[str] = deque()
         current_size = 0
 
         for sentence in sentences:
@@ -138,21 +206,21 @@ class TextProcessor:
 
             # If single sentence exceeds chunk size, split it
             if sentence_size > self.chunk_size:
-                # Save current chunk if exists
+                # Emit current chunk if exists
                 if current_chunk:
-                    chunks.append(" ".join(current_chunk))
-                    current_chunk = []
+                    yield " ".join(current_chunk)
+                    current_chunk.clear()
                     current_size = 0
 
-                # Split long sentence
-                words = sentence.split()
-                temp_chunk = []
+                # Split long sentence on word boundaries
+                temp_chunk: List[str] = []
                 temp_size = 0
 
-                for word in words:
+                for match in self._word.finditer(sentence):
+                    word = match.group()
                     word_size = len(word) + 1
                     if temp_size + word_size > self.chunk_size and temp_chunk:
-                        chunks.append(" ".join(temp_chunk))
+                        yield " ".join(temp_chunk)
                         temp_chunk = [word]
                         temp_size = word_size
                     else:
@@ -160,41 +228,37 @@ class TextProcessor:
                         temp_size += word_size
 
                 if temp_chunk:
-                    chunks.append(" ".join(temp_chunk))
+                    yield " ".join(temp_chunk)
                 continue
 
             # Check if adding sentence exceeds chunk size
             if current_size + sentence_size > self.chunk_size and current_chunk:
-                chunks.append(" ".join(current_chunk))
+                yield " ".join(current_chunk)
 
-                # Handle overlap
+                # Keep trailing sentences that fit in the overlap window
+                overlap = deque()
+                overlap_size = 0
                 if self.chunk_overlap > 0:
-                    # Calculate sentences to keep for overlap
-                    overlap_size = 0
-                    overlap_sentences = []
-
-                    for i in range(len(current_chunk) - 1, -1, -1):
-                        sent_len = len(current_chunk[i]) + 1
-                        if overlap_size + sent_len <= self.chunk_overlap:
-                            overlap_sentences.insert(0, current_chunk[i])
-                            overlap_size += sent_len
-                        else:
+                    for previous in reversed(current_chunk):
+                        sent_len = len(previous) + 1
+                        if overlap_size + sent_len > self.chunk_overlap:
                             break
+                        overlap.appendleft(previous)
+                        overlap_size += sent_len
 
-                    current_chunk = overlap_sentences
-                    current_size = overlap_size
-                else:
-                    current_chunk = []
-                    current_size = 0
+                current_chunk = overlap
+                current_size = overlap_size
 
             current_chunk.append(sentence)
             current_size += sentence_size
 
-        # Add final chunk
+        # Emit final chunk
         if current_chunk:
-            chunks.append(" ".join(current_chunk))
+            yield " ".join(current_chunk)
 
-        return chunks
+    def _create_chunks_from_sentences(self, sentences: List[str]) -> List[str]:
+        """Create chunks from sentences with overlap."""
+        return list(self._iter_chunk_texts(sentences))
 
     def process_research_findings(self, findings: ResearchFindings) -> List[TextChunk]:
         """
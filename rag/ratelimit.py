@@ -0,0 +1,260 @@
+"""
+Rate Governor for the OpenAI Embeddings API.
+
+Paces embedding requests against the account's requests-per-minute (RPM)
+and tokens-per-minute (TPM) limits with a pair of token buckets, so that
+parallel workflows share one budget instead of each discovering the limit
+through 429 responses.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Longest pause applied for a 429 that carries no Retry-After header
+MAX_THROTTLE_SECONDS = 60.0
+
+
+def is_rate_limit_error(error: Optional[BaseException]) -> bool:
+    """Check whether an API error is an HTTP 429 response."""
+    return getattr(error, "status_code", None) == 429
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the server's requested back-off from a 429 error.
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        Seconds to wait, or None if the response carried no usable header
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value) * scale
+        except (TypeError, ValueError):
+            continue
+        if seconds >= 0:
+            return seconds
+
+    return None
+
+
+class RateGovernor:
+    """
+    Shared RPM/TPM token buckets for one model.
+
+    Each request reserves one request slot and its estimated tokens before
+    it is sent, then settles the estimate against the usage the API reports.
+    Requests that fail for any other reason than a 429 release their tokens,
+    since nothing was billed.
+    Reservations may overdraw the buckets; the caller then sleeps for exactly
+    as long as the refill needs, so queued requests are released at the
+    sustained rate instead of in bursts.
+
+    A 429 pauses every caller for the server's Retry-After (or an
+    exponential fallback), drains the buckets so traffic resumes at the
+    steady rate, and trims the effective rate slightly. The rate recovers
+    gradually on success, which keeps throughput just under the account
+    limit rather than oscillating around it.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize with full buckets."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+
+        # Reservations come from the event loop and worker threads alike
+        self._lock = threading.Lock()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._rate_scale = 1.0
+        self._consecutive_throttles = 0
+
+        self.throttled_count = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Top up both buckets for the time elapsed since the last update."""
+        # Nothing refills while paused, so a 429 is not followed by a burst
+        start = max(self._updated, self._paused_until)
+        elapsed = now - start
+        self._updated = max(self._updated, now)
+        if elapsed <= 0:
+            return
+
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self._request_rate,
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self._token_rate,
+        )
+
+    @property
+    def _request_rate(self) -> float:
+        """Effective requests per second."""
+        return self.requests_per_minute * self._rate_scale / 60
+
+    @property
+    def _token_rate(self) -> float:
+        """Effective tokens per second."""
+        return self.tokens_per_minute * self._rate_scale / 60
+
+    def _reservable(self, tokens: int) -> int:
+        """Cap a reservation so an oversized request can still be sent."""
+        return min(max(tokens, 0), self.tokens_per_minute)
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserve capacity for one request.
+
+        Args:
+            tokens: Estimated input tokens of the request
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+
+            self._requests -= 1
+            self._tokens -= self._reservable(tokens)
+
+            deficit = max(
+                -self._requests / self._request_rate,
+                -self._tokens / self._token_rate,
+                0.0,
+            )
+            pause = max(self._paused_until - now, 0.0)
+            return pause + deficit
+
+    def _pause_remaining(self) -> float:
+        """Seconds left in the current 429 pause."""
+        with self._lock:
+            return max(self._paused_until - self._clock(), 0.0)
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until a request of ``tokens`` estimated tokens may be sent.
+
+        Args:
+            tokens: Estimated input tokens of the request
+        """
+        delay = self.reserve(tokens)
+        while delay > 0:
+            self.wait_seconds += delay
+            await asyncio.sleep(delay)
+            # A 429 may have paused everyone while we slept
+            delay = self._pause_remaining()
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct a reservation with the usage reported by the API.
+
+        Args:
+            estimated_tokens: Tokens passed to ``acquire``
+            actual_tokens: Tokens the API billed for the request
+        """
+        with self._lock:
+            self._tokens += self._reservable(estimated_tokens) - actual_tokens
+
+            # Recover the rate trimmed by earlier 429s a little per success
+            self._consecutive_throttles = 0
+            self._rate_scale = min(1.0, self._rate_scale + 0.01)
+
+    def release(self, estimated_tokens: int) -> None:
+        """
+        Return the tokens of a reservation that was not billed.
+
+        Called when a request fails or is cancelled, e.g. on a timeout or
+        a 5xx response. The request slot stays spent.
+
+        Args:
+            estimated_tokens: Tokens passed to ``acquire``
+        """
+        with self._lock:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + self._reservable(estimated_tokens),
+            )
+
+    def throttle(self, retry_after: Optional[float] = None) -> float:
+        """
+        Pause all callers after a 429 response.
+
+        Args:
+            retry_after: Server-requested back-off in seconds, if any
+
+        Returns:
+            Length of the pause in seconds
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+
+            self._consecutive_throttles += 1
+            self.throttled_count += 1
+            if retry_after is None:
+                retry_after = min(
+                    MAX_THROTTLE_SECONDS, 2.0 ** (self._consecutive_throttles - 1)
+                )
+
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, 0.0)
+            self._rate_scale = max(0.1, self._rate_scale * 0.9)
+
+        logger.warning(
+            f"Embedding API rate limited; pausing requests for {retry_after:.1f}s"
+        )
+        return retry_after
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get governor statistics."""
+        with self._lock:
+            return {
+                "throttled_requests": self.throttled_count,
+                "rate_limit_wait_seconds": round(self.wait_seconds, 3),
+                "effective_rate_scale": round(self._rate_scale, 3),
+            }
+
+
+# Shared governors, one per embedding model
+_rate_governors: Dict[str, RateGovernor] = {}
+_rate_governors_lock = threading.Lock()
+
+
+def get_rate_governor(
+    model: str, requests_per_minute: int, tokens_per_minute: int
+) -> RateGovernor:
+    """Get or create the process-wide rate governor for ``model``."""
+    with _rate_governors_lock:
+        governor = _rate_governors.get(model)
+        if governor is None:
+            governor = RateGovernor(requests_per_minute, tokens_per_minute)
+            _rate_governors[model] = governor
+        return governor
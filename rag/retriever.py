@@ -6,20 +6,35 @@ managing cache lookups, semantic search, and storage of new research.
 """
 
 import asyncio
+import contextlib
 import json
 import logging
-from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Tuple
+
+import asyncpg
 
 from models import AcademicSource, ResearchFindings
 
 from .config import get_rag_config
+from .dedup import (
+    DeduplicationPlan,
+    open_near_duplicate_index,
+    plan_stored_duplicates,
+)
 from .embeddings import EmbeddingGenerator
+from .findings_cache import FindingsCache, normalize_keyword
+from .findings_snapshot import decode_findings, encode_findings
+from .ingest import IngestionPipeline
 from .processor import TextProcessor
+from .singleflight import SingleFlight
 from .storage import VectorStorage
 
 logger = logging.getLogger(__name__)
 
+# Lookups in flight across all retrievers in this process, by normalized keyword
+_inflight_research: SingleFlight[ResearchFindings] = SingleFlight()
+
 
 class RetrievalStatistics:
     """Track retrieval performance and usage statistics."""
@@ -39,6 +54,12 @@ class RetrievalStatistics:
         # Track errors
         self.errors = 0
 
+        # Track stale-while-revalidate serving
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.skipped_refreshes = 0
+
     def record_exact_hit(self, response_time: float):
         """Record an exact cache hit."""
         # Update statistics for exact match
@@ -60,6 +81,21 @@ class RetrievalStatistics:
         self.total_requests += 1
         self.api_response_times.append(response_time)
 
+    def record_stale_hit(self):
+        """Record an exact hit served from an expired entry."""
+        self.stale_hits += 1
+
+    def record_refresh(self, succeeded: bool):
+        """Record a finished background refresh."""
+        if succeeded:
+            self.refreshes += 1
+        else:
+            self.failed_refreshes += 1
+
+    def record_skipped_refresh(self):
+        """Record a stale hit that could not start a refresh."""
+        self.skipped_refreshes += 1
+
     def record_error(self):
         """Record an error during retrieval."""
         # Increment error counter
@@ -101,6 +137,10 @@ class RetrievalStatistics:
             "semantic_hits": self.semantic_hits,
             "cache_misses": self.cache_misses,
             "errors": self.errors,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "skipped_refreshes": self.skipped_refreshes,
             "cache_hit_rate": f"{self.cache_hit_rate:.1f}%",
             "avg_cache_response_ms": f"{self.average_cache_response_time * 1000:.1f}",
             "avg_api_response_ms": f"{self.average_api_response_time * 1000:.1f}",
@@ -112,10 +152,11 @@ class ResearchRetriever:
     Orchestrates the RAG system for intelligent research caching.
 
     This class manages the entire retrieval pipeline:
-    1. Check exact cache for keyword match
-    2. Perform semantic search if no exact match
-    3. Call research function if cache miss
-    4. Store new research for future use
+    1. Serve findings returned recently by this process from memory
+    2. Check exact cache for keyword match
+    3. Perform semantic search if no exact match
+    4. Call research function if cache miss
+    5. Store new research for future use
     """
 
     # Class-level instance tracking for statistics
@@ -131,6 +172,26 @@ class ResearchRetriever:
         self.embeddings = EmbeddingGenerator()
         self.storage = VectorStorage()
 
+        # Large findings are chunked in worker processes off the event loop
+        self.ingestion = IngestionPipeline(
+            self.processor,
+            workers=self.config.ingest_workers,
+            parallel_min_chars=self.config.ingest_parallel_min_chars,
+        )
+
+        # Near-duplicate chunks reuse stored chunks instead of being re-embedded
+        self.near_duplicates = open_near_duplicate_index(self.config)
+
+        # Recently returned findings, served without a database round trip
+        self.findings_cache = FindingsCache(
+            max_entries=self.config.findings_cache_size,
+            ttl_seconds=self.config.findings_cache_ttl_seconds,
+        )
+
+        # Expired entries served while they are re-researched in the background
+        self._stale_grace = timedelta(hours=self.config.cache_stale_grace_hours)
+        self._refreshes: Dict[str, asyncio.Task] = {}
+
         # Initialize statistics tracking
         self.stats = RetrievalStatistics()
 
@@ -163,6 +224,36 @@ class ResearchRetriever:
         """
         Main retrieval method with intelligent caching.
 
+        Findings returned within the last FINDINGS_CACHE_TTL_SECONDS are
+        served from memory; callers must not modify them.
+
+        Args:
+            keyword: Search keyword/topic
+            research_function: Async function to call if cache miss
+
+        Returns:
+            ResearchFindings from cache or fresh research
+        """
+        findings = self.findings_cache.get(keyword)
+        if findings is not None:
+            logger.info(f"In-process cache hit for keyword: {keyword}")
+            return findings
+
+        # Concurrent requests for the same keyword share one lookup, so
+        # simultaneous misses pay for a single research call
+        findings = await _inflight_research.run(
+            normalize_keyword(keyword),
+            lambda: self._retrieve_or_research(keyword, research_function),
+        )
+        self.findings_cache.put(keyword, findings)
+        return findings
+
+    async def _retrieve_or_research(
+        self, keyword: str, research_function: Callable[[], Any]
+    ) -> ResearchFindings:
+        """
+        Look up findings in the database cache, researching on a miss.
+
         Args:
             keyword: Search keyword/topic
             research_function: Async function to call if cache miss
@@ -175,11 +266,21 @@ class ResearchRetriever:
 
         # Track start time for performance metrics
         start_time = datetime.now(timezone.utc)
+        semantic_task: Optional[asyncio.Task] = None
 
         try:
             # Step 1: Check exact cache
             logger.info(f"Checking cache for keyword: {keyword}")
-            cached_response = await self._check_exact_cache(keyword)
+            if self.config.speculative_cache_lookup:
+                # Embed the keyword and search semantically while the exact
+                # lookup runs; the semantic match is only served on a miss
+                exact_task = asyncio.create_task(self._check_exact_cache(keyword))
+                semantic_task = asyncio.create_task(
+                    self._semantic_search(keyword, exact_lookup=exact_task)
+                )
+                cached_response = await exact_task
+            else:
+                cached_response = await self._check_exact_cache(keyword)
 
             if cached_response:
                 # Calculate response time
@@ -188,12 +289,17 @@ class ResearchRetriever:
                 ).total_seconds()
                 self.stats.record_exact_hit(response_time)
 
+                if cached_response.get("stale"):
+                    # Serve the expired entry now, re-research it meanwhile
+                    self.stats.record_stale_hit()
+                    self._schedule_refresh(keyword, research_function)
+
                 logger.info(f"Exact cache hit for keyword: {keyword}")
                 return self._reconstruct_findings_from_cache(cached_response)
 
             # Step 2: Perform semantic search
             logger.info(f"No exact match, trying semantic search for: {keyword}")
-            semantic_results = await self._semantic_search(keyword)
+            semantic_results = await (semantic_task or self._semantic_search(keyword))
 
             if semantic_results:
                 # Calculate response time
@@ -205,24 +311,40 @@ class ResearchRetriever:
                 logger.info(f"Semantic cache hit for keyword: {keyword}")
                 return semantic_results
 
-            # Step 3: Cache miss - call research function
-            logger.info(f"Cache miss, calling research function for: {keyword}")
+            # Step 3: Cache miss - call research function, holding the
+            # keyword's cross-process lock until the research is stored
+            async with self._research_lock(keyword) as locked:
+                if locked:
+                    # Another worker may have stored it while we waited
+                    cached_response = await self._check_exact_cache(keyword)
+                    if cached_response and not cached_response.get("stale"):
+                        response_time = (
+                            datetime.now(timezone.utc) - start_time
+                        ).total_seconds()
+                        self.stats.record_exact_hit(response_time)
 
-            # Call the research function
-            research_result = await research_function()
+                        logger.info(f"Research stored by another worker: {keyword}")
+                        return self._reconstruct_findings_from_cache(cached_response)
 
-            # Convert to ResearchFindings if needed
-            if isinstance(research_result, dict):
-                findings = self._dict_to_findings(research_result, keyword)
-            else:
-                findings = research_result
+                logger.info(f"Cache miss, calling research function for: {keyword}")
 
-            # Calculate response time
-            response_time = (datetime.now(timezone.utc) - start_time).total_seconds()
-            self.stats.record_cache_miss(response_time)
+                # Call the research function
+                research_result = await research_function()
 
-            # Step 4: Store new research
-            await self._store_research(findings)
+                # Convert to ResearchFindings if needed
+                if isinstance(research_result, dict):
+                    findings = self._dict_to_findings(research_result, keyword)
+                else:
+                    findings = research_result
+
+                # Calculate response time
+                response_time = (
+                    datetime.now(timezone.utc) - start_time
+                ).total_seconds()
+                self.stats.record_cache_miss(response_time)
+
+                # Step 4: Store new research
+                await self._store_research(findings)
 
             logger.info(f"Stored new research for keyword: {keyword}")
             return findings
@@ -232,6 +354,89 @@ class ResearchRetriever:
             self.stats.record_error()
             logger.error(f"Error in retrieve_or_research: {e}")
             raise
+        finally:
+            # Stop a speculative semantic search that is no longer needed
+            if semantic_task is not None:
+                semantic_task.cancel()
+
+    def _research_lock(self, keyword: str) -> AsyncContextManager[bool]:
+        """Cross-process research lock for a keyword, if enabled."""
+        if not self.config.research_lock_enabled:
+            return contextlib.nullcontext(False)
+        return self.storage.research_lock(
+            keyword, timeout=self.config.research_lock_timeout_seconds
+        )
+
+    def _schedule_refresh(
+        self, keyword: str, research_function: Callable[[], Any]
+    ) -> bool:
+        """
+        Start re-researching a stale keyword in the background.
+
+        A keyword is refreshed once at a time, and at most
+        CACHE_MAX_BACKGROUND_REFRESHES refreshes run at once. Stale hits
+        beyond that are served without a refresh; a later hit retries.
+
+        Args:
+            keyword: Keyword whose cache entry has expired
+            research_function: Async function producing fresh research
+
+        Returns:
+            True if a refresh was started
+        """
+        key = normalize_keyword(keyword)
+        if key in self._refreshes:
+            return False
+
+        if len(self._refreshes) >= self.config.cache_max_background_refreshes:
+            self.stats.record_skipped_refresh()
+            logger.info(f"Refresh limit reached, serving stale research: {keyword}")
+            return False
+
+        task = asyncio.create_task(self._refresh(keyword, research_function))
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+        return True
+
+    async def _refresh(
+        self, keyword: str, research_function: Callable[[], Any]
+    ) -> None:
+        """
+        Re-research a stale keyword and replace its cache entry.
+
+        The new chunks are stored first, then the cache entry and its
+        findings snapshot are replaced by one upsert, so lookups see either
+        the old or the new research. The refresh only counts as done once
+        that upsert succeeded; until then the stale entry is served.
+
+        Args:
+            keyword: Keyword whose cache entry has expired
+            research_function: Async function producing fresh research
+        """
+        try:
+            async with self._research_lock(keyword) as locked:
+                # Another worker may have refreshed it while we waited
+                if locked and await self.storage.get_cached_response(
+                    keyword, record_hit=False
+                ):
+                    return
+
+                research_result = await research_function()
+                if isinstance(research_result, dict):
+                    findings = self._dict_to_findings(research_result, keyword)
+                else:
+                    findings = research_result
+
+                await self._write_research(findings)
+
+            self.findings_cache.put(keyword, findings)
+            self.stats.record_refresh(succeeded=True)
+            logger.info(f"Refreshed stale research for keyword: {keyword}")
+
+        except Exception as e:
+            # The stale entry keeps being served until its grace period ends
+            self.stats.record_refresh(succeeded=False)
+            logger.warning(f"Background refresh failed for '{keyword}': {e}")
 
     async def _check_exact_cache(self, keyword: str) -> Optional[Dict[str, Any]]:
         """
@@ -244,8 +449,10 @@ class ResearchRetriever:
             Cached response or None
         """
         try:
-            # Use storage to check cache
-            cached = await self.storage.get_cached_response(keyword)
+            # Use storage to check cache, including recently expired entries
+            cached = await self.storage.get_cached_response(
+                keyword, max_stale=self._stale_grace
+            )
 
             if cached:
                 logger.debug(f"Found exact cache entry for: {keyword}")
@@ -257,12 +464,16 @@ class ResearchRetriever:
             logger.warning(f"Error checking exact cache: {e}")
             return None
 
-    async def _semantic_search(self, keyword: str) -> Optional[ResearchFindings]:
+    async def _semantic_search(
+        self, keyword: str, exact_lookup: Optional[asyncio.Task] = None
+    ) -> Optional[ResearchFindings]:
         """
         Perform semantic similarity search.
 
         Args:
             keyword: Search keyword
+            exact_lookup: Exact cache lookup running at the same time; a
+                match is only counted as a hit once it has missed
 
         Returns:
             ResearchFindings from similar content or None
@@ -271,65 +482,187 @@ class ResearchRetriever:
             # Generate embedding for the keyword
             keyword_embedding = await self.embeddings.generate_embedding(keyword)
 
-            # Search for similar chunks
-            similar_chunks = await self.storage.search_similar_chunks(
-                query_embedding=keyword_embedding.embedding,
-                limit=50,  # Get more chunks to reconstruct full findings
-                similarity_threshold=self.config.cache_similarity_threshold,
-            )
+            # One lookup over the cached topics (one embedding per entry)
+            try:
+                cached = await self.storage.get_similar_cached_response(
+                    keyword_embedding.embedding,
+                    similarity_threshold=self.config.cache_similarity_threshold,
+                    record_hit=exact_lookup is None,
+                )
+            except asyncpg.UndefinedTableError:
+                logger.warning(
+                    "cache_topics table missing (run sql/cache_topics.sql); "
+                    "falling back to chunk search"
+                )
+                return await self._semantic_search_chunks(
+                    keyword, keyword_embedding.embedding
+                )
 
-            if not similar_chunks:
+            if cached is None:
+                logger.info(f"No cached topic similar enough to: {keyword}")
                 return None
 
-            # Group chunks by keyword to find the best match
-            keyword_chunks = {}
-            for chunk_data, similarity in similar_chunks:
-                chunk_keyword = chunk_data.get("keyword", "")
-                if chunk_keyword not in keyword_chunks:
-                    keyword_chunks[chunk_keyword] = []
-                keyword_chunks[chunk_keyword].append((chunk_data, similarity))
-
-            # Find the keyword with highest average similarity
-            best_keyword = None
-            best_avg_similarity = 0
-
-            for kw, chunks in keyword_chunks.items():
-                avg_similarity = sum(sim for _, sim in chunks) / len(chunks)
-                if avg_similarity > best_avg_similarity:
-                    best_avg_similarity = avg_similarity
-                    best_keyword = kw
-
-            # Check if best match meets threshold
-            if best_avg_similarity < self.config.cache_similarity_threshold:
-                logger.info(
-                    f"Best semantic match ({best_avg_similarity:.2f}) below threshold"
-                )
-                return None
+            if exact_lookup is not None:
+                if await exact_lookup:
+                    return None
+                self.storage.record_cache_hit(cached["id"])
 
-            # Reconstruct findings from the best matching keyword's chunks
-            logger.info(
-                f"Found semantic match with keyword '{best_keyword}' (similarity: {best_avg_similarity:.2f})"
-            )
-            return self._reconstruct_findings_from_chunks(
-                keyword_chunks[best_keyword], original_keyword=keyword
-            )
+            return self._reconstruct_findings_from_cache(cached, keyword=keyword)
 
         except Exception as e:
             logger.error(f"Error in semantic search: {e}")
             return None
 
+    async def _semantic_search_chunks(
+        self, keyword: str, keyword_embedding: List[float]
+    ) -> Optional[ResearchFindings]:
+        """
+        Find similar cached research by searching chunks directly.
+
+        Used when the cache_topics table does not exist yet.
+
+        Args:
+            keyword: Search keyword
+            keyword_embedding: Embedding of the keyword
+
+        Returns:
+            ResearchFindings from similar content or None
+        """
+        similar_chunks = await self.storage.search_similar_chunks(
+            query_embedding=keyword_embedding,
+            limit=50,  # Get more chunks to reconstruct full findings
+            similarity_threshold=self.config.cache_similarity_threshold,
+        )
+        return self._match_similar_chunks(keyword, similar_chunks)
+
+    async def _semantic_search_many(
+        self, keywords: List[str]
+    ) -> List[Optional[ResearchFindings]]:
+        """
+        Perform semantic similarity search for several keywords at once.
+
+        The keywords are embedded in one batch and matched against the
+        cached topics in a single query instead of one embedding request
+        and query per keyword.
+
+        Args:
+            keywords: Search keywords
+
+        Returns:
+            ResearchFindings or None for each keyword, in input order
+        """
+        if not keywords:
+            return []
+
+        try:
+            keyword_embeddings = await self.embeddings.generate_embeddings(keywords)
+            vectors = [result.embedding for result in keyword_embeddings]
+
+            try:
+                cached = await self.storage.get_similar_cached_responses(
+                    vectors,
+                    similarity_threshold=self.config.cache_similarity_threshold,
+                )
+            except asyncpg.UndefinedTableError:
+                logger.warning(
+                    "cache_topics table missing (run sql/cache_topics.sql); "
+                    "falling back to chunk search"
+                )
+                similar_chunks = await self.storage.bulk_search(
+                    vectors,
+                    limit_per_query=50,
+                    similarity_threshold=self.config.cache_similarity_threshold,
+                )
+                return [
+                    self._match_similar_chunks(keyword, chunks)
+                    for keyword, chunks in zip(keywords, similar_chunks)
+                ]
+
+            return [
+                (
+                    self._reconstruct_findings_from_cache(entry, keyword=keyword)
+                    if entry
+                    else None
+                )
+                for keyword, entry in zip(keywords, cached)
+            ]
+
+        except Exception as e:
+            logger.error(f"Error in bulk semantic search: {e}")
+            return [None] * len(keywords)
+
+    def _match_similar_chunks(
+        self, keyword: str, similar_chunks: List[Tuple[Dict[str, Any], float]]
+    ) -> Optional[ResearchFindings]:
+        """
+        Pick the best matching cached keyword from similarity search results.
+
+        Args:
+            keyword: Search keyword
+            similar_chunks: (chunk_data, similarity) results for the keyword
+
+        Returns:
+            ResearchFindings from the best matching keyword's chunks or None
+        """
+        if not similar_chunks:
+            return None
+
+        # Group chunks by keyword to find the best match
+        keyword_chunks = {}
+        for chunk_data, similarity in similar_chunks:
+            chunk_keyword = chunk_data.get("keyword", "")
+            if chunk_keyword not in keyword_chunks:
+                keyword_chunks[chunk_keyword] = []
+            keyword_chunks[chunk_keyword].append((chunk_data, similarity))
+
+        # Find the keyword with highest average similarity
+        best_keyword = None
+        best_avg_similarity = 0
+
+        for kw, chunks in keyword_chunks.items():
+            avg_similarity = sum(sim for _, sim in chunks) / len(chunks)
+            if avg_similarity > best_avg_similarity:
+                best_avg_similarity = avg_similarity
+                best_keyword = kw
+
+        # Check if best match meets threshold
+        if best_avg_similarity < self.config.cache_similarity_threshold:
+            logger.info(
+                f"Best semantic match ({best_avg_similarity:.2f}) below threshold"
+            )
+            return None
+
+        # Reconstruct findings from the best matching keyword's chunks
+        logger.info(
+            f"Found semantic match with keyword '{best_keyword}' (similarity: {best_avg_similarity:.2f})"
+        )
+        return self._reconstruct_findings_from_chunks(
+            keyword_chunks[best_keyword], original_keyword=keyword
+        )
+
     def _reconstruct_findings_from_cache(
-        self, cache_entry: Dict[str, Any]
+        self, cache_entry: Dict[str, Any], keyword: Optional[str] = None
     ) -> ResearchFindings:
         """
         Reconstruct ResearchFindings from cache entry.
 
         Args:
             cache_entry: Cache entry from database
+            keyword: Keyword to report, if the entry was found for a
+                different (similar) keyword
 
         Returns:
             Reconstructed ResearchFindings
         """
+        # Fast path: the entry's own snapshot of the complete findings
+        snapshot = cache_entry.get("findings_snapshot")
+        if snapshot:
+            findings = decode_findings(snapshot)
+            if findings is not None:
+                if keyword:
+                    findings = findings.model_copy(update={"keyword": keyword})
+                return findings
+
         # Extract metadata
         metadata = cache_entry.get("metadata", {})
 
@@ -357,7 +690,7 @@ class ResearchRetriever:
 
         # Create ResearchFindings
         findings = ResearchFindings(
-            keyword=cache_entry.get("keyword", ""),
+            keyword=keyword or cache_entry.get("keyword", ""),
             research_summary=cache_entry.get("research_summary", ""),
             academic_sources=academic_sources,
             key_statistics=metadata.get("key_statistics", []),
@@ -554,6 +887,42 @@ class ResearchRetriever:
 
         return score
 
+    @staticmethod
+    def _findings_size(findings: ResearchFindings) -> int:
+        """Approximate number of characters chunked for a findings object."""
+        size = len(findings.research_summary)
+        size += sum(len(s.title) + len(s.excerpt) for s in findings.academic_sources)
+        size += sum(len(finding) for finding in findings.main_findings)
+        size += sum(len(statistic) for statistic in findings.key_statistics)
+        return size
+
+    async def _plan_near_duplicates(
+        self, chunks: List[Any]
+    ) -> Optional[DeduplicationPlan]:
+        """Match chunks against the near-duplicate index, if enabled."""
+        if self.near_duplicates is None:
+            return None
+
+        try:
+            return await plan_stored_duplicates(
+                self.near_duplicates,
+                "research_chunks",
+                [chunk.content for chunk in chunks],
+                self.storage.existing_chunk_ids,
+            )
+        except Exception as e:
+            logger.warning(f"Near-duplicate lookup failed: {e}")
+            return None
+
+    def _record_near_duplicates(
+        self, plan: DeduplicationPlan, chunk_ids: List[str], keyword: str
+    ) -> None:
+        """Add newly stored chunks to the near-duplicate index."""
+        try:
+            self.near_duplicates.add("research_chunks", plan, chunk_ids, keyword)
+        except Exception as e:
+            logger.warning(f"Near-duplicate index update failed: {e}")
+
     async def _store_research(self, findings: ResearchFindings) -> None:
         """
         Store research findings in the cache.
@@ -562,45 +931,88 @@ class ResearchRetriever:
             findings: Research findings to store
         """
         try:
-            # Process findings into chunks
-            chunks = self.processor.process_research_findings(findings)
+            await self._write_research(findings)
+        except Exception as e:
+            logger.error(f"Error storing research: {e}")
+            # Don't raise - allow retrieval to continue even if storage fails
+
+    async def _write_research(self, findings: ResearchFindings) -> None:
+        """
+        Store research findings in the cache, raising if that fails.
+
+        Args:
+            findings: Research findings to store
+
+        Raises:
+            ValueError: If the findings produce no chunks
+        """
+        # Process findings into chunks
+        chunks = await self.ingestion.run(
+            self.processor.process_research_findings,
+            findings,
+            size=self._findings_size(findings),
+        )
+
+        if not chunks:
+            raise ValueError("No chunks generated from research findings")
 
-            if not chunks:
-                logger.warning("No chunks generated from research findings")
-                return
+        # Skip chunks that repeat already stored content
+        plan = await self._plan_near_duplicates(chunks)
+        new_chunks = [chunks[i] for i in plan.new_positions] if plan else list(chunks)
 
-            # Generate embeddings for all chunks
-            chunk_texts = [chunk.content for chunk in chunks]
+        chunk_ids: List[str] = []
+        if new_chunks:
+            # Generate embeddings for new chunks
+            chunk_texts = [chunk.content for chunk in new_chunks]
             embeddings = await self.embeddings.generate_embeddings(chunk_texts)
 
             # Store chunks with embeddings
             chunk_ids = await self.storage.store_research_chunks(
-                chunks=chunks, embeddings=embeddings, keyword=findings.keyword
+                chunks=new_chunks, embeddings=embeddings, keyword=findings.keyword
             )
 
-            # Prepare metadata for cache entry
-            metadata = {
-                "key_statistics": findings.key_statistics,
-                "research_gaps": findings.research_gaps,
-                "main_findings": findings.main_findings,
-                "total_sources_analyzed": findings.total_sources_analyzed,
-                "search_query_used": findings.search_query_used,
-                "timestamp": findings.research_timestamp.isoformat(),
-            }
-
-            # Store cache entry
-            await self.storage.store_cache_entry(
-                keyword=findings.keyword,
-                research_summary=findings.research_summary,
-                chunk_ids=chunk_ids,
-                metadata=metadata,
-            )
+        if plan:
+            self._record_near_duplicates(plan, chunk_ids, findings.keyword)
+            chunk_ids = list(dict.fromkeys(plan.resolve_ids(chunk_ids)))
+
+        # Prepare metadata for cache entry
+        metadata = {
+            "key_statistics": findings.key_statistics,
+            "research_gaps": findings.research_gaps,
+            "main_findings": findings.main_findings,
+            "total_sources_analyzed": findings.total_sources_analyzed,
+            "search_query_used": findings.search_query_used,
+            "timestamp": findings.research_timestamp.isoformat(),
+        }
+
+        # Store cache entry together with the snapshot exact hits use
+        await self.storage.store_cache_entry(
+            keyword=findings.keyword,
+            research_summary=findings.research_summary,
+            chunk_ids=chunk_ids,
+            metadata=metadata,
+            findings_snapshot=encode_findings(findings),
+        )
+
+        await self._store_topic(findings.keyword)
 
-            logger.info(f"Successfully stored research with {len(chunks)} chunks")
+        logger.info(f"Successfully stored research with {len(chunks)} chunks")
 
+    async def _store_topic(self, keyword: str) -> None:
+        """
+        Store the topic embedding used to find a cache entry semantically.
+
+        Args:
+            keyword: Keyword of the stored cache entry
+        """
+        try:
+            # Usually served from the embedding cache: the semantic search
+            # before the research embedded the same keyword
+            keyword_embedding = await self.embeddings.generate_embedding(keyword)
+            await self.storage.store_cache_topic(keyword, keyword_embedding.embedding)
         except Exception as e:
-            logger.error(f"Error storing research: {e}")
-            # Don't raise - allow retrieval to continue even if storage fails
+            # The entry is still found by exact match
+            logger.warning(f"Failed to store cache topic for '{keyword}': {e}")
 
     async def warm_cache(
         self, keywords: List[str], research_function: Callable
@@ -617,15 +1029,33 @@ class ResearchRetriever:
         """
         results = {"successful": 0, "failed": 0, "already_cached": 0, "keywords": {}}
 
+        # Check exact cache entries first
+        uncached = []
         for keyword in keywords:
             try:
-                # Check if already cached
                 cached = await self._check_exact_cache(keyword)
                 if cached:
                     results["already_cached"] += 1
                     results["keywords"][keyword] = "already_cached"
-                    continue
+                else:
+                    uncached.append(keyword)
 
+            except Exception as e:
+                logger.error(f"Failed to warm cache for '{keyword}': {e}")
+                results["failed"] += 1
+                results["keywords"][keyword] = f"error: {str(e)}"
+
+        # Keywords already covered by similar research need no new research;
+        # look them all up with one bulk search
+        semantic_matches = await self._semantic_search_many(uncached)
+
+        for keyword, match in zip(uncached, semantic_matches):
+            if match:
+                results["already_cached"] += 1
+                results["keywords"][keyword] = "already_cached"
+                continue
+
+            try:
                 # Generate and store research
                 findings = await self.retrieve_or_research(keyword, research_function)
                 results["successful"] += 1
@@ -646,6 +1076,7 @@ class ResearchRetriever:
         # Combine retriever stats with component stats
         stats = {
             "retriever": self.stats.get_summary(),
+            "findings_cache": self.findings_cache.get_statistics(),
             "embeddings": self.embeddings.get_statistics(),
             "storage": {},  # Storage stats would go here
         }
@@ -671,6 +1102,8 @@ class ResearchRetriever:
             "semantic_hits": 0,
             "cache_misses": 0,
             "errors": 0,
+            "in_process_hits": 0,
+            "coalesced_requests": _inflight_research.coalesced_count,
             "avg_retrieval_time": 0.0,
             "hit_rate": 0.0,
         }
@@ -685,6 +1118,7 @@ class ResearchRetriever:
             combined_stats["semantic_hits"] += stats.semantic_hits
             combined_stats["cache_misses"] += stats.cache_misses
             combined_stats["errors"] += stats.errors
+            combined_stats["in_process_hits"] += instance.findings_cache.hits
 
             # Collect all response times
             total_response_times.extend(stats.cache_response_times)
@@ -704,8 +1138,33 @@ class ResearchRetriever:
 
         return combined_stats
 
+    @classmethod
+    def invalidate_findings_caches(cls, keyword: Optional[str] = None) -> int:
+        """
+        Drop findings from the in-process cache of every retriever instance.
+
+        Call after cache entries are deleted so they are not served from
+        memory any longer.
+
+        Args:
+            keyword: Keyword to drop (None drops everything)
+
+        Returns:
+            Number of entries removed
+        """
+        return sum(
+            instance.findings_cache.invalidate(keyword) for instance in cls._instances
+        )
+
     async def cleanup(self) -> None:
         """Clean up resources."""
+        # Let background refreshes finish storing their research
+        if self._refreshes:
+            await asyncio.gather(*self._refreshes.values(), return_exceptions=True)
+
         # Close storage connections
         await self.storage.close()
+
+        # Stop ingestion workers
+        self.ingestion.close()
         logger.info("ResearchRetriever cleanup completed")
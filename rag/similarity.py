@@ -0,0 +1,182 @@
+"""
+Vectorized Similarity Search for RAG System.
+
+Provides an in-process cosine similarity index over pre-normalized float32
+candidate matrices. A query is scored against every candidate with a single
+matrix-vector product (or matrix-matrix product for query batches), and the
+top results are selected with ``argpartition`` instead of a full sort.
+"""
+
+import logging
+from typing import Generic, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+VectorLike = Union[np.ndarray, Sequence[float]]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row of a matrix in float32.
+
+    Zero rows stay zero so they score 0.0 against every query, matching
+    the behavior of ``EmbeddingGenerator.calculate_similarity``.
+
+    Args:
+        matrix: 2-D array of vectors
+
+    Returns:
+        Contiguous float32 matrix with unit-length (or zero) rows
+    """
+    matrix = np.array(matrix, dtype=np.float32, ndmin=2, copy=True, order="C")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Return indices of the ``top_k`` highest scores in descending order.
+
+    Uses ``argpartition`` so only the selected entries are sorted.
+
+    Args:
+        scores: 1-D array of scores
+        top_k: Number of indices to return
+
+    Returns:
+        Array of indices into ``scores``
+    """
+    count = scores.shape[0]
+    top_k = min(top_k, count)
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if top_k < count:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(count)
+
+    # Stable sort keeps insertion order for equal scores
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order]
+
+
+class SimilarityIndex(Generic[T]):
+    """
+    In-memory cosine similarity index over a fixed set of candidates.
+
+    Candidates are normalized once at build time, so each search is a
+    single BLAS call plus a partial sort. Use it for in-process re-ranking
+    of embeddings already held in memory.
+    """
+
+    def __init__(self, identifiers: Sequence[T], vectors: np.ndarray):
+        """
+        Build the index.
+
+        Args:
+            identifiers: Identifier for each candidate row
+            vectors: 2-D array with one candidate vector per row
+        """
+        if len(identifiers) == 0:
+            self.identifiers: List[T] = []
+            self.matrix = np.empty((0, 0), dtype=np.float32)
+            return
+
+        matrix = normalize_rows(vectors)
+        if matrix.shape[0] != len(identifiers):
+            raise ValueError(
+                f"Got {len(identifiers)} identifiers for {matrix.shape[0]} vectors"
+            )
+
+        self.identifiers = list(identifiers)
+        self.matrix = matrix
+
+    @classmethod
+    def from_pairs(cls, pairs: Sequence[Tuple[T, VectorLike]]) -> "SimilarityIndex[T]":
+        """Build an index from (identifier, vector) pairs."""
+        if not pairs:
+            return cls([], np.empty((0, 0), dtype=np.float32))
+
+        identifiers = [identifier for identifier, _ in pairs]
+        vectors = np.stack(
+            [np.asarray(vector, dtype=np.float32) for _, vector in pairs]
+        )
+        return cls(identifiers, vectors)
+
+    def __len__(self) -> int:
+        """Number of candidates in the index."""
+        return len(self.identifiers)
+
+    @property
+    def dimensions(self) -> int:
+        """Dimensionality of the indexed vectors."""
+        return self.matrix.shape[1]
+
+    def scores(self, query: VectorLike) -> np.ndarray:
+        """Cosine similarity of ``query`` against every candidate."""
+        query_matrix = normalize_rows(np.asarray(query, dtype=np.float32))
+        return np.clip(self.matrix @ query_matrix[0], -1.0, 1.0)
+
+    def search(
+        self,
+        query: VectorLike,
+        top_k: int = 5,
+        threshold: Optional[float] = None,
+    ) -> List[Tuple[T, float]]:
+        """
+        Find the candidates most similar to a query.
+
+        Args:
+            query: Query vector
+            top_k: Maximum number of results
+            threshold: Optional minimum similarity
+
+        Returns:
+            List of (identifier, similarity) tuples, most similar first
+        """
+        if not self.identifiers:
+            return []
+
+        return self._select(self.scores(query), top_k, threshold)
+
+    def search_batch(
+        self,
+        queries: Union[np.ndarray, Sequence[VectorLike]],
+        top_k: int = 5,
+        threshold: Optional[float] = None,
+    ) -> List[List[Tuple[T, float]]]:
+        """
+        Find the most similar candidates for several queries at once.
+
+        All queries are scored in one matrix-matrix product.
+
+        Args:
+            queries: Query vectors, one per row
+            top_k: Maximum number of results per query
+            threshold: Optional minimum similarity
+
+        Returns:
+            One result list per query, in query order
+        """
+        query_matrix = normalize_rows(np.asarray(queries, dtype=np.float32))
+        if not self.identifiers:
+            return [[] for _ in range(query_matrix.shape[0])]
+
+        all_scores = np.clip(query_matrix @ self.matrix.T, -1.0, 1.0)
+        return [self._select(row, top_k, threshold) for row in all_scores]
+
+    def _select(
+        self, scores: np.ndarray, top_k: int, threshold: Optional[float]
+    ) -> List[Tuple[T, float]]:
+        """Pick the top results from a score vector."""
+        indices = top_k_indices(scores, top_k)
+        if threshold is not None:
+            indices = indices[scores[indices] >= threshold]
+
+        return [(self.identifiers[i], float(scores[i])) for i in indices]
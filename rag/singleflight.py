@@ -0,0 +1,128 @@
+"""
+Single-Flight Request Coalescing for RAG System.
+
+Lets concurrent tasks that need the same expensive result (an embedding,
+a research call) share one in-flight operation. The first caller for a key
+becomes the leader and does the work; everyone else awaits the leader's
+shared future.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class SingleFlightAbandoned(RuntimeError):
+    """Raised to followers when the leader stopped without producing a result."""
+
+
+class SingleFlight(Generic[V]):
+    """
+    Coalesce concurrent work for the same key onto one shared future.
+
+    Leaders must always call ``release`` (typically in a ``finally`` block)
+    after ``resolve`` or ``reject``; releasing an unfinished future fails its
+    followers with ``SingleFlightAbandoned`` so they can retry themselves.
+    """
+
+    def __init__(self):
+        """Initialize with no requests in flight."""
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced_count = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a request for ``key`` is in flight."""
+        return key in self._futures
+
+    def __len__(self) -> int:
+        """Number of requests in flight."""
+        return len(self._futures)
+
+    def claim(self, key: Hashable) -> Tuple[asyncio.Future, bool]:
+        """
+        Join the in-flight request for ``key`` or become its leader.
+
+        Args:
+            key: Identity of the requested work
+
+        Returns:
+            Tuple of (shared future, True if the caller is the leader)
+        """
+        loop = asyncio.get_running_loop()
+        future = self._futures.get(key)
+
+        # Futures left behind by a previous event loop cannot be awaited here
+        if future is not None and future.get_loop() is loop and not future.done():
+            self.coalesced_count += 1
+            return future, False
+
+        future = loop.create_future()
+        self._futures[key] = future
+        return future, True
+
+    @staticmethod
+    def resolve(future: asyncio.Future, value: V) -> None:
+        """Publish the leader's result to all followers."""
+        if not future.done():
+            future.set_result(value)
+
+    @staticmethod
+    def reject(future: asyncio.Future, error: BaseException) -> None:
+        """Publish the leader's failure to all followers."""
+        if not future.done():
+            future.set_exception(error)
+            # Followers may not exist; don't log the error as unretrieved
+            future.exception()
+
+    def release(self, key: Hashable, future: asyncio.Future) -> None:
+        """Forget the leader's ``future``, failing followers if it is unfinished."""
+        if self._futures.get(key) is future:
+            del self._futures[key]
+        self.reject(future, SingleFlightAbandoned("Leader stopped before finishing"))
+
+    @staticmethod
+    async def wait(future: asyncio.Future) -> V:
+        """
+        Await a shared future without letting follower cancellation cancel it.
+
+        Raises:
+            SingleFlightAbandoned: If the leader stopped without a result
+        """
+        return await asyncio.shield(future)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[V]]) -> V:
+        """
+        Run ``func`` once for all concurrent callers with the same key.
+
+        Followers whose leader is abandoned retry and may become leaders.
+
+        Args:
+            key: Identity of the requested work
+            func: Coroutine factory that produces the result
+
+        Returns:
+            Result of the (single) call to ``func``
+        """
+        while True:
+            future, leader = self.claim(key)
+            if not leader:
+                try:
+                    return await self.wait(future)
+                except SingleFlightAbandoned:
+                    logger.debug(f"Single-flight leader abandoned {key!r}, retrying")
+                    continue
+
+            try:
+                result = await func()
+            except Exception as e:
+                self.reject(future, e)
+                raise
+            else:
+                self.resolve(future, result)
+                return result
+            finally:
+                self.release(key, future)
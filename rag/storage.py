@@ -6,24 +6,293 @@ embeddings using pgvector for similarity search.
 """
 
 import asyncio
+import contextlib
 import hashlib
 import json
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 import asyncpg
+import numpy as np
 from supabase import Client, create_client
 from supabase.lib.client_options import ClientOptions
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .access_stats import (
+    FLUSH_ACCESS_STATS_QUERY,
+    AccessStatsBuffer,
+    flush_parameters,
+)
+from .bulk_load import copy_upsert
+from .cache_topics import (
+    SIMILAR_ENTRY_QUERY,
+    TOPIC_CANDIDATES,
+    TOPIC_CENTROID_QUERY,
+    UPSERT_TOPIC_QUERY,
+    topic_embedding,
+)
+from .chunk_filter import ChunkFilter, filter_clause
 from .config import get_rag_config
-from .embeddings import EmbeddingResult
+from .dedup import open_near_duplicate_index
+from .embeddings import EmbeddingResult, as_vector
+from .findings_snapshot import SNAPSHOT_HEX_PREFIX
 from .processor import TextChunk
+from .vector_codec import register_vector_codecs
+from .vector_index import optimize_vector_index, supports_iterative_scan
 
 logger = logging.getLogger(__name__)
 
+# Distance used to pick candidates from a quantized index for each storage
+# precision; these must match the expression indexes created by
+# sql/research_chunks_compact_embeddings.sql. {query} is the query vector
+_QUANTIZED_DISTANCE = {
+    "float16": "embedding::halfvec({dims}) <=> {query}::halfvec({dims})",
+    "binary": (
+        "binary_quantize(embedding)::bit({dims}) "
+        "<~> binary_quantize({query}::vector({dims}))"
+    ),
+}
+
+# Without iterative index scans (pgvector < 0.8), a filtered HNSW scan only
+# sees ef_search rows before the filter runs; widen it by this factor
+_FILTERED_EF_SEARCH_FACTOR = 4
+
+# Batched nearest-neighbour search: $1 holds every query vector back to
+# back as one real[], split into rows and searched with the single-query
+# statement through a LATERAL join
+_BULK_SIMILARITY_QUERY = """
+    WITH queries AS MATERIALIZED (
+        SELECT q.ord,
+               ($1::real[])[(q.ord - 1) * {dims} + 1 : q.ord * {dims}]::vector({dims})
+                   AS embedding
+        FROM generate_series(1, cardinality($1::real[]) / {dims}) AS q(ord)
+    )
+    SELECT q.ord, c.*
+    FROM queries AS q
+    CROSS JOIN LATERAL ({search}) AS c
+    ORDER BY q.ord, c.similarity DESC
+"""
+
+# Columns written by store_research_chunks, in record order
+_RESEARCH_CHUNK_COLUMNS = (
+    "id",
+    "content",
+    "embedding",
+    "metadata",
+    "keyword",
+    "chunk_index",
+    "source_id",
+    "created_at",
+)
+
+# Cache lookup: {entry} selects the cache entries to return, which come
+# back with their chunks (without embeddings, in chunk_ids order) as one
+# JSON document each, shaped like the REST API's rows. Entries with a
+# current findings snapshot skip the chunks, since the snapshot holds
+# everything. Read-only; hits are counted in an AccessStatsBuffer and
+# written in batches
+_CACHED_RESPONSE_TEMPLATE = f"""
+    WITH {{entry}}
+    SELECT doc || jsonb_build_object(
+        'chunks',
+        CASE WHEN starts_with(doc->>'findings_snapshot', '{SNAPSHOT_HEX_PREFIX}')
+        THEN '[]'::jsonb
+        ELSE COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', c.id,
+                        'content', c.content,
+                        'metadata', c.metadata,
+                        'keyword', c.keyword,
+                        'chunk_index', c.chunk_index,
+                        'source_id', c.source_id,
+                        'created_at', c.created_at
+                    )
+                    ORDER BY u.position
+                )
+                FROM unnest(entry.chunk_ids) WITH ORDINALITY AS u(chunk_id, position)
+                JOIN research_chunks c ON c.id = u.chunk_id
+            ),
+            '[]'::jsonb
+        )
+        END
+    )
+    FROM entry, LATERAL (SELECT to_jsonb(entry) AS doc) AS d
+"""
+
+# Exact lookup by cache key, skipping entries expired for longer than the
+# interval $2; "stale" marks entries served past expires_at
+_CACHED_RESPONSE_QUERY = _CACHED_RESPONSE_TEMPLATE.format(entry="""
+    entry AS (
+        SELECT *, expires_at <= NOW() AS stale
+        FROM cache_entries
+        WHERE id = $1 AND expires_at > NOW() - $2::interval
+    )
+""")
+
+# Semantic lookup: the live entry whose topic embedding is closest to $1
+_SIMILAR_CACHED_RESPONSE_QUERY = _CACHED_RESPONSE_TEMPLATE.format(
+    entry=f"entry AS ({SIMILAR_ENTRY_QUERY.format(query='$1')})"
+)
+
+# Semantic lookup for a batch of keywords, packed into $1 like
+# _BULK_SIMILARITY_QUERY; each document carries its query's "ord"
+_BULK_SIMILAR_CACHED_RESPONSE_QUERY = _CACHED_RESPONSE_TEMPLATE.format(entry=f"""
+    queries AS MATERIALIZED (
+        SELECT q.ord,
+               ($1::real[])[(q.ord - 1) * {{dims}} + 1 : q.ord * {{dims}}]
+                   ::vector({{dims}}) AS embedding
+        FROM generate_series(1, cardinality($1::real[]) / {{dims}}) AS q(ord)
+    ),
+    entry AS (
+        SELECT q.ord, m.*
+        FROM queries AS q
+        CROSS JOIN LATERAL ({SIMILAR_ENTRY_QUERY.format(query="q.embedding")}) AS m
+    )
+""")
+
+# Columns written by store_cache_entry, in parameter order
+_CACHE_ENTRY_COLUMNS = (
+    "id",
+    "keyword",
+    "keyword_normalized",
+    "research_summary",
+    "chunk_ids",
+    "metadata",
+    "hit_count",
+    "created_at",
+    "last_accessed",
+    "expires_at",
+    "findings_snapshot",
+)
+
+
+def _upsert_cache_entry_query(columns: Sequence[str]) -> str:
+    """Insert a cache entry or replace every given column of an existing one."""
+    placeholders = ", ".join(
+        f"${i}::jsonb" if column == "metadata" else f"${i}"
+        for i, column in enumerate(columns, start=1)
+    )
+    updates = ", ".join(
+        f"{column} = EXCLUDED.{column}" for column in columns if column != "id"
+    )
+    return f"""
+    INSERT INTO cache_entries ({", ".join(columns)})
+    VALUES ({placeholders})
+    ON CONFLICT (id) DO UPDATE SET {updates}
+    RETURNING id
+"""
+
+
+# Replaces the entry and its findings snapshot in one statement, so a
+# re-researched entry never carries the previous research's snapshot
+_UPSERT_CACHE_ENTRY_QUERY = _upsert_cache_entry_query(_CACHE_ENTRY_COLUMNS)
+
+# Without sql/cache_entries_findings_snapshot.sql
+_UPSERT_CACHE_ENTRY_WITHOUT_SNAPSHOT_QUERY = _upsert_cache_entry_query(
+    _CACHE_ENTRY_COLUMNS[:-1]
+)
+
+# Session-level advisory lock serializing research of one keyword across
+# processes; $1 is _research_lock_key of the keyword's cache key
+_RESEARCH_LOCK_QUERY = "SELECT pg_advisory_lock($1)"
+_RESEARCH_UNLOCK_QUERY = "SELECT pg_advisory_unlock($1)"
+
+# Storage totals for get_statistics, aggregated in the database
+_STATISTICS_QUERY = """
+    SELECT
+        (SELECT count(*) FROM research_chunks) AS total_chunks,
+        count(*) AS total_cache_entries,
+        COALESCE(sum(hit_count), 0) AS total_cache_hits,
+        COALESCE(avg(hit_count), 0)::float8 AS average_hits_per_entry
+    FROM cache_entries
+"""
+
+# Cache overview for get_cache_stats; storage_bytes is the on-disk size of
+# the cache entry rows, not counting the chunks they reference
+_CACHE_STATS_QUERY = """
+    SELECT
+        chunks.research_chunks,
+        chunks.avg_chunk_size,
+        entries.cache_entries,
+        entries.unique_keywords,
+        entries.storage_bytes,
+        entries.oldest_entry,
+        entries.newest_entry
+    FROM (
+        SELECT
+            count(*) AS research_chunks,
+            COALESCE(avg(length(content)), 0)::float8 AS avg_chunk_size
+        FROM research_chunks
+    ) AS chunks,
+    (
+        SELECT
+            count(*) AS cache_entries,
+            count(DISTINCT keyword) AS unique_keywords,
+            COALESCE(sum(pg_column_size(e.*)), 0) AS storage_bytes,
+            min(created_at) AS oldest_entry,
+            max(created_at) AS newest_entry
+        FROM cache_entries AS e
+    ) AS entries
+"""
+
+# Most common chunk keywords; served from idx_chunks_keyword
+_KEYWORD_DISTRIBUTION_QUERY = """
+    SELECT COALESCE(keyword, 'Unknown') AS keyword, count(*) AS chunks
+    FROM research_chunks
+    GROUP BY keyword
+    ORDER BY chunks DESC, keyword
+    LIMIT $1
+"""
+
+# Chunks matching a cleanup condition, except those a remaining cache
+# entry still lists (near-duplicate reuse lets entries share chunks
+# stored under another keyword or earlier run)
+_DELETE_UNREFERENCED_CHUNKS_QUERY = """
+    WITH referenced AS (
+        SELECT DISTINCT unnest(chunk_ids) AS id FROM cache_entries
+    )
+    DELETE FROM research_chunks AS c
+    WHERE {condition}
+      AND NOT EXISTS (SELECT 1 FROM referenced AS r WHERE r.id = c.id)
+    RETURNING c.id
+"""
+
+
+def _cache_entry_from_json(document: str) -> Dict[str, Any]:
+    """Parse a cached response document, turning its snapshot into bytes."""
+    cache_entry = json.loads(document)
+    snapshot = cache_entry.get("findings_snapshot")
+    if snapshot is not None:
+        # bytea arrives in PostgreSQL's hex format: \x0a1b...
+        cache_entry["findings_snapshot"] = bytes.fromhex(snapshot[2:])
+    return cache_entry
+
+
+def _research_lock_key(cache_key: str) -> int:
+    """Derive a signed 64-bit advisory lock key from a hex cache key."""
+    return int.from_bytes(bytes.fromhex(cache_key[:16]), "big", signed=True)
+
+
+def _chunk_from_row(row) -> Dict[str, Any]:
+    """Convert a research_chunks search row into chunk data."""
+    return {
+        "id": row["id"],
+        "content": row["content"],
+        "metadata": (
+            json.loads(row["metadata"])
+            if isinstance(row["metadata"], str)
+            else row["metadata"]
+        ),
+        "keyword": row["keyword"],
+        "chunk_index": row["chunk_index"],
+        "source_id": row["source_id"],
+        "created_at": row["created_at"],
+    }
+
 
 class VectorStorage:
     """Manages vector storage and retrieval using Supabase with pgvector."""
@@ -44,6 +313,18 @@ class VectorStorage:
         self._pool: Optional[asyncpg.Pool] = None
         self._pool_lock = asyncio.Lock()
 
+        # Cache hits waiting to be written, and the task that writes them
+        self._access_stats = AccessStatsBuffer()
+        self._access_stats_task: Optional[asyncio.Task] = None
+
+        # Whether the server's pgvector can filter during index scans,
+        # detected on the first filtered search
+        self._iterative_scan: Optional[bool] = None
+
+        # Whether cache_entries has the findings_snapshot column, detected
+        # on the first stored entry
+        self._snapshot_column: Optional[bool] = None
+
         logger.info("Initialized VectorStorage with Supabase")
 
     async def __aenter__(self):
@@ -83,6 +364,7 @@ class VectorStorage:
                     max_inactive_connection_lifetime=300,
                     command_timeout=self.config.connection_timeout,
                     statement_cache_size=0,  # Disable prepared statements for pgbouncer
+                    init=register_vector_codecs,  # Binary vector/halfvec transfer
                 )
 
                 logger.info(
@@ -102,7 +384,17 @@ class VectorStorage:
             yield connection
 
     async def close(self):
-        """Close the connection pool."""
+        """Flush pending cache hits and close the connection pool."""
+        # Stop the periodic flusher, then write whatever it had not sent yet
+        if self._access_stats_task is not None:
+            self._access_stats_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._access_stats_task
+            self._access_stats_task = None
+
+        if self._pool and len(self._access_stats):
+            await self.flush_access_stats()
+
         # Close the pool if it exists
         if self._pool:
             await self._pool.close()
@@ -148,46 +440,36 @@ class VectorStorage:
         if len(chunks) != len(embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
 
-        # Prepare data for insertion
-        chunk_records = []
+        # Prepare rows for insertion; later duplicates of an ID
+        # replace earlier ones, as a row-by-row upsert would
+        created_at = datetime.now(timezone.utc)
+        records: Dict[str, Tuple[Any, ...]] = {}
 
         for chunk, embedding in zip(chunks, embeddings):
             # Generate chunk ID
             chunk_id = self._generate_chunk_id(chunk)
 
-            # Prepare record
-            record = {
-                "id": chunk_id,
-                "content": chunk.content,
-                "embedding": embedding.embedding,  # pgvector handles the array
-                "metadata": chunk.metadata,
-                "keyword": keyword,
-                "chunk_index": chunk.chunk_index,
-                "source_id": chunk.source_id,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            }
-
-            chunk_records.append(record)
+            records[chunk_id] = (
+                chunk_id,
+                chunk.content,
+                as_vector(embedding.embedding),  # Binary pgvector codec
+                json.dumps(chunk.metadata),
+                keyword,
+                chunk.chunk_index,
+                chunk.source_id,
+                created_at,
+            )
 
-        # Store in database using Supabase client
+        # Store in database with one COPY and a set-based upsert
         try:
-            # Insert chunks in batches
-            batch_size = 100
-            stored_ids = []
-
-            for i in range(0, len(chunk_records), batch_size):
-                batch = chunk_records[i : i + batch_size]
-
-                # Use upsert to handle duplicates
-                result = (
-                    self.supabase.table("research_chunks")
-                    .upsert(batch, on_conflict="id")
-                    .execute()
+            async with self.get_connection() as conn:
+                stored_ids = await copy_upsert(
+                    conn,
+                    "research_chunks",
+                    _RESEARCH_CHUNK_COLUMNS,
+                    list(records.values()),
                 )
 
-                # Extract IDs from result
-                stored_ids.extend([r["id"] for r in result.data])
-
             logger.info(f"Stored {len(stored_ids)} chunks for keyword: {keyword}")
             return stored_ids
 
@@ -195,6 +477,23 @@ class VectorStorage:
             logger.error(f"Failed to store chunks: {e}")
             raise
 
+    async def existing_chunk_ids(self, chunk_ids: List[str]) -> List[str]:
+        """
+        Find which research chunks are still stored.
+
+        Args:
+            chunk_ids: Chunk IDs to look up
+
+        Returns:
+            The given IDs that exist in research_chunks
+        """
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(
+                "SELECT id FROM research_chunks WHERE id = ANY($1::text[])",
+                chunk_ids,
+            )
+        return [row["id"] for row in rows]
+
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=60)
     )
@@ -204,49 +503,69 @@ class VectorStorage:
         research_summary: str,
         chunk_ids: List[str],
         metadata: Optional[Dict[str, Any]] = None,
+        findings_snapshot: Optional[bytes] = None,
     ) -> str:
         """
         Store a cache entry for quick keyword lookup.
 
+        The entry, including its findings snapshot, is replaced in one
+        statement: lookups see either the previous entry or the new one.
+
         Args:
             keyword: Search keyword
             research_summary: Summary of research findings
             chunk_ids: IDs of related chunks
             metadata: Additional metadata
+            findings_snapshot: Snapshot from rag.findings_snapshot.encode_findings
+                that exact hits are served from (None clears a previous one)
 
         Returns:
             Cache entry ID
         """
         # Generate cache key
         cache_key = self._generate_cache_key(keyword)
-
-        # Prepare cache entry
-        cache_entry = {
-            "id": cache_key,
-            "keyword": keyword,
-            "keyword_normalized": keyword.lower().strip(),
-            "research_summary": research_summary,
-            "chunk_ids": chunk_ids,
-            "metadata": metadata or {},
-            "hit_count": 0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "last_accessed": datetime.now(timezone.utc).isoformat(),
-            "expires_at": (
-                datetime.now(timezone.utc)
-                + timedelta(hours=self.config.cache_ttl_hours)
-            ).isoformat(),
-        }
+        now = datetime.now(timezone.utc)
+
+        # Prepare cache entry, in _CACHE_ENTRY_COLUMNS order
+        values = [
+            cache_key,
+            keyword,
+            keyword.lower().strip(),
+            research_summary,
+            chunk_ids,
+            json.dumps(metadata or {}),
+            0,
+            now,
+            now,
+            now + timedelta(hours=self.config.cache_ttl_hours),
+            findings_snapshot,
+        ]
 
         # Store in database
         try:
-            result = (
-                self.supabase.table("cache_entries")
-                .upsert(cache_entry, on_conflict="id")
-                .execute()
-            )
+            async with self.get_connection() as conn:
+                if self._snapshot_column is not False:
+                    try:
+                        entry_id = await conn.fetchval(
+                            _UPSERT_CACHE_ENTRY_QUERY, *values
+                        )
+                        self._snapshot_column = True
+                    except asyncpg.UndefinedColumnError:
+                        # sql/cache_entries_findings_snapshot.sql not run;
+                        # hits are rebuilt from the entry's chunks
+                        logger.warning(
+                            "cache_entries has no findings_snapshot column, "
+                            "storing entries without snapshots"
+                        )
+                        self._snapshot_column = False
+
+                if self._snapshot_column is False:
+                    entry_id = await conn.fetchval(
+                        _UPSERT_CACHE_ENTRY_WITHOUT_SNAPSHOT_QUERY, *values[:-1]
+                    )
 
             logger.info(f"Stored cache entry for keyword: {keyword}")
-            return result.data[0]["id"]
+            return entry_id
 
         except Exception as e:
             logger.error(f"Failed to store cache entry: {e}")
@@ -257,6 +576,7 @@ class VectorStorage:
         query_embedding: List[float],
         limit: int = 10,
         similarity_threshold: float = None,
+        filters: Optional[ChunkFilter] = None,
     ) -> List[Tuple[Dict[str, Any], float]]:
         """
         Search for similar chunks using vector similarity.
@@ -265,6 +585,8 @@ class VectorStorage:
             query_embedding: Query embedding vector
             limit: Maximum number of results
             similarity_threshold: Minimum similarity score
+            filters: Constraints applied inside the index scan, so the
+                ``limit`` nearest matching chunks are returned
 
         Returns:
             List of (chunk_data, similarity_score) tuples
@@ -275,109 +597,203 @@ class VectorStorage:
 
         # Perform vector similarity search using raw SQL
         async with self.get_connection() as conn:
+            query, extra_args = self._similarity_query(
+                len(query_embedding), filters=filters
+            )
+            settings = await self._search_settings(conn, limit, filters)
+
+            # Execute query; the vector is sent in pgvector's binary format
+            async with conn.transaction():
+                await conn.execute(settings)
+                rows = await conn.fetch(
+                    query,
+                    as_vector(query_embedding),
+                    similarity_threshold,
+                    limit,
+                    *extra_args,
+                )
+
+            # Convert results
+            results = [(_chunk_from_row(row), row["similarity"]) for row in rows]
+
+            logger.info(f"Found {len(results)} similar chunks")
+            return results
+
+    def _rerank_factor(self) -> int:
+        """Candidates fetched per result; above 1 only for quantized search."""
+        precision = getattr(self.config, "embedding_storage_precision", "float32")
+        if precision not in _QUANTIZED_DISTANCE:
+            return 1
+        return int(getattr(self.config, "embedding_rerank_factor", 1))
+
+    def _similarity_query(
+        self,
+        dimensions: int,
+        query_vector: str = "$1",
+        filters: Optional[ChunkFilter] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the chunk similarity query for the configured storage precision.
+
+        Full-precision storage is searched directly. Half-precision and
+        binary modes pick ``limit * embedding_rerank_factor`` candidates
+        through their (smaller) quantized index and re-rank them by exact
+        cosine similarity against the stored vectors. Filters go into the
+        nearest-neighbour step, before its LIMIT.
+
+        Args:
+            dimensions: Dimensions of the query embedding
+            query_vector: SQL expression for the query vector
+            filters: Optional constraints on the chunks searched
+
+        Returns:
+            Tuple of (SQL query, arguments following embedding/threshold/limit)
+        """
+        precision = getattr(self.config, "embedding_storage_precision", "float32")
+        q = query_vector
+
+        if precision not in _QUANTIZED_DISTANCE:
+            where, filter_args = filter_clause(filters, 4)
             # Query using pgvector's <=> operator for cosine distance
             # Note: pgvector returns distance, so we convert to similarity
-            query = """
-                SELECT 
-                    id,
-                    content,
-                    metadata,
-                    keyword,
-                    chunk_index,
-                    source_id,
-                    created_at,
-                    1 - (embedding <=> $1::vector) as similarity
-                FROM research_chunks
-                WHERE 1 - (embedding <=> $1::vector) >= $2
-                ORDER BY embedding <=> $1::vector
-                LIMIT $3
+            # Take the nearest rows through the vector index first and apply
+            # the threshold afterwards; filtering on similarity before the
+            # ORDER BY ... LIMIT would force an exact scan
+            query = f"""
+                SELECT id, content, metadata, keyword, chunk_index, source_id,
+                       created_at, similarity
+                FROM (
+                    SELECT
+                        id,
+                        content,
+                        metadata,
+                        keyword,
+                        chunk_index,
+                        source_id,
+                        created_at,
+                        1 - (embedding <=> {q}::vector) as similarity
+                    FROM research_chunks
+                    {where}
+                    ORDER BY embedding <=> {q}::vector
+                    LIMIT $3
+                ) AS nearest
+                WHERE similarity >= $2
+                ORDER BY similarity DESC
             """
+            return query, filter_args
+
+        distance = _QUANTIZED_DISTANCE[precision].format(dims=dimensions, query=q)
+        where, filter_args = filter_clause(filters, 5)
+        query = f"""
+            WITH candidates AS (
+                SELECT id, content, metadata, keyword, chunk_index, source_id,
+                       created_at, embedding
+                FROM research_chunks
+                {where}
+                ORDER BY {distance}
+                LIMIT $3 * $4
+            ), ranked AS (
+                SELECT *,
+                       1 - (embedding::vector({dimensions})
+                            <=> {q}::vector({dimensions})) as similarity
+                FROM candidates
+            )
+            SELECT id, content, metadata, keyword, chunk_index, source_id,
+                   created_at, similarity
+            FROM ranked
+            WHERE similarity >= $2
+            ORDER BY similarity DESC
+            LIMIT $3
+        """
+        return query, [self._rerank_factor(), *filter_args]
+
+    async def _search_settings(
+        self,
+        conn: asyncpg.Connection,
+        limit: int,
+        filters: Optional[ChunkFilter] = None,
+    ) -> str:
+        """
+        Build the per-search index settings, applied with SET LOCAL.
 
-            # Convert embedding list to PostgreSQL vector format string
-            # Format: '[0.1, 0.2, 0.3, ...]'
-            embedding_str = f"[{','.join(str(x) for x in query_embedding)}]"
+        ``hnsw.ef_search`` bounds how many rows an HNSW scan can return, so
+        it is raised to the number of rows the query asks for (including
+        quantized re-rank candidates), up to pgvector's maximum of 1000.
 
-            # Execute query
-            rows = await conn.fetch(query, embedding_str, similarity_threshold, limit)
+        Filtered searches use iterative index scans where pgvector supports
+        them (0.8+), which keep walking the index until enough rows pass the
+        filter. Older versions get a wider ef_search instead.
 
-            # Convert results
-            results = []
-            for row in rows:
-                chunk_data = {
-                    "id": row["id"],
-                    "content": row["content"],
-                    "metadata": (
-                        json.loads(row["metadata"])
-                        if isinstance(row["metadata"], str)
-                        else row["metadata"]
-                    ),
-                    "keyword": row["keyword"],
-                    "chunk_index": row["chunk_index"],
-                    "source_id": row["source_id"],
-                    "created_at": row["created_at"],
-                }
-                similarity = row["similarity"]
-                results.append((chunk_data, similarity))
+        Args:
+            conn: Connection the search runs on
+            limit: Rows requested per query
+            filters: Filter of the search, if any
 
-            logger.info(f"Found {len(results)} similar chunks")
-            return results
+        Returns:
+            SET LOCAL statements for the search transaction
+        """
+        candidates = limit * self._rerank_factor()
+        ef_search = int(getattr(self.config, "vector_search_ef_search", 100))
+        probes = int(getattr(self.config, "vector_search_probes", 10))
+        settings = []
+
+        if filters is not None:
+            if self._iterative_scan is None:
+                self._iterative_scan = await supports_iterative_scan(conn)
+            if self._iterative_scan:
+                # Results are re-sorted by similarity, so relaxed order is fine
+                settings += [
+                    "SET LOCAL hnsw.iterative_scan = relaxed_order",
+                    "SET LOCAL ivfflat.iterative_scan = relaxed_order",
+                ]
+            else:
+                ef_search *= _FILTERED_EF_SEARCH_FACTOR
 
-    async def get_cached_response(self, keyword: str) -> Optional[Dict[str, Any]]:
+        settings += [
+            f"SET LOCAL hnsw.ef_search = {min(max(ef_search, candidates), 1000)}",
+            f"SET LOCAL ivfflat.probes = {probes}",
+        ]
+        return "; ".join(settings)
+
+    async def get_cached_response(
+        self,
+        keyword: str,
+        max_stale: Optional[timedelta] = None,
+        record_hit: bool = True,
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve cached response for a keyword.
 
         Args:
             keyword: Search keyword
+            max_stale: Also return entries that expired at most this long
+                ago, marked with "stale": True (default: only live entries)
+            record_hit: Count the lookup as a hit if an entry is found
 
         Returns:
-            Cached response data or None
+            Cached response data or None. Entries with a current findings
+            snapshot carry it as bytes in "findings_snapshot" and come
+            without chunks
         """
         # Generate cache key
         cache_key = self._generate_cache_key(keyword)
 
         try:
-            # Query cache entry
-            result = (
-                self.supabase.table("cache_entries")
-                .select("*")
-                .eq("id", cache_key)
-                .execute()
-            )
+            # Check expiry and gather chunks (or the snapshot) in one round trip
+            async with self.get_connection() as conn:
+                row = await conn.fetchval(
+                    _CACHED_RESPONSE_QUERY, cache_key, max_stale or timedelta(0)
+                )
 
-            if not result.data:
+            if row is None:
+                logger.debug(f"No live cache entry for keyword: {keyword}")
                 return None
 
-            cache_entry = result.data[0]
+            cache_entry = _cache_entry_from_json(row)
 
-            # Check if expired
-            expires_at = datetime.fromisoformat(
-                cache_entry["expires_at"].replace("Z", "+00:00")
-            )
-            if expires_at < datetime.now(timezone.utc):
-                logger.info(f"Cache entry expired for keyword: {keyword}")
-                return None
-
-            # Update hit count and last accessed
-            self.supabase.table("cache_entries").update(
-                {
-                    "hit_count": cache_entry["hit_count"] + 1,
-                    "last_accessed": datetime.now(timezone.utc).isoformat(),
-                }
-            ).eq("id", cache_key).execute()
-
-            # Fetch associated chunks
-            chunk_ids = cache_entry["chunk_ids"]
-            if chunk_ids:
-                chunks_result = (
-                    self.supabase.table("research_chunks")
-                    .select("*")
-                    .in_("id", chunk_ids)
-                    .execute()
-                )
-
-                cache_entry["chunks"] = chunks_result.data
-            else:
-                cache_entry["chunks"] = []
+            # Count the hit; the database is updated by the background flusher
+            if record_hit:
+                self.record_cache_hit(cache_key)
 
             logger.info(f"Retrieved cached response for keyword: {keyword}")
             return cache_entry
@@ -386,37 +802,254 @@ class VectorStorage:
             logger.error(f"Failed to retrieve cached response: {e}")
             return None
 
-    async def get_statistics(self) -> Dict[str, Any]:
-        """Get storage statistics."""
-        try:
-            # Get counts using Supabase client
-            chunks_count = len(
-                self.supabase.table("research_chunks")
-                .select("id", count="exact")
-                .execute()
-                .data
+    async def get_similar_cached_response(
+        self,
+        query_embedding: List[float],
+        similarity_threshold: float = None,
+        record_hit: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the cached response whose topic is closest to an embedding.
+
+        One nearest-neighbour lookup over the cache_topics index (one row
+        per cache entry) returns the best live entry with its chunks.
+
+        Args:
+            query_embedding: Embedding of the requested keyword
+            similarity_threshold: Minimum topic similarity (defaults to
+                cache_similarity_threshold)
+            record_hit: Count the match as a hit; pass False when the
+                match may not be served, and call record_cache_hit later
+
+        Returns:
+            Cached response data with its "similarity", or None
+
+        Raises:
+            asyncpg.UndefinedTableError: If sql/cache_topics.sql was not run
+        """
+        if similarity_threshold is None:
+            similarity_threshold = self.config.cache_similarity_threshold
+
+        async with self.get_connection() as conn:
+            row = await conn.fetchval(
+                _SIMILAR_CACHED_RESPONSE_QUERY,
+                as_vector(query_embedding),
+                similarity_threshold,
+                TOPIC_CANDIDATES,
             )
 
-            cache_count = len(
-                self.supabase.table("cache_entries")
-                .select("id", count="exact")
-                .execute()
-                .data
+        if row is None:
+            return None
+
+        cache_entry = _cache_entry_from_json(row)
+
+        # A semantic hit serves the matched entry, so it counts as its hit
+        if record_hit:
+            self.record_cache_hit(cache_entry["id"])
+
+        logger.info(
+            f"Found similar cached keyword '{cache_entry['keyword']}' "
+            f"(similarity: {cache_entry['similarity']:.2f})"
+        )
+        return cache_entry
+
+    async def get_similar_cached_responses(
+        self, embeddings: List[List[float]], similarity_threshold: float = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up the closest cached response for several embeddings at once.
+
+        All embeddings are matched in one statement, like bulk_search.
+        Matches are not counted as hits, since nothing is served yet.
+
+        Args:
+            embeddings: Keyword embeddings (all the same dimensions)
+            similarity_threshold: Minimum topic similarity (defaults to
+                cache_similarity_threshold)
+
+        Returns:
+            Cached response data or None for each embedding, in input order
+
+        Raises:
+            asyncpg.UndefinedTableError: If sql/cache_topics.sql was not run
+        """
+        if not embeddings:
+            return []
+
+        if similarity_threshold is None:
+            similarity_threshold = self.config.cache_similarity_threshold
+
+        vectors = [as_vector(embedding) for embedding in embeddings]
+        dimensions = len(vectors[0])
+        if any(len(vector) != dimensions for vector in vectors):
+            raise ValueError("All embeddings in a bulk lookup must have equal length")
+
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(
+                _BULK_SIMILAR_CACHED_RESPONSE_QUERY.format(dims=dimensions),
+                np.concatenate(vectors).tolist(),
+                similarity_threshold,
+                TOPIC_CANDIDATES,
+            )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(vectors)
+        for row in rows:
+            cache_entry = _cache_entry_from_json(row[0])
+            results[cache_entry.pop("ord") - 1] = cache_entry
+        return results
+
+    async def store_cache_topic(
+        self, keyword: str, keyword_embedding: List[float]
+    ) -> str:
+        """
+        Store the topic embedding of a keyword's cache entry.
+
+        Call after store_cache_entry: the topic blends the keyword embedding
+        with the centroid of the entry's stored chunks.
+
+        Args:
+            keyword: Cached keyword
+            keyword_embedding: Embedding of the keyword
+
+        Returns:
+            Cache entry ID
+
+        Raises:
+            asyncpg.UndefinedTableError: If sql/cache_topics.sql was not run
+        """
+        cache_key = self._generate_cache_key(keyword)
+
+        async with self.get_connection() as conn:
+            centroid = await conn.fetchval(TOPIC_CENTROID_QUERY, cache_key)
+            await conn.execute(
+                UPSERT_TOPIC_QUERY,
+                cache_key,
+                keyword,
+                topic_embedding(as_vector(keyword_embedding), centroid),
             )
 
-            # Get cache statistics
-            cache_stats = (
-                self.supabase.table("cache_entries").select("hit_count").execute().data
+        logger.debug(f"Stored topic embedding for keyword: {keyword}")
+        return cache_key
+
+    @asynccontextmanager
+    async def research_lock(self, keyword: str, timeout: float) -> AsyncIterator[bool]:
+        """
+        Hold a PostgreSQL advisory lock while a keyword is researched.
+
+        Workers in other processes that miss the cache for the same keyword
+        wait here; once they hold the lock they should check the cache
+        again before researching. The lock holds a pooled connection until
+        the block exits, and needs a session-mode connection (not a
+        transaction-mode pooler).
+
+        Args:
+            keyword: Keyword about to be researched
+            timeout: Seconds to wait for a connection and the lock
+
+        Yields:
+            True if the lock is held; False if it could not be taken in
+            time, in which case the caller proceeds without it
+        """
+        key = _research_lock_key(self._generate_cache_key(keyword))
+
+        async def acquire(pool: asyncpg.Pool) -> asyncpg.Connection:
+            connection = await pool.acquire()
+            try:
+                await connection.execute(_RESEARCH_LOCK_QUERY, key)
+            except BaseException:
+                # Releasing resets the session, dropping a lock granted late
+                await pool.release(connection)
+                raise
+            return connection
+
+        connection: Optional[asyncpg.Connection] = None
+        try:
+            pool = await self._get_pool()
+            connection = await asyncio.wait_for(acquire(pool), timeout)
+        except Exception as e:
+            logger.warning(
+                f"Researching '{keyword}' without the cross-process lock: "
+                f"{type(e).__name__} {e}"
+            )
+
+        try:
+            yield connection is not None
+        finally:
+            if connection is not None:
+                try:
+                    await connection.execute(_RESEARCH_UNLOCK_QUERY, key)
+                finally:
+                    await pool.release(connection)
+
+    def record_cache_hit(self, cache_key: str) -> None:
+        """
+        Count a served cache hit.
+
+        Hits are buffered and written by the background flusher.
+
+        Args:
+            cache_key: ID of the served cache entry
+        """
+        self._access_stats.record(cache_key)
+        self._start_access_stats_flusher()
+
+    def _start_access_stats_flusher(self) -> None:
+        """Start the periodic access statistics flush if it is not running."""
+        if self._access_stats_task is None or self._access_stats_task.done():
+            self._access_stats_task = asyncio.create_task(
+                self._flush_access_stats_periodically()
             )
 
-            total_hits = sum(entry["hit_count"] for entry in cache_stats)
-            avg_hits = total_hits / len(cache_stats) if cache_stats else 0
+    async def _flush_access_stats_periodically(self) -> None:
+        """Write buffered cache hits every ``access_stats_flush_seconds``."""
+        interval = float(getattr(self.config, "access_stats_flush_seconds", 5.0))
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush_access_stats()
+
+    async def flush_access_stats(self) -> int:
+        """
+        Write buffered cache hits to ``cache_entries``.
+
+        All pending keys are applied in one UPDATE, so the counts are added
+        atomically and concurrent flushes from other processes are not lost.
+        On failure the hits are put back and retried on the next flush. That
+        includes cancellation, e.g. ``close()`` stopping the periodic flusher
+        mid-write, so the final flush in ``close()`` still sends them.
+
+        Returns:
+            Number of cache entries updated
+        """
+        pending = self._access_stats.drain()
+        if not pending:
+            return 0
+
+        try:
+            async with self.get_connection() as conn:
+                await conn.execute(FLUSH_ACCESS_STATS_QUERY, *flush_parameters(pending))
+        except Exception as e:
+            self._access_stats.restore(pending)
+            logger.warning(f"Failed to flush cache access statistics: {e}")
+            return 0
+        except BaseException:
+            self._access_stats.restore(pending)
+            raise
+
+        logger.debug(f"Flushed access statistics for {len(pending)} cache entries")
+        return len(pending)
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get storage statistics."""
+        try:
+            # Count rows and hits in the database
+            async with self.get_connection() as conn:
+                row = await conn.fetchrow(_STATISTICS_QUERY)
 
             return {
-                "total_chunks": chunks_count,
-                "total_cache_entries": cache_count,
-                "total_cache_hits": total_hits,
-                "average_hits_per_entry": round(avg_hits, 2),
+                "total_chunks": row["total_chunks"],
+                "total_cache_entries": row["total_cache_entries"],
+                "total_cache_hits": row["total_cache_hits"],
+                "average_hits_per_entry": round(row["average_hits_per_entry"], 2),
                 "storage_initialized": True,
             }
 
@@ -449,25 +1082,66 @@ class VectorStorage:
             return 0
 
     async def bulk_search(
-        self, embeddings: List[List[float]], limit_per_query: int = 5
+        self,
+        embeddings: List[List[float]],
+        limit_per_query: int = 5,
+        similarity_threshold: float = None,
+        filters: Optional[ChunkFilter] = None,
     ) -> List[List[Tuple[Dict[str, Any], float]]]:
         """
         Perform bulk similarity search for multiple embeddings.
 
+        All query vectors are sent in one statement and searched with a
+        LATERAL top-k join, so the batch uses a single connection and round
+        trip instead of one query per embedding.
+
         Args:
-            embeddings: List of embedding vectors
+            embeddings: List of embedding vectors (all the same dimensions)
             limit_per_query: Results per query
+            similarity_threshold: Minimum similarity score
+            filters: Constraints applied to every query inside the index scan
 
         Returns:
-            List of results for each query
+            List of (chunk_data, similarity_score) lists, one per embedding
+            in input order
         """
-        # Perform searches in parallel
-        tasks = [
-            self.search_similar_chunks(embedding, limit_per_query)
-            for embedding in embeddings
-        ]
+        if not embeddings:
+            return []
+
+        # Use config threshold if not specified
+        if similarity_threshold is None:
+            similarity_threshold = self.config.similarity_threshold
+
+        vectors = [as_vector(embedding) for embedding in embeddings]
+        dimensions = len(vectors[0])
+        if any(len(vector) != dimensions for vector in vectors):
+            raise ValueError("All embeddings in a bulk search must have equal length")
+
+        search, extra_args = self._similarity_query(dimensions, "q.embedding", filters)
+        query = _BULK_SIMILARITY_QUERY.format(dims=dimensions, search=search)
+
+        async with self.get_connection() as conn:
+            settings = await self._search_settings(conn, limit_per_query, filters)
+            async with conn.transaction():
+                await conn.execute(settings)
+                # Scalar real[] parameter; lists of vectors are not sent as vector[]
+                rows = await conn.fetch(
+                    query,
+                    np.concatenate(vectors).tolist(),
+                    similarity_threshold,
+                    limit_per_query,
+                    *extra_args,
+                )
 
-        results = await asyncio.gather(*tasks)
+        # Group rows by query position (ord is 1-based)
+        results: List[List[Tuple[Dict[str, Any], float]]] = [[] for _ in vectors]
+        for row in rows:
+            results[row["ord"] - 1].append((_chunk_from_row(row), row["similarity"]))
+
+        logger.info(
+            f"Found {len(rows)} similar chunks for {len(vectors)} queries "
+            f"in one statement"
+        )
         return results
 
     async def search_similar(
@@ -515,65 +1189,24 @@ class VectorStorage:
             Dictionary with cache statistics
         """
         try:
-            # Get basic counts
-            chunks_result = (
-                self.supabase.table("research_chunks")
-                .select("*", count="exact")
-                .execute()
-            )
-            chunks_count = len(chunks_result.data) if chunks_result.data else 0
+            # Aggregate both tables in the database; the response size does
+            # not depend on how many rows they hold
+            async with self.get_connection() as conn:
+                row = await conn.fetchrow(_CACHE_STATS_QUERY)
 
-            cache_result = (
-                self.supabase.table("cache_entries")
-                .select("*", count="exact")
-                .execute()
-            )
-            cache_count = len(cache_result.data) if cache_result.data else 0
-            cache_entries = cache_result.data if cache_result.data else []
-
-            # Calculate storage size (approximate)
-            total_size = 0
-            unique_keywords = set()
-            oldest_entry = None
-            newest_entry = None
-
-            if cache_entries:
-                for entry in cache_entries:
-                    # Estimate size
-                    entry_size = len(json.dumps(entry))
-                    total_size += entry_size
-
-                    # Track unique keywords
-                    unique_keywords.add(entry.get("keyword", ""))
-
-                    # Track dates
-                    created_at = entry.get("created_at")
-                    if created_at:
-                        if not oldest_entry or created_at < oldest_entry:
-                            oldest_entry = created_at
-                        if not newest_entry or created_at > newest_entry:
-                            newest_entry = created_at
-
-            # Calculate average chunk size
-            avg_chunk_size = 0
-            if chunks_result.data:
-                total_chunk_chars = sum(
-                    len(chunk.get("content", "")) for chunk in chunks_result.data
-                )
-                avg_chunk_size = (
-                    total_chunk_chars / chunks_count if chunks_count > 0 else 0
-                )
+            oldest_entry = row["oldest_entry"]
+            newest_entry = row["newest_entry"]
 
             return {
-                "total_entries": chunks_count + cache_count,
-                "research_chunks": chunks_count,
-                "cache_entries": cache_count,
-                "unique_keywords": len(unique_keywords),
-                "storage_bytes": total_size,
-                "avg_chunk_size": avg_chunk_size,
-                "oldest_entry": oldest_entry,
-                "newest_entry": newest_entry,
-                "total_embeddings": chunks_count,  # Each chunk has an embedding
+                "total_entries": row["research_chunks"] + row["cache_entries"],
+                "research_chunks": row["research_chunks"],
+                "cache_entries": row["cache_entries"],
+                "unique_keywords": row["unique_keywords"],
+                "storage_bytes": row["storage_bytes"],
+                "avg_chunk_size": row["avg_chunk_size"],
+                "oldest_entry": oldest_entry.isoformat() if oldest_entry else None,
+                "newest_entry": newest_entry.isoformat() if newest_entry else None,
+                "total_embeddings": row["research_chunks"],  # One per chunk
             }
 
         except Exception as e:
@@ -597,26 +1230,11 @@ class VectorStorage:
             List of (keyword, count) tuples
         """
         try:
-            # Get all keywords from chunks
-            chunks_result = (
-                self.supabase.table("research_chunks").select("keyword").execute()
-            )
-
-            if not chunks_result.data:
-                return []
-
-            # Count keywords
-            keyword_counts = {}
-            for chunk in chunks_result.data:
-                keyword = chunk.get("keyword", "Unknown")
-                keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
-
-            # Sort by count and return top N
-            sorted_keywords = sorted(
-                keyword_counts.items(), key=lambda x: x[1], reverse=True
-            )
+            # Count and rank keywords in the database
+            async with self.get_connection() as conn:
+                rows = await conn.fetch(_KEYWORD_DISTRIBUTION_QUERY, limit)
 
-            return sorted_keywords[:limit]
+            return [(row["keyword"], row["chunks"]) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get keyword distribution: {e}")
@@ -641,27 +1259,21 @@ class VectorStorage:
             # Delete from cache_entries table
             if older_than_days:
                 # Calculate cutoff date
-                cutoff_date = (
-                    datetime.now(timezone.utc) - timedelta(days=older_than_days)
-                ).isoformat()
+                cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
 
                 # Delete old cache entries
                 cache_result = (
                     self.supabase.table("cache_entries")
                     .delete()
-                    .lt("created_at", cutoff_date)
+                    .lt("created_at", cutoff.isoformat())
                     .execute()
                 )
                 deleted_count += len(cache_result.data) if cache_result.data else 0
 
-                # Delete old chunks
-                chunks_result = (
-                    self.supabase.table("research_chunks")
-                    .delete()
-                    .lt("created_at", cutoff_date)
-                    .execute()
+                # Delete old chunks no remaining entry uses
+                deleted_chunks = await self._delete_unreferenced_chunks(
+                    "c.created_at < $1", cutoff
                 )
-                deleted_count += len(chunks_result.data) if chunks_result.data else 0
 
             elif keyword:
                 # Delete cache entries for keyword
@@ -674,14 +1286,10 @@ class VectorStorage:
                 )
                 deleted_count += len(cache_result.data) if cache_result.data else 0
 
-                # Delete chunks for keyword
-                chunks_result = (
-                    self.supabase.table("research_chunks")
-                    .delete()
-                    .ilike("keyword", f"%{keyword}%")
-                    .execute()
+                # Delete chunks for keyword no remaining entry uses
+                deleted_chunks = await self._delete_unreferenced_chunks(
+                    "c.keyword ILIKE $1", f"%{keyword}%"
                 )
-                deleted_count += len(chunks_result.data) if chunks_result.data else 0
 
             else:
                 # Clear all cache entries
@@ -693,14 +1301,13 @@ class VectorStorage:
                 )
                 deleted_count += len(cache_result.data) if cache_result.data else 0
 
-                # Clear all chunks
-                chunks_result = (
-                    self.supabase.table("research_chunks")
-                    .delete()
-                    .neq("id", "")
-                    .execute()
-                )
-                deleted_count += len(chunks_result.data) if chunks_result.data else 0
+                # Clear all chunks (bar any entry stored meanwhile)
+                deleted_chunks = await self._delete_unreferenced_chunks("TRUE")
+
+            deleted_count += len(deleted_chunks)
+
+            # Deleted chunks can no longer stand in for near-duplicates
+            self._forget_near_duplicates(deleted_chunks)
 
             logger.info(f"Cleaned up {deleted_count} cache entries")
             return deleted_count
@@ -709,6 +1316,72 @@ class VectorStorage:
             logger.error(f"Failed to cleanup cache: {e}")
             return 0
 
+    async def _delete_unreferenced_chunks(
+        self, condition: str, *args: Any
+    ) -> List[str]:
+        """
+        Delete research chunks matching condition that no cache entry lists.
+
+        Args:
+            condition: SQL condition on research_chunks (aliased ``c``)
+            *args: Query parameters for the condition
+
+        Returns:
+            IDs of the deleted chunks
+        """
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(
+                _DELETE_UNREFERENCED_CHUNKS_QUERY.format(condition=condition), *args
+            )
+        return [row["id"] for row in rows]
+
+    def _forget_near_duplicates(self, chunk_ids: List[str]) -> None:
+        """Drop near-duplicate index entries for chunks removed by cleanup."""
+        index = open_near_duplicate_index(self.config)
+        if index is None or not chunk_ids:
+            return
+
+        try:
+            index.forget("research_chunks", chunk_ids)
+        except Exception as e:
+            logger.warning(f"Near-duplicate index cleanup failed: {e}")
+
+    async def optimize_indexes(
+        self, rebuild: bool = False, dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Tune the research_chunks vector index and refresh planner statistics.
+
+        Rebuilds the vector index of the configured storage precision as an
+        HNSW index sized for the current row count when it is missing,
+        IVFFlat or built with other parameters (see rag.vector_index), then
+        ANALYZEs both RAG tables.
+
+        Args:
+            rebuild: Rebuild the vector index even if it already fits
+            dry_run: Only report what would be done
+
+        Returns:
+            Report from optimize_vector_index
+        """
+        async with self.get_connection() as conn:
+            report = await optimize_vector_index(
+                conn,
+                precision=getattr(
+                    self.config, "embedding_storage_precision", "float32"
+                ),
+                dimensions=self.config.embedding_dimensions,
+                rebuild=rebuild,
+                dry_run=dry_run,
+            )
+            if not dry_run:
+                await conn.execute("ANALYZE cache_entries")
+
+        report["configured_ef_search"] = getattr(
+            self.config, "vector_search_ef_search", None
+        )
+        return report
+
     async def warm_pool(self) -> bool:
         """
         Warm the connection pool by establishing connections.
@@ -0,0 +1,97 @@
+"""
+Binary pgvector Codecs for asyncpg.
+
+Registers encoders and decoders for pgvector's ``vector`` and ``halfvec``
+types using their binary wire format, so embeddings travel between numpy
+and PostgreSQL as raw floats instead of being formatted into and parsed
+out of ``'[0.1,0.2,...]'`` strings.
+
+Wire format (pgvector ``vector_send``/``halfvec_send``):
+    uint16 dimensions, uint16 unused, then one big-endian float32 (vector)
+    or float16 (halfvec) per dimension
+"""
+
+import logging
+import struct
+from typing import Callable, Dict, Sequence, Union
+
+import asyncpg
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VectorLike = Union[np.ndarray, Sequence[float]]
+
+_HEADER = struct.Struct(">HH")
+
+# Element type on the wire for each pgvector type
+_WIRE_TYPES: Dict[str, np.dtype] = {
+    "vector": np.dtype(">f4"),
+    "halfvec": np.dtype(">f2"),
+}
+
+
+def _encoder(wire_type: np.dtype) -> Callable[[VectorLike], bytes]:
+    """Build an encoder writing vectors with the given element type."""
+
+    def encode(value: VectorLike) -> bytes:
+        # One byte-swapping copy; no per-element Python work
+        array = np.asarray(value, dtype=wire_type).reshape(-1)
+        return _HEADER.pack(array.size, 0) + array.tobytes()
+
+    return encode
+
+
+def _decoder(wire_type: np.dtype) -> Callable[[bytes], np.ndarray]:
+    """Build a decoder reading vectors with the given element type."""
+
+    def decode(data: bytes) -> np.ndarray:
+        dimensions, _ = _HEADER.unpack_from(data)
+        # Read-only view over the received buffer; numpy handles the byte
+        # order transparently in arithmetic and conversions
+        return np.frombuffer(
+            data, dtype=wire_type, count=dimensions, offset=_HEADER.size
+        )
+
+    return decode
+
+
+encode_vector = _encoder(_WIRE_TYPES["vector"])
+decode_vector = _decoder(_WIRE_TYPES["vector"])
+encode_halfvec = _encoder(_WIRE_TYPES["halfvec"])
+decode_halfvec = _decoder(_WIRE_TYPES["halfvec"])
+
+
+async def register_vector_codecs(connection: asyncpg.Connection) -> None:
+    """
+    Register binary codecs for the pgvector types on a connection.
+
+    Intended as the ``init`` callback of ``asyncpg.create_pool``. The
+    extension's schema is looked up rather than assumed, since Supabase
+    installs pgvector in ``extensions`` instead of ``public``.
+
+    Args:
+        connection: Newly opened connection
+    """
+    rows = await connection.fetch(
+        """
+        SELECT typname, typnamespace::regnamespace::text AS schema
+        FROM pg_type
+        WHERE typname = ANY($1::text[])
+        """,
+        list(_WIRE_TYPES),
+    )
+
+    for row in rows:
+        wire_type = _WIRE_TYPES[row["typname"]]
+        await connection.set_type_codec(
+            row["typname"],
+            schema=row["schema"].strip('"'),
+            encoder=_encoder(wire_type),
+            decoder=_decoder(wire_type),
+            format="binary",
+        )
+
+    if len(rows) < len(_WIRE_TYPES):
+        missing = set(_WIRE_TYPES) - {row["typname"] for row in rows}
+        logger.debug(f"pgvector types not found, no codec for: {sorted(missing)}")
@@ -0,0 +1,246 @@
+"""
+Vector Index Management for RAG Storage.
+
+Sizes and (re)builds the HNSW index on research_chunks.embedding from the
+table's row count, and refreshes planner statistics. Index builds use
+CREATE INDEX CONCURRENTLY under a temporary name, so searches keep using
+the old index until the new one is swapped in.
+
+Which index is built depends on EMBEDDING_STORAGE_PRECISION: the
+full-precision index, or the half-precision or binary quantized index
+that sql/research_chunks_compact_embeddings.sql creates instead.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Generous default for index builds; large HNSW builds take minutes
+INDEX_BUILD_TIMEOUT = 3600.0
+
+# First pgvector release with hnsw/ivfflat.iterative_scan
+ITERATIVE_SCAN_VERSION = (0, 8)
+
+# Index name, indexed expression and operator class per storage precision.
+# The expressions must match sql/research_chunks_compact_embeddings.sql and
+# the distances rag/storage.py searches with, or the index goes unused
+VECTOR_INDEX_LAYOUTS = {
+    "float32": ("idx_chunks_embedding", "{column}", "vector_cosine_ops"),
+    "float16": (
+        "idx_chunks_embedding_halfvec",
+        "({column}::halfvec({dims}))",
+        "halfvec_cosine_ops",
+    ),
+    "binary": (
+        "idx_chunks_embedding_binary",
+        "(binary_quantize({column})::bit({dims}))",
+        "bit_hamming_ops",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class HNSWParameters:
+    """Build and query settings for an HNSW index."""
+
+    m: int
+    ef_construction: int
+    ef_search: int
+
+    @property
+    def options(self) -> Dict[str, str]:
+        """Index storage parameters as reported by pg_class.reloptions."""
+        return {"m": str(self.m), "ef_construction": str(self.ef_construction)}
+
+
+def plan_hnsw_parameters(rows: int) -> HNSWParameters:
+    """
+    Choose HNSW parameters for a table size.
+
+    Small tables keep pgvector's defaults. Larger graphs get a wider
+    construction search (and more links beyond a million rows) so recall
+    holds up, at the cost of slower builds.
+
+    Args:
+        rows: Number of rows to index
+
+    Returns:
+        Parameters for the index and a matching per-query ef_search
+    """
+    if rows < 100_000:
+        return HNSWParameters(m=16, ef_construction=64, ef_search=40)
+    if rows < 1_000_000:
+        return HNSWParameters(m=16, ef_construction=128, ef_search=100)
+    return HNSWParameters(m=24, ef_construction=200, ef_search=200)
+
+
+async def supports_iterative_scan(connection: asyncpg.Connection) -> bool:
+    """
+    Check whether the installed pgvector can filter during index scans.
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        True for pgvector 0.8 or later
+    """
+    version = await connection.fetchval(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )
+    if not isinstance(version, str):
+        return False
+    try:
+        release = tuple(int(part) for part in version.split(".")[:2])
+    except ValueError:
+        return False
+    return release >= ITERATIVE_SCAN_VERSION
+
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _parse_reloptions(reloptions: Optional[List[str]]) -> Dict[str, str]:
+    """Turn ['m=16', 'ef_construction=64'] into a dict."""
+    return dict(option.split("=", 1) for option in reloptions or [])
+
+
+async def describe_index(
+    connection: asyncpg.Connection, index: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up an index's access method, storage options and validity.
+
+    Args:
+        connection: Database connection
+        index: Index name
+
+    Returns:
+        Dict with "method", "options" and "valid", or None if it does not exist
+    """
+    row = await connection.fetchrow(
+        """
+        SELECT am.amname AS method, c.reloptions, i.indisvalid AS valid
+        FROM pg_class c
+        JOIN pg_am am ON am.oid = c.relam
+        JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE c.oid = to_regclass($1)
+        """,
+        index,
+    )
+    if row is None:
+        return None
+    return {
+        "method": row["method"],
+        "options": _parse_reloptions(row["reloptions"]),
+        "valid": row["valid"],
+    }
+
+
+async def optimize_vector_index(
+    connection: asyncpg.Connection,
+    table: str = "research_chunks",
+    column: str = "embedding",
+    index: Optional[str] = None,
+    precision: str = "float32",
+    dimensions: Optional[int] = None,
+    rebuild: bool = False,
+    dry_run: bool = False,
+    timeout: float = INDEX_BUILD_TIMEOUT,
+) -> Dict[str, Any]:
+    """
+    Bring a storage precision's HNSW index in line with the table size, then ANALYZE.
+
+    The index is rebuilt when it is missing, invalid, not HNSW (e.g. the
+    IVFFlat index from older setups) or built with other parameters than
+    plan_hnsw_parameters picks for the current row count. Indexes of other
+    precisions are left alone.
+
+    Must not run inside a transaction (CREATE INDEX CONCURRENTLY).
+
+    Args:
+        connection: Database connection
+        table: Table holding the vectors
+        column: Vector column
+        index: Name of the vector index (default: the precision's index)
+        precision: EMBEDDING_STORAGE_PRECISION the index serves
+        dimensions: Stored vector dimensions, required for quantized indexes
+        rebuild: Rebuild even if the index already matches the plan
+        dry_run: Only report what would be done
+        timeout: Seconds allowed for the index build
+
+    Returns:
+        Report with the row count, current and planned index and actions
+
+    Raises:
+        ValueError: For an unknown precision, or a quantized one without
+            dimensions
+    """
+    if precision not in VECTOR_INDEX_LAYOUTS:
+        raise ValueError(f"Unknown embedding storage precision: {precision}")
+    default_index, expression, opclass = VECTOR_INDEX_LAYOUTS[precision]
+    if "{dims}" in expression and not dimensions:
+        raise ValueError(f"Dimensions are required for a {precision} index")
+    index = index or default_index
+    expression = expression.format(column=_quote(column), dims=dimensions)
+
+    started = time.perf_counter()
+    rows = await connection.fetchval(f"SELECT count(*) FROM {_quote(table)}")
+    plan = plan_hnsw_parameters(rows)
+    current = await describe_index(connection, index)
+
+    matches_plan = (
+        current is not None
+        and current["valid"]
+        and current["method"] == "hnsw"
+        and current["options"] == plan.options
+    )
+    build = rebuild or not matches_plan
+
+    report = {
+        "table": table,
+        "index": index,
+        "precision": precision,
+        "rows": rows,
+        "current": current,
+        "planned": {"method": "hnsw", **plan.options},
+        "recommended_ef_search": plan.ef_search,
+        "rebuilt": False,
+        "analyzed": False,
+        "dry_run": dry_run,
+    }
+    if dry_run:
+        report["would_rebuild"] = build
+        return report
+
+    if build:
+        staging = f"{index}_rebuild"
+        # A failed concurrent build leaves an invalid index behind
+        await connection.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(staging)}")
+        await connection.execute(
+            f"CREATE INDEX CONCURRENTLY {_quote(staging)} ON {_quote(table)} "
+            f"USING hnsw ({expression} {opclass}) "
+            f"WITH (m = {plan.m}, ef_construction = {plan.ef_construction})",
+            timeout=timeout,
+        )
+        if current is not None:
+            await connection.execute(f"DROP INDEX CONCURRENTLY {_quote(index)}")
+        await connection.execute(
+            f"ALTER INDEX {_quote(staging)} RENAME TO {_quote(index)}"
+        )
+        report["rebuilt"] = True
+        logger.info(
+            f"Built {precision} HNSW index {index} on {table} "
+            f"(m={plan.m}, ef_construction={plan.ef_construction}, {rows} rows)"
+        )
+
+    await connection.execute(f"ANALYZE {_quote(table)}", timeout=timeout)
+    report["analyzed"] = True
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
@@ -50,6 +50,25 @@ def get_retriever() -> ResearchRetriever:
     return _retriever_instance
 
 
+async def close_retriever() -> None:
+    """
+    Close the global retriever instance, if one was created.
+
+    Writes the cache hits its storage still buffers and closes its
+    connection pool. Call before the event loop that used it ends; the
+    next get_retriever() creates a new instance.
+    """
+    global _retriever_instance
+    retriever, _retriever_instance = _retriever_instance, None
+    if retriever is None:
+        return
+
+    try:
+        await retriever.cleanup()
+    except Exception as e:
+        logger.warning(f"Failed to close RAG retriever: {e}")
+
+
 def get_enhanced_storage() -> Optional[EnhancedVectorStorage]:
     """Get or create the global enhanced storage instance."""
     global _enhanced_storage_instance
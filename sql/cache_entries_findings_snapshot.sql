@@ -0,0 +1,29 @@
+-- Findings snapshots for cache entries
+-- Stores each cache entry's complete ResearchFindings as one compressed,
+-- versioned value (rag/findings_snapshot.py). Exact cache hits decode it
+-- instead of fetching and re-validating every chunk.
+-- Safe to run more than once.
+
+-- Step 1: Snapshot column
+-- Large values are stored out of line (TOAST), so lookups that only read
+-- other columns are not slowed down. The data is already compressed, so
+-- PostgreSQL is told not to try again.
+ALTER TABLE cache_entries
+    ADD COLUMN IF NOT EXISTS findings_snapshot BYTEA;
+
+ALTER TABLE cache_entries
+    ALTER COLUMN findings_snapshot SET STORAGE EXTERNAL;
+
+-- Existing entries keep working without a snapshot: their hits are rebuilt
+-- from chunks, and they get a snapshot the next time their keyword is
+-- researched.
+
+-- Check coverage
+SELECT
+    count(*) AS cache_entries,
+    count(findings_snapshot) AS with_snapshot,
+    COALESCE(avg(octet_length(findings_snapshot)), 0)::int AS avg_snapshot_bytes
+FROM cache_entries;
+
+-- Rolling back
+-- ALTER TABLE cache_entries DROP COLUMN IF EXISTS findings_snapshot;
@@ -0,0 +1,43 @@
+-- Topic embeddings for semantic cache matching
+-- Adds one embedding per cache entry so a semantic cache lookup is a single
+-- nearest-neighbour search over cached topics instead of over every chunk.
+-- Safe to run more than once.
+--
+-- If you changed EMBEDDING_DIMENSIONS (research_chunks_compact_embeddings.sql),
+-- replace 1536 below with the same value.
+
+-- Step 1: Topic table
+-- Rows are removed together with their cache entry
+CREATE TABLE IF NOT EXISTS cache_topics (
+    id TEXT PRIMARY KEY REFERENCES cache_entries (id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    embedding vector(1536) NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Step 2: Backfill existing cache entries
+-- New entries get the keyword embedding blended with their chunks' centroid
+-- when research is stored. Existing entries start from the centroid alone,
+-- which needs no embedding API calls; they are upgraded the next time
+-- their keyword is researched.
+INSERT INTO cache_topics (id, keyword, embedding)
+SELECT e.id, e.keyword, avg(c.embedding)
+FROM cache_entries AS e
+JOIN research_chunks AS c ON c.id = ANY(e.chunk_ids)
+GROUP BY e.id, e.keyword
+ON CONFLICT (id) DO NOTHING;
+
+-- Step 3: Index for the lookup (cosine distance, like idx_chunks_embedding)
+CREATE INDEX IF NOT EXISTS idx_cache_topics_embedding
+    ON cache_topics
+    USING hnsw (embedding vector_cosine_ops);
+
+ANALYZE cache_topics;
+
+-- Check coverage: cache entries without a topic are only found by exact match
+SELECT
+    (SELECT count(*) FROM cache_entries) AS cache_entries,
+    (SELECT count(*) FROM cache_topics) AS cache_topics;
+
+-- Rolling back
+-- DROP TABLE IF EXISTS cache_topics;
@@ -0,0 +1,98 @@
+-- Compact embedding storage for research_chunks
+-- Shrinks vectors (fewer dimensions) and/or searches them through a
+-- half-precision or binary quantized index.
+-- Requires pgvector >= 0.7.0 (halfvec, bit quantization, subvector, l2_normalize)
+--
+-- Pick the steps that match your .env:
+--   EMBEDDING_DIMENSIONS=512            -> Step 1
+--   EMBEDDING_STORAGE_PRECISION=float16 -> Step 2 (optional) and Step 3a
+--   EMBEDDING_STORAGE_PRECISION=binary  -> Step 3b
+-- Steps 2 and 3 are commented out; uncomment the ones you need (or build
+-- the Step 3 index with `seo-content cache optimize`, which follows
+-- EMBEDDING_STORAGE_PRECISION). Skip Step 1 when keeping 1536 dimensions.
+-- Replace 512 below with your EMBEDDING_DIMENSIONS value.
+
+-- Step 1: Reduce dimensions of existing rows in place
+-- text-embedding-3 vectors stay valid when truncated and re-normalized, so
+-- existing rows do not need to be re-embedded. Rows produced by
+-- text-embedding-ada-002 cannot be shortened and must be re-embedded instead.
+DROP INDEX IF EXISTS idx_chunks_embedding;
+
+ALTER TABLE research_chunks
+    ALTER COLUMN embedding TYPE vector(512)
+    USING l2_normalize(subvector(embedding, 1, 512))::vector(512);
+
+-- Topic embeddings (sql/cache_topics.sql) must match the new dimensions;
+-- skipped where that script was not run
+DO $$
+BEGIN
+    IF to_regclass('cache_topics') IS NOT NULL THEN
+        DROP INDEX IF EXISTS idx_cache_topics_embedding;
+
+        ALTER TABLE cache_topics
+            ALTER COLUMN embedding TYPE vector(512)
+            USING l2_normalize(subvector(embedding, 1, 512))::vector(512);
+
+        CREATE INDEX IF NOT EXISTS idx_cache_topics_embedding
+            ON cache_topics
+            USING hnsw (embedding vector_cosine_ops);
+    END IF;
+END $$;
+
+-- Content chunks of research sources (supabase_phase3_migration.sql) are
+-- embedded with the same settings; skipped where that table does not exist
+DO $$
+BEGIN
+    IF to_regclass('content_chunks') IS NOT NULL THEN
+        DROP INDEX IF EXISTS idx_chunks_embedding_cosine;
+
+        ALTER TABLE content_chunks
+            ALTER COLUMN chunk_embedding TYPE vector(512)
+            USING l2_normalize(subvector(chunk_embedding, 1, 512))::vector(512);
+
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_cosine
+            ON content_chunks
+            USING hnsw (chunk_embedding vector_cosine_ops);
+    END IF;
+END $$;
+
+-- Step 2 (optional): Store vectors at half precision
+-- Halves the table's vector storage. Re-ranking then uses the half-precision
+-- values, which is accurate enough for cosine similarity in practice.
+-- ALTER TABLE research_chunks
+--     ALTER COLUMN embedding TYPE halfvec(512)
+--     USING embedding::halfvec(512);
+
+-- Step 3a: Half-precision index (EMBEDDING_STORAGE_PRECISION=float16)
+-- The expression must match the query in rag/storage.py exactly
+-- CREATE INDEX IF NOT EXISTS idx_chunks_embedding_halfvec
+--     ON research_chunks
+--     USING hnsw ((embedding::halfvec(512)) halfvec_cosine_ops);
+
+-- Step 3b: Binary quantized index (EMBEDDING_STORAGE_PRECISION=binary)
+-- 1 bit per dimension; candidates are re-ranked at full precision, so keep
+-- EMBEDDING_RERANK_FACTOR at 4 or higher
+-- CREATE INDEX IF NOT EXISTS idx_chunks_embedding_binary
+--     ON research_chunks
+--     USING hnsw ((binary_quantize(embedding)::bit(512)) bit_hamming_ops);
+
+-- Rolling back to full precision search (EMBEDDING_STORAGE_PRECISION=float32)
+-- DROP INDEX IF EXISTS idx_chunks_embedding_halfvec;
+-- DROP INDEX IF EXISTS idx_chunks_embedding_binary;
+-- CREATE INDEX IF NOT EXISTS idx_chunks_embedding
+--     ON research_chunks
+--     USING ivfflat (embedding vector_cosine_ops)
+--     WITH (lists = 100);
+
+-- Refresh planner statistics after rewriting the table
+ANALYZE research_chunks;
+
+-- Compare table and index sizes before/after
+SELECT
+    indexrelname AS index_name,
+    pg_size_pretty(pg_relation_size(indexrelid)) AS index_size
+FROM pg_stat_user_indexes
+WHERE relname = 'research_chunks'
+ORDER BY pg_relation_size(indexrelid) DESC;
+
+SELECT pg_size_pretty(pg_total_relation_size('research_chunks')) AS total_size;
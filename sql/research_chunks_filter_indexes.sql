@@ -0,0 +1,47 @@
+-- Metadata filter indexes for research_chunks
+-- Lets filtered similarity search (VectorStorage.search_similar_chunks with
+-- a ChunkFilter) prune rows in the database instead of in Python.
+-- The expressions must match rag/chunk_filter.py exactly, otherwise
+-- PostgreSQL will not use the indexes.
+--
+-- Safe to run on a live database: every index is built CONCURRENTLY.
+-- Run the statements one at a time (CONCURRENTLY cannot run inside a
+-- transaction block).
+
+-- Step 1: Indexes for the filter predicates
+-- Chunk type, e.g. 'academic_source', 'statistics', 'main_findings'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_source_type
+    ON research_chunks ((metadata->>'source_type'));
+
+-- Source credibility (only academic_source chunks carry a score)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_credibility
+    ON research_chunks (((metadata->>'credibility_score')::real));
+
+-- Arbitrary metadata containment: ChunkFilter(metadata={...})
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_metadata
+    ON research_chunks USING gin (metadata jsonb_path_ops);
+
+-- Keyword and source_id filters use idx_chunks_keyword and
+-- idx_chunks_source from setup_rag_tables.sql.
+
+-- Step 2 (optional): Partial vector index for academic sources
+-- A search filtered to source_types=['academic_source'] walks this smaller
+-- graph, which contains only matching rows, so no result is lost to the
+-- filter. Worth it once academic chunks are a small share of the table.
+-- Keep m/ef_construction in line with idx_chunks_embedding.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_embedding_academic
+    ON research_chunks
+    USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE (metadata->>'source_type') = 'academic_source';
+
+-- Step 3: Refresh planner statistics
+-- ANALYZE also collects statistics for the expressions above, which the
+-- planner uses to choose between the vector index and an exact scan
+ANALYZE research_chunks;
+
+-- Rolling back
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_source_type;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_credibility;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_metadata;
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_academic;
@@ -5,6 +5,7 @@
 CREATE EXTENSION IF NOT EXISTS vector;
 
 -- Drop existing tables if needed (be careful in production!)
+-- DROP TABLE IF EXISTS cache_topics CASCADE;
 -- DROP TABLE IF EXISTS cache_entries CASCADE;
 -- DROP TABLE IF EXISTS research_chunks CASCADE;
 
@@ -32,15 +33,33 @@ CREATE TABLE IF NOT EXISTS cache_entries (
     hit_count INTEGER DEFAULT 0,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     last_accessed TIMESTAMPTZ DEFAULT NOW(),
-    expires_at TIMESTAMPTZ NOT NULL
+    expires_at TIMESTAMPTZ NOT NULL,
+    -- Serialized ResearchFindings that exact hits are served from
+    -- (see cache_entries_findings_snapshot.sql)
+    findings_snapshot BYTEA
+);
+
+-- Snapshots are compressed already; store them out of line as they are
+ALTER TABLE cache_entries ALTER COLUMN findings_snapshot SET STORAGE EXTERNAL;
+
+-- One topic embedding per cache entry for semantic cache matching
+-- (keyword embedding blended with the centroid of the entry's chunks)
+CREATE TABLE IF NOT EXISTS cache_topics (
+    id TEXT PRIMARY KEY REFERENCES cache_entries (id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    embedding vector(1536) NOT NULL,  -- Same dimensions as research_chunks
+    updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 -- Create indexes for better performance
--- Vector similarity search index (using IVFFlat for balance of speed/accuracy)
+-- Vector similarity search index (HNSW: good recall without retraining as
+-- the table grows). These are pgvector's defaults, suited to tables under
+-- 100k rows; `seo-content cache optimize` rebuilds it with parameters
+-- sized for the current row count
 CREATE INDEX IF NOT EXISTS idx_chunks_embedding 
     ON research_chunks 
-    USING ivfflat (embedding vector_cosine_ops)
-    WITH (lists = 100);  -- Adjust 'lists' based on your data size
+    USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
 
 -- Text search indexes
 CREATE INDEX IF NOT EXISTS idx_chunks_keyword 
@@ -52,6 +71,17 @@ CREATE INDEX IF NOT EXISTS idx_chunks_source
 CREATE INDEX IF NOT EXISTS idx_chunks_created 
     ON research_chunks (created_at DESC);
 
+-- Metadata filter indexes (see research_chunks_filter_indexes.sql)
+-- The expressions must match rag/chunk_filter.py exactly
+CREATE INDEX IF NOT EXISTS idx_chunks_source_type
+    ON research_chunks ((metadata->>'source_type'));
+
+CREATE INDEX IF NOT EXISTS idx_chunks_credibility
+    ON research_chunks (((metadata->>'credibility_score')::real));
+
+CREATE INDEX IF NOT EXISTS idx_chunks_metadata
+    ON research_chunks USING gin (metadata jsonb_path_ops);
+
 -- Cache lookup indexes
 CREATE INDEX IF NOT EXISTS idx_cache_keyword 
     ON cache_entries (keyword_normalized);
@@ -62,6 +92,11 @@ CREATE INDEX IF NOT EXISTS idx_cache_expires
 CREATE INDEX IF NOT EXISTS idx_cache_hits 
     ON cache_entries (hit_count DESC);
 
+-- Topic lookup index (see cache_topics.sql)
+CREATE INDEX IF NOT EXISTS idx_cache_topics_embedding
+    ON cache_topics
+    USING hnsw (embedding vector_cosine_ops);
+
 -- Create updated_at trigger for research_chunks
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -116,6 +151,12 @@ BEGIN
     ELSE
         RAISE NOTICE 'ERROR: cache_entries table does not exist';
     END IF;
+
+    IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'cache_topics') THEN
+        RAISE NOTICE 'SUCCESS: cache_topics table exists';
+    ELSE
+        RAISE NOTICE 'ERROR: cache_topics table does not exist';
+    END IF;
 END $$;
 
 -- Sample queries to test the setup
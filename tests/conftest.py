@@ -208,6 +208,16 @@ def mock_agent_result():
     return mock_result
 
 
+# Isolation Fixtures
+@pytest.fixture(autouse=True)
+def disable_persistent_embedding_cache(monkeypatch):
+    """Keep tests from reading or writing the on-disk embedding cache."""
+    monkeypatch.setattr(
+        "rag.embeddings.EmbeddingGenerator._open_persistent_cache",
+        lambda self: None,
+    )
+
+
 # Async Test Helpers
 @pytest.fixture
 def event_loop():
@@ -19,6 +19,8 @@ from cli.cache_handlers import (
     handle_cache_stats,
     handle_cache_clear,
     handle_cache_warm,
+    handle_cache_import,
+    handle_cache_optimize,
     handle_export_cache_metrics,
 )
 
@@ -286,6 +288,7 @@ class TestHandleCacheStats:
             "exact_hits": 50,
             "semantic_hits": 25,
             "cache_misses": 25,
+            "in_process_hits": 40,
             "hit_rate": 0.75,
             "avg_retrieval_time": 0.125,
         }
@@ -314,6 +317,10 @@ class TestHandleCacheStats:
         assert any(
             "Hit rate" in str(call) and "75.0%" in str(call) for call in console_calls
         )
+        assert any(
+            "In-process hits" in str(call) and "40" in str(call)
+            for call in console_calls
+        )
         assert any(
             "Estimated savings" in str(call) and "$3.00" in str(call)
             for call in console_calls
@@ -388,18 +395,24 @@ class TestHandleCacheClear:
             with patch("cli.cache_handlers.VectorStorage", return_value=mock_storage):
                 with patch("cli.cache_handlers.console", mock_console):
                     with patch("click.confirm", return_value=True):  # User confirms
-                        await handle_cache_clear(
-                            older_than=None,
-                            keyword="old topic",
-                            force=False,
-                            dry_run=False,
-                        )
+                        with patch(
+                            "rag.retriever.ResearchRetriever.invalidate_findings_caches"
+                        ) as mock_invalidate:
+                            await handle_cache_clear(
+                                older_than=None,
+                                keyword="old topic",
+                                force=False,
+                                dry_run=False,
+                            )
 
         # Verify cleanup was called with correct parameters
         mock_storage.cleanup_cache.assert_called_once_with(
             older_than_days=None, keyword="old topic"
         )
 
+        # In-process findings are dropped as well
+        mock_invalidate.assert_called_once_with()
+
         # Verify success message
         console_calls = mock_console.print.call_args_list
         assert any(
@@ -644,6 +657,183 @@ class TestHandleCacheWarm:
             assert exc_info.value.exit_code == 1
 
 
+class TestHandleCacheImport:
+    """Test the handle_cache_import function."""
+
+    @pytest.fixture
+    def import_file(self, tmp_path):
+        """Write a JSON Lines file with two keywords and two unusable lines."""
+        sentence = "Insulin sensitivity improved in the trial. "
+        lines = [
+            json.dumps(
+                {"text": sentence * 3, "source_id": "doc1", "keyword": "insulin"}
+            ),
+            '{"text": "truncated',
+            json.dumps({"content": sentence * 3, "source_id": "doc2"}),
+            json.dumps({"text": "", "keyword": "empty"}),
+        ]
+        path = tmp_path / "documents.jsonl"
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    @pytest.fixture
+    def mock_rag_config(self):
+        """Create a config with small chunks and inline ingestion."""
+        config = MagicMock()
+        config.chunk_size = 1000
+        config.chunk_overlap = 100
+        config.min_chunk_size = 10
+        config.ingest_workers = 1
+        config.ingest_parallel_min_chars = 10**9
+        return config
+
+    @pytest.mark.asyncio
+    async def test_import_groups_chunks_by_keyword(self, import_file, mock_rag_config):
+        """Test documents are chunked, embedded and stored per keyword."""
+        mock_storage = AsyncMock()
+        mock_storage.__aenter__.return_value = mock_storage
+        mock_storage.__aexit__.return_value = None
+        mock_storage.store_research_chunks.side_effect = (
+            lambda chunks, embeddings, keyword: [
+                f"{keyword}_{c.chunk_index}" for c in chunks
+            ]
+        )
+
+        mock_embeddings = AsyncMock()
+        mock_embeddings.generate_embeddings.side_effect = lambda texts: [
+            MagicMock() for _ in texts
+        ]
+        mock_console = MagicMock()
+
+        with patch("cli.cache_handlers.get_rag_config", return_value=mock_rag_config):
+            with patch("cli.cache_handlers.VectorStorage", return_value=mock_storage):
+                with patch(
+                    "rag.embeddings.EmbeddingGenerator", return_value=mock_embeddings
+                ):
+                    with patch("cli.cache_handlers.console", mock_console):
+                        await handle_cache_import(
+                            import_file, keyword="default", batch_size=100
+                        )
+
+        # One embedding batch, stored once per keyword run
+        mock_embeddings.generate_embeddings.assert_called_once()
+        keywords = [
+            call.args[2] for call in mock_storage.store_research_chunks.call_args_list
+        ]
+        assert keywords == ["insulin", "default"]
+        stored_sources = [
+            chunk.source_id
+            for call in mock_storage.store_research_chunks.call_args_list
+            for chunk in call.args[0]
+        ]
+        assert stored_sources == ["doc1", "doc2"]
+
+        console_calls = [str(call) for call in mock_console.print.call_args_list]
+        assert any("Imported 2 chunks from 2 documents" in c for c in console_calls)
+        # The malformed line is skipped without stopping the import
+        assert any("Skipped 2 lines" in c for c in console_calls)
+
+    @pytest.mark.asyncio
+    async def test_import_failure_exits(self, import_file, mock_rag_config):
+        """Test storage errors are reported and exit with code 1."""
+        mock_storage = AsyncMock()
+        mock_storage.__aenter__.side_effect = Exception("Database unavailable")
+
+        with patch("cli.cache_handlers.get_rag_config", return_value=mock_rag_config):
+            with patch("cli.cache_handlers.VectorStorage", return_value=mock_storage):
+                with patch("rag.embeddings.EmbeddingGenerator"):
+                    with patch("cli.cache_handlers.console"):
+                        with pytest.raises(Exit) as exc_info:
+                            await handle_cache_import(
+                                import_file, keyword=None, batch_size=100
+                            )
+
+        assert exc_info.value.exit_code == 1
+
+
+class TestHandleCacheOptimize:
+    """Test the handle_cache_optimize function."""
+
+    @staticmethod
+    def report(**overrides):
+        """Build an optimize report for an IVFFlat index being replaced."""
+        report = {
+            "rows": 250_000,
+            "current": {
+                "method": "ivfflat",
+                "options": {"lists": "100"},
+                "valid": True,
+            },
+            "planned": {"method": "hnsw", "m": "16", "ef_construction": "128"},
+            "recommended_ef_search": 100,
+            "configured_ef_search": 40,
+            "rebuilt": True,
+            "analyzed": True,
+            "dry_run": False,
+            "seconds": 12.5,
+        }
+        report.update(overrides)
+        return report
+
+    @pytest.mark.asyncio
+    async def test_optimize_rebuilds_index(self):
+        """Test the rebuild is reported with the ef_search recommendation."""
+        mock_storage = AsyncMock()
+        mock_storage.__aenter__.return_value = mock_storage
+        mock_storage.__aexit__.return_value = None
+        mock_storage.optimize_indexes.return_value = self.report()
+        mock_console = MagicMock()
+
+        with patch("cli.cache_handlers.get_rag_config"):
+            with patch("cli.cache_handlers.VectorStorage", return_value=mock_storage):
+                with patch("cli.cache_handlers.console", mock_console):
+                    await handle_cache_optimize(rebuild=False, dry_run=False)
+
+        mock_storage.optimize_indexes.assert_called_once_with(
+            rebuild=False, dry_run=False
+        )
+        console_calls = [str(call) for call in mock_console.print.call_args_list]
+        assert any("250,000" in c for c in console_calls)
+        assert any("Rebuilt index" in c for c in console_calls)
+        assert any("VECTOR_SEARCH_EF_SEARCH=100" in c for c in console_calls)
+
+    @pytest.mark.asyncio
+    async def test_optimize_dry_run(self):
+        """Test a dry run only reports the planned change."""
+        mock_storage = AsyncMock()
+        mock_storage.__aenter__.return_value = mock_storage
+        mock_storage.__aexit__.return_value = None
+        mock_storage.optimize_indexes.return_value = self.report(
+            current=None, rebuilt=False, dry_run=True, would_rebuild=True
+        )
+        mock_console = MagicMock()
+
+        with patch("cli.cache_handlers.get_rag_config"):
+            with patch("cli.cache_handlers.VectorStorage", return_value=mock_storage):
+                with patch("cli.cache_handlers.console", mock_console):
+                    await handle_cache_optimize(rebuild=False, dry_run=True)
+
+        console_calls = [str(call) for call in mock_console.print.call_args_list]
+        assert any("would rebuild" in c for c in console_calls)
+        assert not any("✅" in c for c in console_calls)
+
+    @pytest.mark.asyncio
+    async def test_optimize_failure_exits(self):
+        """Test database errors exit with code 1."""
+        mock_storage = AsyncMock()
+        mock_storage.__aenter__.return_value = mock_storage
+        mock_storage.__aexit__.return_value = None
+        mock_storage.optimize_indexes.side_effect = Exception("permission denied")
+
+        with patch("cli.cache_handlers.get_rag_config"):
+            with patch("cli.cache_handlers.VectorStorage", return_value=mock_storage):
+                with patch("cli.cache_handlers.console"):
+                    with pytest.raises(Exit) as exc_info:
+                        await handle_cache_optimize(rebuild=True, dry_run=False)
+
+        assert exc_info.value.exit_code == 1
+
+
 class TestHandleExportCacheMetrics:
     """Test the handle_export_cache_metrics function."""
 
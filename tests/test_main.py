@@ -17,7 +17,7 @@ from click.testing import CliRunner
 from config import Config
 
 # Import CLI components to test
-from main import _run_generation, cli, config, generate, test
+from main import _closing_retriever, _run_generation, cli, config, generate, test
 from models import AcademicSource, ArticleOutput, ArticleSection, ResearchFindings
 from tests.helpers import MockAgentRunResult, create_valid_article_output
 
@@ -288,6 +288,18 @@ class TestTestCommand:
 class TestRunGeneration:
     """Test cases for the internal _run_generation function."""
 
+    @pytest.mark.asyncio
+    async def test_closing_retriever(self):
+        """Test the retriever is closed after the command, even on errors."""
+
+        async def failing_command():
+            raise ValueError("workflow failed")
+
+        with patch("main.close_retriever", new_callable=AsyncMock) as mock_close:
+            with pytest.raises(ValueError):
+                await _closing_retriever(failing_command())
+            mock_close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_run_generation_full_workflow(self, mock_config):
         """Test full workflow execution."""
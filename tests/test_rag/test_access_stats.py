@@ -0,0 +1,57 @@
+"""
+Tests for the write-behind access statistics buffer.
+
+Covers hit aggregation per key, draining and restoring after a failed
+flush, and the arrays passed to the batched update.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from rag.access_stats import AccessStatsBuffer, flush_parameters
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class TestAccessStatsBuffer:
+    """Test AccessStatsBuffer."""
+
+    def test_aggregates_hits_per_key(self):
+        """Test hits are counted per key with the latest access time."""
+        buffer = AccessStatsBuffer()
+        buffer.record("a", NOW + timedelta(seconds=2))
+        buffer.record("a", NOW)
+        buffer.record("b", NOW)
+
+        assert len(buffer) == 2
+        assert buffer.drain() == {
+            "a": (2, NOW + timedelta(seconds=2)),
+            "b": (1, NOW),
+        }
+
+    def test_drain_empties_buffer(self):
+        """Test draining hands over the hits and starts a new batch."""
+        buffer = AccessStatsBuffer()
+        buffer.record("a")
+
+        assert buffer.drain()["a"][0] == 1
+        assert len(buffer) == 0
+        assert buffer.drain() == {}
+
+    def test_restore_merges_with_new_hits(self):
+        """Test restored hits add to hits recorded since the drain."""
+        buffer = AccessStatsBuffer()
+        buffer.record("a", NOW)
+        drained = buffer.drain()
+        buffer.record("a", NOW + timedelta(seconds=1))
+
+        buffer.restore(drained)
+
+        assert buffer.drain() == {"a": (2, NOW + timedelta(seconds=1))}
+
+    def test_flush_parameters(self):
+        """Test drained stats become aligned key, hit and time arrays."""
+        keys, hits, accessed = flush_parameters({"a": (3, NOW), "b": (1, NOW)})
+
+        assert keys == ["a", "b"]
+        assert hits == [3, 1]
+        assert accessed == [NOW, NOW]
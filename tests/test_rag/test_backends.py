@@ -0,0 +1,117 @@
+"""
+Tests for the embedding backends.
+
+Covers the OpenAI backend's request and response handling, and the
+determinism and similarity behaviour of the local hashing backend.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from rag.backends import (
+    HashingEmbeddingBackend,
+    OpenAIEmbeddingBackend,
+    create_backend,
+)
+
+
+class TestOpenAIEmbeddingBackend:
+    """Test the OpenAI backend."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a mock AsyncOpenAI client returning vectors out of order."""
+        client = MagicMock()
+
+        def create_response(model, input, **kwargs):
+            response = MagicMock()
+            response.data = [
+                MagicMock(embedding=[float(i)], index=i)
+                for i in reversed(range(len(input)))
+            ]
+            response.usage = MagicMock(prompt_tokens=11)
+            return response
+
+        client.embeddings.create = AsyncMock(side_effect=create_response)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_embed_maps_indexes_and_usage(self, client):
+        """Test vectors come back in input order with billed tokens."""
+        backend = OpenAIEmbeddingBackend(client, "text-embedding-3-small", 1536)
+
+        batch = await backend.embed(["a", "b", "c"])
+
+        assert batch.vectors == [[0.0], [1.0], [2.0]]
+        assert batch.tokens == 11
+        assert "dimensions" not in client.embeddings.create.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_embed_requests_reduced_dimensions(self, client):
+        """Test non-native sizes are passed to the API."""
+        backend = OpenAIEmbeddingBackend(client, "text-embedding-3-small", 256)
+
+        await backend.embed(["a"])
+
+        assert client.embeddings.create.call_args.kwargs["dimensions"] == 256
+
+    @pytest.mark.asyncio
+    async def test_embed_rejects_short_response(self, client):
+        """Test a response with missing vectors raises."""
+        client.embeddings.create = AsyncMock(return_value=MagicMock(data=[]))
+        backend = OpenAIEmbeddingBackend(client, "text-embedding-3-small", 1536)
+
+        with pytest.raises(ValueError, match="returned 0 vectors"):
+            await backend.embed(["a"])
+
+
+class TestHashingEmbeddingBackend:
+    """Test the deterministic local backend."""
+
+    def test_vectors_are_deterministic_and_normalized(self):
+        """Test the same text always maps to the same unit vector."""
+        first = HashingEmbeddingBackend(256).embed_text("Blood sugar control")
+        second = HashingEmbeddingBackend(256).embed_text("Blood sugar control")
+
+        assert first.shape == (256,)
+        assert first.dtype == np.float32
+        assert np.array_equal(first, second)
+        assert np.linalg.norm(first) == pytest.approx(1.0)
+
+    def test_related_texts_are_closer(self):
+        """Test shared vocabulary yields higher cosine similarity."""
+        backend = HashingEmbeddingBackend(512)
+        query = backend.embed_text("insulin resistance and blood sugar")
+        related = backend.embed_text("blood sugar levels and insulin")
+        unrelated = backend.embed_text("quarterly marketing budget review")
+
+        assert float(query @ related) > float(query @ unrelated)
+
+    def test_punctuation_only_text_is_not_zero(self):
+        """Test texts without words still get a usable vector."""
+        vector = HashingEmbeddingBackend(64).embed_text("!!!")
+
+        assert np.linalg.norm(vector) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_embed_batch(self):
+        """Test batch embedding returns one vector per input."""
+        backend = HashingEmbeddingBackend(128)
+
+        batch = await backend.embed(["one", "two"])
+
+        assert len(batch.vectors) == 2
+        assert batch.tokens is None
+        assert np.array_equal(batch.vectors[0], backend.embed_text("one"))
+
+    def test_create_backend(self):
+        """Test backends are selected by name."""
+        local = create_backend("local", "text-embedding-3-small", 64)
+        remote = create_backend("openai", "text-embedding-3-small", 64, client="c")
+
+        assert isinstance(local, HashingEmbeddingBackend)
+        assert not local.rate_limited
+        assert isinstance(remote, OpenAIEmbeddingBackend)
+        assert remote.client == "c"
@@ -0,0 +1,70 @@
+"""
+Tests for COPY-based bulk loading.
+
+Covers the staging and merge statements, conflict handling and the
+reporting of stored keys in input order.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+import pytest
+
+from rag.bulk_load import copy_upsert
+
+COLUMNS = ("id", "content", "keyword")
+
+
+@pytest.fixture
+def connection():
+    """Create a mock asyncpg connection with a working transaction."""
+    connection = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock(return_value=None)
+    transaction.__aexit__ = AsyncMock(return_value=None)
+    connection.transaction = MagicMock(return_value=transaction)
+    return connection
+
+
+class TestCopyUpsert:
+    """Test copy_upsert."""
+
+    @pytest.mark.asyncio
+    async def test_copies_into_staging_and_merges(self, connection):
+        """Test rows are copied to a staging table and upserted in one statement."""
+        records = [("a", "first", "kw"), ("b", "second", "kw")]
+        connection.fetch.return_value = [{"id": "b"}, {"id": "a"}]
+
+        stored = await copy_upsert(connection, "research_chunks", COLUMNS, records)
+
+        assert stored == ["a", "b"]
+        create = connection.execute.call_args_list[0].args[0]
+        assert 'CREATE TEMP TABLE "_bulk_research_chunks"' in create
+        assert 'LIKE "research_chunks" INCLUDING DEFAULTS' in create
+        connection.copy_records_to_table.assert_called_once_with(
+            "_bulk_research_chunks", records=records, columns=list(COLUMNS)
+        )
+        merge = connection.fetch.call_args.args[0]
+        assert 'ON CONFLICT ("id") DO UPDATE SET' in merge
+        assert '"content" = EXCLUDED."content"' in merge
+        assert '"id" = EXCLUDED' not in merge
+
+    @pytest.mark.asyncio
+    async def test_insert_only_reports_written_rows(self, connection):
+        """Test skipped conflicts are left out of the stored keys."""
+        first = UUID(int=1)
+        records = [(str(first), "new", "kw"), (str(UUID(int=2)), "existing", "kw")]
+        connection.fetch.return_value = [{"id": first}]
+
+        stored = await copy_upsert(
+            connection, "content_chunks", COLUMNS, records, update=False
+        )
+
+        assert stored == [str(first)]
+        assert "DO NOTHING" in connection.fetch.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_empty_load_skips_database(self, connection):
+        """Test nothing is sent when there are no records."""
+        assert await copy_upsert(connection, "research_chunks", COLUMNS, []) == []
+        connection.transaction.assert_not_called()
@@ -0,0 +1,30 @@
+"""
+Tests for cache topic embeddings.
+
+Covers how keyword embeddings and chunk centroids are blended.
+"""
+
+import numpy as np
+import pytest
+
+from rag.cache_topics import topic_embedding
+
+
+class TestTopicEmbedding:
+    """Test topic_embedding."""
+
+    def test_parts_are_weighted_equally(self):
+        """Test a short centroid counts as much as the keyword embedding."""
+        topic = topic_embedding(np.array([1.0, 0.0]), np.array([0.0, 0.2]))
+
+        np.testing.assert_allclose(topic, [2**-0.5, 2**-0.5], rtol=1e-6)
+        assert topic.dtype == np.float32
+
+    def test_without_centroid(self):
+        """Test entries without chunks use the keyword embedding alone."""
+        np.testing.assert_allclose(topic_embedding([3.0, 4.0]), [0.6, 0.8])
+
+    def test_dimension_mismatch(self):
+        """Test a centroid of other dimensions is rejected."""
+        with pytest.raises(ValueError):
+            topic_embedding(np.ones(4), np.ones(3))
@@ -0,0 +1,56 @@
+"""
+Tests for chunk search filters.
+
+Covers the SQL predicates and argument numbering produced by ChunkFilter.
+"""
+
+import json
+
+from rag.chunk_filter import ChunkFilter, filter_clause
+
+
+class TestChunkFilter:
+    """Test ChunkFilter and filter_clause."""
+
+    def test_all_fields_become_numbered_predicates(self):
+        """Test every set field adds one predicate with its own placeholder."""
+        filters = ChunkFilter(
+            keywords=["keto"],
+            source_types=("academic_source", "statistics"),
+            source_ids=["src-1"],
+            min_credibility=0.7,
+            metadata={"domain": ".edu"},
+        )
+
+        conditions, args = filters.to_sql(4)
+
+        assert conditions.split(" AND ") == [
+            "keyword = ANY($4::text[])",
+            "(metadata->>'source_type') = ANY($5::text[])",
+            "source_id = ANY($6::text[])",
+            "((metadata->>'credibility_score')::real) >= $7::real",
+            "metadata @> $8::jsonb",
+        ]
+        assert args == [
+            ["keto"],
+            ["academic_source", "statistics"],
+            ["src-1"],
+            0.7,
+            json.dumps({"domain": ".edu"}),
+        ]
+
+    def test_unset_fields_are_skipped(self):
+        """Test only set fields are rendered and numbering stays contiguous."""
+        conditions, args = ChunkFilter(min_credibility=0.0).to_sql(5)
+
+        assert conditions == "((metadata->>'credibility_score')::real) >= $5::real"
+        assert args == [0.0]
+
+    def test_filter_clause(self):
+        """Test no filter or an empty filter adds no WHERE clause."""
+        assert filter_clause(None, 4) == ("", [])
+        assert filter_clause(ChunkFilter(), 4) == ("", [])
+
+        where, args = filter_clause(ChunkFilter(keywords=["keto"]), 4)
+        assert where == "WHERE keyword = ANY($4::text[])"
+        assert args == [["keto"]]
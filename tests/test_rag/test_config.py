@@ -182,6 +182,56 @@ class TestRAGConfig:
             error = exc_info.value.errors()[0]
             assert "Invalid embedding model" in str(error)
 
+    def test_embedding_dimensions_validation(self):
+        """Test shortened vectors are only allowed for text-embedding-3 models."""
+        base_env = {
+            "SUPABASE_URL": "https://test.supabase.co",
+            "SUPABASE_SERVICE_KEY": "test-key",
+        }
+
+        with patch.dict(
+            "os.environ",
+            {**base_env, "EMBEDDING_DIMENSIONS": "512"},
+            clear=True,
+        ):
+            assert RAGConfig().embedding_dimensions == 512
+
+        invalid = [
+            {"EMBEDDING_DIMENSIONS": "2048"},
+            {
+                "EMBEDDING_MODEL_NAME": "text-embedding-ada-002",
+                "EMBEDDING_DIMENSIONS": "512",
+            },
+        ]
+        for overrides in invalid:
+            with patch.dict("os.environ", {**base_env, **overrides}, clear=True):
+                with pytest.raises(ValidationError):
+                    RAGConfig()
+
+    def test_embedding_storage_precision_validation(self):
+        """Test storage precision accepts only supported pgvector types."""
+        base_env = {
+            "SUPABASE_URL": "https://test.supabase.co",
+            "SUPABASE_SERVICE_KEY": "test-key",
+        }
+
+        for precision in ["float32", "float16", "binary"]:
+            with patch.dict(
+                "os.environ",
+                {**base_env, "EMBEDDING_STORAGE_PRECISION": precision},
+                clear=True,
+            ):
+                assert RAGConfig().embedding_storage_precision == precision
+
+        with patch.dict(
+            "os.environ",
+            {**base_env, "EMBEDDING_STORAGE_PRECISION": "int8"},
+            clear=True,
+        ):
+            with pytest.raises(ValidationError) as exc_info:
+                RAGConfig()
+            assert "Invalid embedding storage precision" in str(exc_info.value)
+
     def test_numeric_constraints(self):
         """Test numeric field constraints."""
         # Test embedding batch size constraints
@@ -0,0 +1,158 @@
+"""
+Tests for near-duplicate chunk detection.
+
+Covers SimHash behaviour on edited copies, the banded SQLite index,
+mapping of stored IDs back onto deduplicated inputs and dropping matches
+to chunks that were deleted from the database.
+"""
+
+import pytest
+
+from rag.dedup import (
+    NearDuplicateIndex,
+    hamming_distance,
+    plan_stored_duplicates,
+    simhash,
+)
+
+PARAGRAPH = (
+    "Regular aerobic exercise improves insulin sensitivity in adults with "
+    "type 2 diabetes, and a twelve week walking program lowered fasting "
+    "glucose by an average of eighteen milligrams per deciliter compared "
+    "with the control group in the randomized trial."
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Create an index in a temporary directory."""
+    index = NearDuplicateIndex(str(tmp_path / "dedup.sqlite3"), max_distance=3)
+    yield index
+    index.close()
+
+
+class TestSimHash:
+    """Test fingerprinting."""
+
+    def test_near_copies_are_close(self):
+        """Test a lightly edited copy stays within a few bits."""
+        edited = PARAGRAPH.replace("randomized trial.", "randomized trial!!")
+
+        assert simhash(PARAGRAPH) == simhash(PARAGRAPH.upper())
+        assert hamming_distance(simhash(PARAGRAPH), simhash(edited)) <= 3
+
+    def test_different_texts_are_far(self):
+        """Test unrelated texts differ in many bits."""
+        other = (
+            "Quarterly marketing budgets shifted toward video campaigns as "
+            "advertisers chased younger audiences on social platforms."
+        )
+
+        assert hamming_distance(simhash(PARAGRAPH), simhash(other)) > 10
+
+    def test_fingerprint_is_unsigned_64_bit(self):
+        """Test fingerprints fit in 64 bits, including very short texts."""
+        for text in (PARAGRAPH, "hi", "!!!"):
+            assert 0 <= simhash(text) < 1 << 64
+
+
+class TestNearDuplicateIndex:
+    """Test the LSH index."""
+
+    def test_plan_marks_stored_near_duplicates(self, index):
+        """Test stored chunks are matched and new chunks are kept."""
+        first = index.plan("research_chunks", [PARAGRAPH])
+        index.add("research_chunks", first, ["chunk-1"], keyword="diabetes")
+
+        plan = index.plan(
+            "research_chunks", [PARAGRAPH.replace("trial.", "trial"), "New text."]
+        )
+
+        assert plan.matches == ["chunk-1", None]
+        assert plan.new_positions == [1]
+        assert plan.resolve_ids(["chunk-2"]) == ["chunk-1", "chunk-2"]
+
+    def test_plan_marks_copies_within_batch(self, index):
+        """Test repeats inside one batch are stored once."""
+        plan = index.plan("research_chunks", [PARAGRAPH, "Other text.", PARAGRAPH])
+
+        assert plan.new_positions == [0, 1]
+        assert plan.copies == [None, None, 0]
+        assert plan.resolve_ids(["a", "b"]) == ["a", "b", "a"]
+
+    def test_namespaces_are_separate(self, index):
+        """Test chunks only match within the same table."""
+        plan = index.plan("research_chunks", [PARAGRAPH])
+        index.add("research_chunks", plan, ["chunk-1"])
+
+        assert index.plan("content_chunks", [PARAGRAPH]).matches == [None]
+
+    def test_index_persists_across_instances(self, index):
+        """Test another process opening the same file sees the entries."""
+        plan = index.plan("research_chunks", [PARAGRAPH])
+        index.add("research_chunks", plan, ["chunk-1"])
+
+        reopened = NearDuplicateIndex(index.path, max_distance=3)
+        try:
+            assert reopened.plan("research_chunks", [PARAGRAPH]).matches == ["chunk-1"]
+        finally:
+            reopened.close()
+
+    def test_forget_deleted_chunks(self, index):
+        """Test entries are dropped alongside their deleted chunks."""
+        plan = index.plan("research_chunks", [PARAGRAPH, "Another paragraph."])
+        index.add("research_chunks", plan, ["chunk-1", "chunk-2"])
+
+        assert index.forget("research_chunks", ["chunk-1", "missing"]) == 1
+        assert index.plan("research_chunks", [PARAGRAPH]).matches == [None]
+        assert len(index) == 1
+
+    def test_restored_chunk_replaces_fingerprint(self, index):
+        """Test storing the same chunk ID again keeps one entry."""
+        for _ in range(2):
+            index.add(
+                "research_chunks",
+                index.plan("research_chunks", ["Fresh content " + PARAGRAPH]),
+                ["chunk-1"],
+            )
+
+        assert len(index) == 1
+        assert index.get_statistics()["indexed_chunks"] == 1
+
+
+class TestPlanStoredDuplicates:
+    """Test matches are checked against the database."""
+
+    @pytest.mark.asyncio
+    async def test_deleted_chunks_are_stored_again(self, index):
+        """Test matches to missing chunks become new and leave the index."""
+        plan = index.plan("research_chunks", [PARAGRAPH, "Other text."])
+        index.add("research_chunks", plan, ["chunk-1", "chunk-2"])
+        looked_up = []
+
+        async def existing_ids(chunk_ids):
+            looked_up.append(chunk_ids)
+            return ["chunk-2"]
+
+        plan = await plan_stored_duplicates(
+            index, "research_chunks", [PARAGRAPH, "Other text."], existing_ids
+        )
+
+        assert looked_up == [["chunk-1", "chunk-2"]]
+        assert plan.matches == [None, "chunk-2"]
+        assert plan.new_positions == [0]
+        assert len(index) == 1
+        assert index.get_statistics()["near_duplicates_reused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_lookup_without_matches(self, index):
+        """Test the database is not queried when nothing matched."""
+
+        async def existing_ids(chunk_ids):
+            raise AssertionError("unexpected lookup")
+
+        plan = await plan_stored_duplicates(
+            index, "research_chunks", [PARAGRAPH], existing_ids
+        )
+
+        assert plan.new_positions == [0]
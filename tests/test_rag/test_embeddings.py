@@ -5,7 +5,10 @@ This test suite covers all aspects of embedding generation,
 including API interactions, caching, batch processing, and cost tracking.
 """
 
+import asyncio
 import os
+import sqlite3
+import time
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,6 +20,8 @@ from rag.embeddings import (
     EmbeddingCache,
     EmbeddingGenerator,
     EmbeddingResult,
+    PersistentEmbeddingCache,
+    get_persistent_cache,
 )
 
 
@@ -35,7 +40,8 @@ class TestEmbeddingResult:
 
         # Verify all fields
         assert result.text == "Sample text"
-        assert result.embedding == [0.1, 0.2, 0.3, 0.4, 0.5]
+        assert result.embedding == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
+        assert result.embedding.dtype == np.float32
         assert result.model == "text-embedding-3-small"
         assert result.token_count == 3
 
@@ -57,6 +63,47 @@ class TestEmbeddingResult:
         assert np_array.shape == (3,)
         assert np.array_equal(np_array, np.array([1.0, 2.0, 3.0]))
 
+    def test_to_numpy_is_zero_copy(self):
+        """Test float32 input is wrapped without copying."""
+        vector = np.array([0.5, 0.25, 0.125], dtype=np.float32)
+        result = EmbeddingResult(
+            text="Test", embedding=vector, model="test-model", token_count=1
+        )
+
+        assert np.shares_memory(result.to_numpy(), vector)
+        assert result.to_numpy().flags.c_contiguous
+        assert not result.to_numpy().flags.writeable
+
+    def test_base64_embedding_decoding(self):
+        """Test base64 payloads from the API decode to float32 vectors."""
+        import base64
+
+        payload = base64.b64encode(
+            np.array([1.0, -2.0], dtype=np.float32).tobytes()
+        ).decode()
+        result = EmbeddingResult(
+            text="Test", embedding=payload, model="test-model", token_count=1
+        )
+
+        assert result.to_list() == [1.0, -2.0]
+
+    def test_to_dict_and_equality(self):
+        """Test serialization and value equality."""
+        first = EmbeddingResult(
+            text="Test", embedding=[0.5, 0.25], model="test-model", token_count=1
+        )
+        second = EmbeddingResult(
+            text="Test", embedding=[0.5, 0.25], model="test-model", token_count=1
+        )
+
+        assert first == second
+        assert first.to_dict() == {
+            "text": "Test",
+            "embedding": [0.5, 0.25],
+            "model": "test-model",
+            "token_count": 1,
+        }
+
 
 class TestEmbeddingCache:
     """Test the embedding cache functionality."""
@@ -176,6 +223,117 @@ class TestEmbeddingCache:
         assert cache.miss_count == 0
 
 
+class TestPersistentEmbeddingCache:
+    """Test the SQLite-backed persistent embedding cache."""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        """Path for a throwaway cache database."""
+        return str(tmp_path / "cache" / "embeddings.sqlite3")
+
+    def _result(self, text, value=0.5, model="text-embedding-3-small"):
+        """Build an embedding result for tests."""
+        return EmbeddingResult(
+            text=text, embedding=[value] * 4, model=model, token_count=3
+        )
+
+    def test_put_and_get_round_trip(self, cache_path):
+        """Test vectors survive the float32 round trip."""
+        cache = PersistentEmbeddingCache(cache_path)
+        cache.put(self._result("Cached text", 0.25), dimensions=4)
+
+        retrieved = cache.get("Cached text", "text-embedding-3-small", 4)
+
+        assert retrieved is not None
+        assert retrieved.text == "Cached text"
+        assert retrieved.to_list() == [0.25] * 4
+        assert retrieved.token_count == 3
+        assert cache.hit_count == 1
+        assert cache.miss_count == 0
+
+    def test_key_includes_model_and_dimensions(self, cache_path):
+        """Test entries for other models or dimensions are misses."""
+        cache = PersistentEmbeddingCache(cache_path)
+        cache.put(self._result("Text"), dimensions=4)
+
+        assert cache.get("Text", "text-embedding-3-large", 4) is None
+        assert cache.get("Text", "text-embedding-3-small", 8) is None
+        assert cache.miss_count == 2
+
+    def test_persists_across_instances(self, cache_path):
+        """Test a new connection sees previously stored embeddings."""
+        first = PersistentEmbeddingCache(cache_path)
+        first.put(self._result("Durable"), dimensions=4)
+        first.close()
+
+        second = PersistentEmbeddingCache(cache_path)
+
+        assert len(second) == 1
+        assert second.get("Durable", "text-embedding-3-small", 4) is not None
+
+    def test_lru_eviction(self, cache_path):
+        """Test least recently used entries are evicted when full."""
+        cache = PersistentEmbeddingCache(cache_path, max_entries=10)
+        for i in range(10):
+            cache.put(self._result(f"Text {i}"), dimensions=4)
+
+        # Touch the oldest entry so it becomes most recently used
+        assert cache.get("Text 0", "text-embedding-3-small", 4) is not None
+
+        cache.put(self._result("Overflow"), dimensions=4)
+
+        assert len(cache) == 9
+        assert cache.get("Text 0", "text-embedding-3-small", 4) is not None
+        assert cache.get("Text 1", "text-embedding-3-small", 4) is None
+        assert cache.get("Overflow", "text-embedding-3-small", 4) is not None
+
+    def test_hits_buffer_access_times(self, cache_path):
+        """Test lookups only read until a batch of hits is pending."""
+        cache = PersistentEmbeddingCache(cache_path, touch_batch_size=2)
+        cache.put(self._result("Text"), dimensions=4)
+        cache.put(self._result("Other"), dimensions=4)
+        reader = sqlite3.connect(cache_path)
+
+        def access_times():
+            return reader.execute(
+                "SELECT text_hash, last_accessed FROM embeddings ORDER BY text_hash"
+            ).fetchall()
+
+        stored = access_times()
+        time.sleep(0.01)
+        cache.get("Text", "text-embedding-3-small", 4)
+
+        assert access_times() == stored
+
+        cache.get("Other", "text-embedding-3-small", 4)
+        touched = access_times()
+
+        assert all(after[1] > before[1] for before, after in zip(stored, touched))
+
+        time.sleep(0.01)
+        cache.get("Text", "text-embedding-3-small", 4)
+        cache.close()
+
+        assert access_times() != touched
+        reader.close()
+
+    def test_clear(self, cache_path):
+        """Test clearing removes entries and statistics."""
+        cache = PersistentEmbeddingCache(cache_path)
+        cache.put(self._result("Text"), dimensions=4)
+        cache.get("Text", "text-embedding-3-small", 4)
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.hit_count == 0
+        assert cache.hit_rate == 0.0
+
+    def test_get_persistent_cache_is_shared(self, cache_path):
+        """Test the process-wide cache is shared per path."""
+        assert get_persistent_cache(cache_path) is get_persistent_cache(cache_path)
+
+
 class TestCostTracker:
     """Test the cost tracking functionality."""
 
@@ -248,12 +406,18 @@ class TestEmbeddingGenerator:
         # Create mock client
         client = AsyncMock()
 
-        # Mock embedding response
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.1, 0.2, 0.3, 0.4, 0.5])]
+        # Mock embedding response with one vector per input
+        def create_response(model, input, **kwargs):
+            inputs = [input] if isinstance(input, str) else input
+            mock_response = MagicMock()
+            mock_response.data = [
+                MagicMock(embedding=[0.1, 0.2, 0.3, 0.4, 0.5], index=i)
+                for i in range(len(inputs))
+            ]
+            return mock_response
 
         # Set up async create method
-        client.embeddings.create = AsyncMock(return_value=mock_response)
+        client.embeddings.create = AsyncMock(side_effect=create_response)
 
         return client
 
@@ -278,6 +442,27 @@ class TestEmbeddingGenerator:
         assert isinstance(generator.cache, EmbeddingCache)
         assert isinstance(generator.cost_tracker, CostTracker)
 
+    @pytest.mark.asyncio
+    async def test_persistent_cache_shared_between_generators(
+        self, tmp_path, mock_openai_client
+    ):
+        """Test a second generator reuses embeddings stored by the first."""
+        shared_cache = get_persistent_cache(str(tmp_path / "emb.sqlite3"))
+
+        first = EmbeddingGenerator()
+        first.client = mock_openai_client
+        first.persistent_cache = shared_cache
+        await first.generate_embeddings(["Shared text"])
+
+        second = EmbeddingGenerator()
+        second.client = AsyncMock()
+        second.persistent_cache = shared_cache
+        results = await second.generate_embeddings(["Shared text"])
+
+        assert results[0].embedding == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
+        second.client.embeddings.create.assert_not_called()
+        assert second.get_statistics()["persistent_cache_hits"] == 1
+
     def test_token_estimation(self):
         """Test token count estimation."""
         # Create generator
@@ -299,7 +484,7 @@ class TestEmbeddingGenerator:
 
         # Verify result
         assert result.text == "Test text"
-        assert result.embedding == [0.1, 0.2, 0.3, 0.4, 0.5]
+        assert result.embedding == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
         assert result.model == "text-embedding-3-small"
         assert result.token_count == 2  # "Test text" = 9 chars / 4 = 2.25 -> 2
 
@@ -317,7 +502,7 @@ class TestEmbeddingGenerator:
 
         # Verify same result
         assert result1.text == result2.text
-        assert result1.embedding == result2.embedding
+        assert np.array_equal(result1.embedding, result2.embedding)
 
         # Verify API was called only once
         assert generator_with_mock.client.embeddings.create.call_count == 1
@@ -355,7 +540,226 @@ class TestEmbeddingGenerator:
 
         # All should have same embedding (mock returns same)
         for result in results:
-            assert result.embedding == [0.1, 0.2, 0.3, 0.4, 0.5]
+            assert result.embedding == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
+
+        # Two multi-input requests instead of one request per text
+        create = generator_with_mock.client.embeddings.create
+        assert create.call_count == 2
+        assert create.call_args_list[0].kwargs["input"] == ["Text 1", "Text 2"]
+        assert create.call_args_list[1].kwargs["input"] == ["Text 3"]
+        assert generator_with_mock.cost_tracker.total_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_maps_response_index(self, generator_with_mock):
+        """Test results follow the input order even if the API reorders them."""
+
+        # Return vectors in reverse order, tagged with their input index
+        def reversed_response(model, input, **kwargs):
+            response = MagicMock()
+            response.data = [
+                MagicMock(embedding=[float(i)], index=i)
+                for i in reversed(range(len(input)))
+            ]
+            return response
+
+        generator_with_mock.client.embeddings.create = AsyncMock(
+            side_effect=reversed_response
+        )
+
+        results = await generator_with_mock.generate_embeddings(["A", "B", "C"])
+
+        assert [r.text for r in results] == ["A", "B", "C"]
+        assert [r.to_list() for r in results] == [[0.0], [1.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_uses_cache_before_packing(
+        self, generator_with_mock
+    ):
+        """Test cached texts are not sent to the API."""
+        # Warm the cache for one text
+        await generator_with_mock.generate_embedding("Known")
+        generator_with_mock.client.embeddings.create.reset_mock()
+
+        results = await generator_with_mock.generate_embeddings(
+            ["Known", "New 1", "New 2"]
+        )
+
+        assert [r.text for r in results] == ["Known", "New 1", "New 2"]
+        create = generator_with_mock.client.embeddings.create
+        create.assert_called_once()
+        assert create.call_args.kwargs["input"] == ["New 1", "New 2"]
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_sends_duplicates_once(self, generator_with_mock):
+        """Test duplicate texts in one call share a single input."""
+        results = await generator_with_mock.generate_embeddings(
+            ["Same", "Other", "Same", " Same "]
+        )
+
+        create = generator_with_mock.client.embeddings.create
+        create.assert_called_once()
+        assert create.call_args.kwargs["input"] == ["Same", "Other"]
+        assert [r.text for r in results] == ["Same", "Other", "Same", "Same"]
+        assert results[0] is results[2]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self, mock_openai_client):
+        """Test concurrent generators embedding the same text share one call."""
+        import asyncio
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.01)
+            return mock_openai_client.embeddings.create.side_effect(**kwargs)
+
+        client = AsyncMock()
+        client.embeddings.create = AsyncMock(side_effect=slow_create)
+
+        generators = [EmbeddingGenerator() for _ in range(3)]
+        for generator in generators:
+            generator.client = client
+
+        results = await asyncio.gather(
+            generators[0].generate_embedding("Popular keyword"),
+            generators[1].generate_embedding("Popular keyword"),
+            generators[2].generate_embeddings(["Popular keyword", "Unique"]),
+        )
+
+        assert results[0].text == results[1].text == "Popular keyword"
+        assert [r.text for r in results[2]] == ["Popular keyword", "Unique"]
+
+        # One request for the shared keyword, one for the unique text
+        sent = [
+            call.kwargs["input"] for call in client.embeddings.create.call_args_list
+        ]
+        assert sent == ["Popular keyword", ["Unique"]]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_feedback_and_billed_usage(self, generator_with_mock):
+        """Test 429s pause the governor and billed usage replaces estimates."""
+        from rag.ratelimit import RateGovernor
+
+        rate_limited = Exception("Rate limit reached")
+        rate_limited.status_code = 429
+        rate_limited.response = MagicMock(headers={"retry-after-ms": "50"})
+
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.5], index=0)]
+        response.usage = MagicMock(prompt_tokens=7)
+
+        generator_with_mock.client.embeddings.create = AsyncMock(
+            side_effect=[rate_limited, response]
+        )
+        governor = RateGovernor(3000, 1_000_000)
+        generator_with_mock.rate_governor = governor
+
+        started = time.monotonic()
+        result = await generator_with_mock.generate_embedding("Throttled text")
+        elapsed = time.monotonic() - started
+
+        assert result.token_count == 7
+        assert generator_with_mock.cost_tracker.total_tokens == 7
+        assert governor.throttled_count == 1
+        # Waited out the Retry-After instead of the generic exponential backoff
+        assert 0.05 <= elapsed < 2
+
+    @pytest.mark.asyncio
+    async def test_failed_requests_release_reserved_tokens(self, generator_with_mock):
+        """Test server errors and cancellation return the token reservation."""
+        from rag.ratelimit import RateGovernor
+
+        server_error = Exception("Internal server error")
+        server_error.status_code = 500
+        governor = RateGovernor(3000, 1000)
+        generator_with_mock.rate_governor = governor
+
+        generator_with_mock.client.embeddings.create = AsyncMock(
+            side_effect=server_error
+        )
+        with pytest.raises(Exception, match="Internal server error"):
+            await generator_with_mock._create_embeddings("Text", 1000)
+
+        generator_with_mock.client.embeddings.create = AsyncMock(
+            side_effect=asyncio.CancelledError()
+        )
+        with pytest.raises(asyncio.CancelledError):
+            await generator_with_mock._create_embeddings("Text", 1000)
+
+        # Both estimates are back, so a full-budget request is not delayed
+        assert governor.reserve(1000) == 0.0
+        assert governor.throttled_count == 0
+
+    @pytest.mark.asyncio
+    async def test_reduced_dimensions_are_requested(self, generator_with_mock):
+        """Test shortened vectors are requested only when configured."""
+        create = generator_with_mock.client.embeddings.create
+
+        await generator_with_mock.generate_embedding("Full size")
+        assert "dimensions" not in create.call_args.kwargs
+
+        generator_with_mock.backend.dimensions = 512
+        await generator_with_mock.generate_embeddings(["Short"])
+        assert create.call_args.kwargs["dimensions"] == 512
+
+    @pytest.mark.asyncio
+    async def test_local_backend_needs_no_client(self, monkeypatch):
+        """Test the local backend embeds offline without rate limiting."""
+        from rag.config import get_rag_config
+
+        local_config = get_rag_config().model_copy(
+            update={"embedding_backend": "local", "embedding_dimensions": 64}
+        )
+        monkeypatch.setattr("rag.embeddings.get_rag_config", lambda: local_config)
+
+        generator = EmbeddingGenerator()
+        results = await generator.generate_embeddings(["Offline one", "Offline two"])
+
+        assert generator.client is None
+        assert generator.rate_governor is None
+        assert [r.model for r in results] == ["local-ngram-hash"] * 2
+        assert results[0].embedding.shape == (64,)
+
+    def test_pack_batches_respects_token_budget(self, generator_with_mock):
+        """Test batches are split by input count and token budget."""
+        texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 400, "e" * 4]
+
+        # 10 tokens each for the first three, 100 for the fourth, 1 for the last
+        batches = generator_with_mock._pack_batches(texts, batch_size=10, max_tokens=25)
+        assert batches == [[0, 1], [2], [3], [4]]
+
+        batches = generator_with_mock._pack_batches(
+            texts, batch_size=2, max_tokens=1000
+        )
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_retries_only_failed_batch(
+        self, generator_with_mock
+    ):
+        """Test a failing batch does not re-send batches that succeeded."""
+        calls = []
+
+        def flaky_response(model, input, **kwargs):
+            calls.append(list(input))
+            if input == ["Text 3"] and calls.count(["Text 3"]) == 1:
+                raise Exception("Temporary failure")
+            response = MagicMock()
+            response.data = [
+                MagicMock(embedding=[0.5], index=i) for i in range(len(input))
+            ]
+            return response
+
+        generator_with_mock.client.embeddings.create = AsyncMock(
+            side_effect=flaky_response
+        )
+
+        with patch("asyncio.sleep", new=AsyncMock()):
+            results = await generator_with_mock.generate_embeddings(
+                ["Text 1", "Text 2", "Text 3"], batch_size=2
+            )
+
+        assert len(results) == 3
+        assert calls.count(["Text 1", "Text 2"]) == 1
+        assert calls.count(["Text 3"]) == 2
 
     @pytest.mark.asyncio
     async def test_generate_embeddings_empty_list(self, generator_with_mock):
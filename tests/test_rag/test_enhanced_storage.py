@@ -26,6 +26,7 @@ from models import (
     SourceRelationship,
     SearchResult,
 )
+from rag.chunk_filter import ChunkFilter
 from rag.enhanced_storage import EnhancedVectorStorage
 
 
@@ -480,6 +481,37 @@ class TestAdvancedSearchMethods:
         assert "related" in result[0]
         assert result[0]["similarity"] == 0.9
 
+    @pytest.mark.asyncio
+    async def test_bulk_search_with_relationships(self, storage, mock_supabase):
+        """Test batched semantic search shares related-source lookups."""
+        with patch.object(
+            storage,
+            "bulk_search",
+            return_value=[
+                [({"source_id": "source1", "content": "Content 1"}, 0.9)],
+                [
+                    ({"source_id": "source1", "content": "Content 2"}, 0.8),
+                    ({"content": "No source"}, 0.7),
+                ],
+            ],
+        ) as mock_bulk:
+            with patch.object(
+                storage,
+                "get_related_sources",
+                return_value=[{"source": {"title": "Related 1"}}],
+            ) as mock_related:
+                result = await storage.bulk_search_with_relationships(
+                    [[0.1] * 1536, [0.2] * 1536], limit=5
+                )
+
+        # Verify one search for both queries and one lookup per source
+        mock_bulk.assert_called_once()
+        assert mock_bulk.call_args.kwargs["limit_per_query"] == 5
+        mock_related.assert_called_once()
+        assert [len(r) for r in result] == [1, 2]
+        assert result[1][0]["related"] == [{"source": {"title": "Related 1"}}]
+        assert result[1][1]["related"] == []
+
     @pytest.mark.asyncio
     async def test_hybrid_search(self, storage, mock_supabase):
         """Test hybrid keyword + vector search."""
@@ -510,6 +542,21 @@ class TestAdvancedSearchMethods:
         # source1 should have highest score (matches both)
         assert "combined_score" in result[0]
 
+    @pytest.mark.asyncio
+    async def test_hybrid_search_filters(self, storage, mock_supabase):
+        """Test chunk filters are pushed into the vector search."""
+        filters = ChunkFilter(source_types=["academic_source"], min_credibility=0.8)
+        with patch.object(
+            storage, "search_by_criteria", AsyncMock(return_value=[])
+        ) as by_criteria:
+            with patch.object(
+                storage, "search_similar_chunks", AsyncMock(return_value=[])
+            ) as similar:
+                await storage.hybrid_search("keto", [0.1] * 1536, filters=filters)
+
+        similar.assert_called_once_with([0.1] * 1536, limit=50, filters=filters)
+        assert by_criteria.call_args.kwargs["min_credibility"] == 0.8
+
 
 class TestBatchOperations:
     """Test batch operations."""
@@ -607,6 +654,28 @@ class TestHelperMethods:
         assert queue_data["source_id"] == source_id
         assert queue_data["status"] == "pending"
 
+    @pytest.mark.asyncio
+    async def test_chunk_embedding_dimensions_must_match(self, storage, mock_config):
+        """Test content chunks are not embedded into a column of another size."""
+        mock_config.embedding_dimensions = 512
+        connection = AsyncMock()
+        connection.fetchval.return_value = 1536
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=connection)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+        storage._get_pool = AsyncMock(return_value=pool)
+        storage._get_embedding_generator = Mock()
+
+        with pytest.raises(ValueError, match="1536 dimensions"):
+            await storage._process_and_store_chunks(str(uuid4()), "Some content")
+        storage._get_embedding_generator.assert_not_called()
+
+        # A matching column is checked only once
+        connection.fetchval.return_value = 512
+        await storage._check_chunk_embedding_dimensions()
+        await storage._check_chunk_embedding_dimensions()
+        assert connection.fetchval.call_count == 2
+
     def test_extract_domain(self, storage):
         """Test domain extraction from URL."""
         # Test various URLs
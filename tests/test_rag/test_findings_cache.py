@@ -0,0 +1,102 @@
+"""
+Tests for the in-process findings cache.
+
+Covers keyword normalization, expiry, LRU eviction and invalidation.
+"""
+
+import pytest
+
+from models import ResearchFindings
+from rag.findings_cache import FindingsCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_findings(keyword: str) -> ResearchFindings:
+    """Create minimal research findings for a keyword."""
+    return ResearchFindings(
+        keyword=keyword,
+        research_summary=f"Research summary about {keyword} for testing.",
+        total_sources_analyzed=0,
+        search_query_used=keyword,
+    )
+
+
+@pytest.fixture
+def clock():
+    """Create a fake clock."""
+    return FakeClock()
+
+
+class TestFindingsCache:
+    """Test the FindingsCache class."""
+
+    def test_hit_uses_normalized_keyword(self, clock):
+        """Test lookups ignore case and surrounding whitespace."""
+        cache = FindingsCache(max_entries=10, ttl_seconds=60, clock=clock)
+        findings = make_findings("keto diet")
+
+        assert cache.get("keto diet") is None
+        cache.put("Keto Diet ", findings)
+
+        assert cache.get("  keto diet") is findings
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.get_statistics()["hit_rate"] == "50.0%"
+
+    def test_entries_expire(self, clock):
+        """Test entries are served until their TTL runs out."""
+        cache = FindingsCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.put("keto", make_findings("keto"))
+
+        clock.now += 59
+        assert cache.get("keto") is not None
+
+        clock.now += 1
+        assert cache.get("keto") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self, clock):
+        """Test the least recently used keyword is dropped when full."""
+        cache = FindingsCache(max_entries=2, ttl_seconds=60, clock=clock)
+        cache.put("a", make_findings("a"))
+        cache.put("b", make_findings("b"))
+        cache.get("a")
+
+        cache.put("c", make_findings("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.evictions == 1
+
+    def test_invalidate(self, clock):
+        """Test invalidating one keyword or everything."""
+        cache = FindingsCache(max_entries=10, ttl_seconds=60, clock=clock)
+        for keyword in ("a", "b", "c"):
+            cache.put(keyword, make_findings(keyword))
+
+        assert cache.invalidate(" A") == 1
+        assert cache.invalidate("missing") == 0
+        assert cache.get("a") is None
+
+        assert cache.invalidate() == 2
+        assert len(cache) == 0
+        assert cache.invalidations == 3
+
+    @pytest.mark.parametrize("max_entries,ttl_seconds", [(0, 60), (10, 0)])
+    def test_disabled(self, clock, max_entries, ttl_seconds):
+        """Test a zero size or TTL stores nothing."""
+        cache = FindingsCache(max_entries, ttl_seconds, clock=clock)
+        cache.put("keto", make_findings("keto"))
+
+        assert not cache.enabled
+        assert cache.get("keto") is None
+        assert len(cache) == 0
@@ -0,0 +1,77 @@
+"""
+Tests for findings snapshots.
+
+Covers encoding, decoding and version handling.
+"""
+
+import zlib
+
+import pytest
+
+from models import AcademicSource, ResearchFindings
+from rag.findings_snapshot import (
+    SNAPSHOT_HEX_PREFIX,
+    SNAPSHOT_VERSION,
+    decode_findings,
+    encode_findings,
+)
+
+
+@pytest.fixture
+def findings():
+    """Create research findings with a few sources."""
+    return ResearchFindings(
+        keyword="intermittent fasting",
+        research_summary="Intermittent fasting research summary. " * 5,
+        academic_sources=[
+            AcademicSource(
+                title=f"Study {i}",
+                url=f"https://example.edu/study{i}",
+                excerpt="Fasting improved insulin sensitivity in adults." * 3,
+                domain=".edu",
+                credibility_score=0.5 + i / 10,
+                authors=["Dr. Smith"],
+                publication_date="2024-01-01",
+            )
+            for i in range(4)
+        ],
+        key_statistics=["23% lower fasting insulin"],
+        main_findings=["Fasting improves insulin sensitivity"],
+        total_sources_analyzed=12,
+        search_query_used="intermittent fasting research",
+    )
+
+
+class TestFindingsSnapshot:
+    """Test encode_findings and decode_findings."""
+
+    def test_round_trip(self, findings):
+        """Test decoding restores equal findings with typed fields."""
+        snapshot = encode_findings(findings)
+        restored = decode_findings(snapshot)
+
+        assert snapshot[0] == SNAPSHOT_VERSION
+        assert len(snapshot) < len(findings.model_dump_json())
+        assert restored == findings
+        assert isinstance(restored.academic_sources[0], AcademicSource)
+        assert restored.research_timestamp == findings.research_timestamp
+        assert restored.get_top_sources(1)[0].title == "Study 3"
+
+    def test_hex_prefix_matches_postgres_output(self, findings):
+        """Test the prefix is how PostgreSQL renders a current snapshot."""
+        assert ("\\x" + encode_findings(findings).hex()).startswith(SNAPSHOT_HEX_PREFIX)
+
+    def test_other_versions_are_ignored(self, findings):
+        """Test snapshots of another version are not decoded."""
+        snapshot = encode_findings(findings)
+
+        assert decode_findings(bytes([SNAPSHOT_VERSION + 1]) + snapshot[1:]) is None
+        assert decode_findings(b"") is None
+
+    def test_corrupt_snapshot(self):
+        """Test a damaged snapshot raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_findings(bytes([SNAPSHOT_VERSION]) + b"not zlib")
+
+        with pytest.raises(ValueError):
+            decode_findings(bytes([SNAPSHOT_VERSION]) + zlib.compress(b"{broken"))
@@ -0,0 +1,119 @@
+"""
+Tests for the multi-core ingestion stage.
+
+Covers inline versus pooled processing, ordering of results and the
+bounded window of documents in flight.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from rag.config import RAGConfig
+from rag.ingest import IngestDocument, IngestionPipeline, ingest_document
+from rag.processor import TextProcessor
+
+
+@pytest.fixture
+def processor():
+    """Create a processor with small chunks."""
+    config = Mock(spec=RAGConfig)
+    config.chunk_size = 100
+    config.chunk_overlap = 20
+    config.min_chunk_size = 10
+    return TextProcessor(config)
+
+
+def make_document(index: int) -> IngestDocument:
+    """Build a small document whose chunks identify it."""
+    return IngestDocument(
+        text=f"Document {index} reports that 42 patients improved by 15%. " * 5,
+        metadata={"document": index},
+        source_id=f"source-{index}",
+    )
+
+
+class TestIngestDocument:
+    """Test single-document processing."""
+
+    def test_chunks_and_features(self, processor):
+        """Test chunks carry metadata and source id, with features extracted."""
+        result = ingest_document(processor, make_document(3))
+
+        assert result.chunks
+        assert all(chunk.source_id == "source-3" for chunk in result.chunks)
+        assert all(chunk.metadata["document"] == 3 for chunk in result.chunks)
+        assert "15%" in result.statistics
+        assert "42 patients" in result.statistics
+        assert "Document" in result.key_phrases
+
+
+class TestIngestionPipeline:
+    """Test the ingestion pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_small_inputs_run_inline(self, processor):
+        """Test inputs below the threshold never start the pool."""
+        pipeline = IngestionPipeline(processor, workers=2, parallel_min_chars=1000)
+
+        result = await pipeline.run(len, "abc", size=3)
+
+        assert result == 3
+        assert pipeline._executor is None
+
+    @pytest.mark.asyncio
+    async def test_batches_preserve_document_order(self, processor):
+        """Test chunks are regrouped into bounded batches in input order."""
+        pipeline = IngestionPipeline(processor, workers=2, parallel_min_chars=10**9)
+        expected = [
+            chunk.content
+            for i in range(6)
+            for chunk in ingest_document(processor, make_document(i)).chunks
+        ]
+
+        batches = [
+            batch
+            async for batch in pipeline.iter_batches(
+                (make_document(i) for i in range(6)), batch_size=4
+            )
+        ]
+
+        assert all(len(batch) <= 4 for batch in batches)
+        assert [chunk.content for batch in batches for chunk in batch] == expected
+
+    @pytest.mark.asyncio
+    async def test_bounded_documents_in_flight(self, processor):
+        """Test new documents are only pulled as results are consumed."""
+        pipeline = IngestionPipeline(processor, workers=1, parallel_min_chars=10**9)
+        pulled = []
+
+        def documents():
+            for i in range(10):
+                pulled.append(i)
+                yield make_document(i)
+
+        results = pipeline.iter_documents(documents())
+        await results.__anext__()
+
+        # Two per worker submitted up front, plus one refill
+        assert len(pulled) == pipeline.max_pending + 1
+        await results.aclose()
+
+    @pytest.mark.asyncio
+    async def test_large_documents_use_worker_processes(self, processor):
+        """Test documents above the threshold are chunked in the pool."""
+        pipeline = IngestionPipeline(processor, workers=1, parallel_min_chars=0)
+        try:
+            results = [
+                result
+                async for result in pipeline.iter_documents(
+                    [make_document(1), make_document(2)]
+                )
+            ]
+        finally:
+            pipeline.close()
+
+        assert [r.chunks[0].source_id for r in results] == ["source-1", "source-2"]
+        assert results[0].chunks[0].content == (
+            ingest_document(processor, make_document(1)).chunks[0].content
+        )
@@ -298,3 +298,45 @@ class TestTextProcessor:
         combined = " ".join(chunk.content for chunk in chunks)
         assert "emojis" in combined
         assert "special" in combined
+
+    def test_iter_chunks_matches_chunk_text(self, processor):
+        """Test streaming chunks match the list API apart from the total."""
+        text = "Dr. Smith ran a trial. Glucose fell by 12%! Was it diet? " * 20
+
+        streamed = list(processor.iter_chunks(text, metadata={"source": "test"}))
+        listed = processor.chunk_text(text, metadata={"source": "test"})
+
+        assert [c.content for c in streamed] == [c.content for c in listed]
+        assert "total_chunks" not in streamed[0].metadata
+        assert listed[0].metadata["total_chunks"] == len(listed)
+
+        # One timestamp per document, not per chunk
+        assert len({c.metadata["processed_at"] for c in streamed}) == 1
+
+    def test_metadata_not_shared_between_chunks(self, processor):
+        """Test per-chunk metadata can be changed independently."""
+        metadata = {"source": "test"}
+        chunks = processor.chunk_text("This is a test sentence. " * 20, metadata)
+
+        chunks[0].metadata["source"] = "changed"
+
+        assert chunks[1].metadata["source"] == "test"
+        assert metadata == {"source": "test"}
+
+    def test_batch_chunks(self, processor):
+        """Test chunk streams are grouped into bounded batches."""
+        chunks = processor.iter_chunks("This is a test sentence. " * 40)
+
+        batches = list(processor.batch_chunks(chunks, batch_size=3))
+
+        assert all(len(batch) == 3 for batch in batches[:-1])
+        assert 0 < len(batches[-1]) <= 3
+        assert [c.chunk_index for batch in batches for c in batch] == list(
+            range(sum(len(batch) for batch in batches))
+        )
+
+    def test_text_chunk_uses_slots(self):
+        """Test TextChunk instances carry no per-instance __dict__."""
+        chunk = TextChunk(content="Test", metadata={}, chunk_index=0)
+
+        assert not hasattr(chunk, "__dict__")
@@ -0,0 +1,178 @@
+"""
+Tests for the embeddings API rate governor.
+
+Covers token-bucket pacing, settling estimates against billed usage,
+releasing reservations of failed requests and the pause applied after
+429 responses.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from rag.ratelimit import (
+    RateGovernor,
+    get_rate_governor,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateGovernor:
+    """Test the RateGovernor token buckets."""
+
+    @pytest.fixture
+    def clock(self):
+        """Create a controllable clock."""
+        return FakeClock()
+
+    def test_full_bucket_allows_burst(self, clock):
+        """Test requests within the per-minute budget are not delayed."""
+        governor = RateGovernor(60, 6000, clock=clock)
+
+        delays = [governor.reserve(100) for _ in range(60)]
+
+        assert delays == [0.0] * 60
+
+    def test_request_limit_paces_at_sustained_rate(self, clock):
+        """Test overdrawn requests wait for the refill, one slot at a time."""
+        governor = RateGovernor(60, 1_000_000, clock=clock)
+        for _ in range(60):
+            governor.reserve(1)
+
+        # 1 request per second once the burst is spent
+        assert governor.reserve(1) == pytest.approx(1.0)
+        assert governor.reserve(1) == pytest.approx(2.0)
+
+        clock.now += 2.0
+        assert governor.reserve(1) == pytest.approx(1.0)
+
+    def test_token_limit_paces_requests(self, clock):
+        """Test the token bucket delays requests independently of RPM."""
+        governor = RateGovernor(1000, 600, clock=clock)
+
+        assert governor.reserve(600) == 0.0
+        # 10 tokens per second refill
+        assert governor.reserve(50) == pytest.approx(5.0)
+
+    def test_oversized_request_is_capped(self, clock):
+        """Test a request larger than the TPM budget can still be sent."""
+        governor = RateGovernor(1000, 600, clock=clock)
+
+        assert governor.reserve(10_000) == 0.0
+
+    def test_settle_uses_billed_tokens(self, clock):
+        """Test settling returns over-estimated tokens to the bucket."""
+        governor = RateGovernor(1000, 600, clock=clock)
+
+        governor.reserve(600)
+        governor.settle(600, 100)
+
+        assert governor.reserve(500) == 0.0
+        assert governor.reserve(10) == pytest.approx(1.0)
+
+    def test_release_returns_unbilled_tokens(self, clock):
+        """Test a failed request's estimate goes back to the bucket."""
+        governor = RateGovernor(1000, 600, clock=clock)
+
+        governor.reserve(600)
+        governor.release(600)
+
+        assert governor.reserve(600) == 0.0
+        # Releasing never fills the bucket past its capacity
+        governor.release(600)
+        governor.release(600)
+        assert governor.reserve(600) == 0.0
+        assert governor.reserve(10) == pytest.approx(1.0)
+
+    def test_throttle_pauses_and_drains(self, clock):
+        """Test a 429 pauses everyone and resumes at the steady rate."""
+        governor = RateGovernor(60, 1_000_000, clock=clock)
+
+        assert governor.throttle(retry_after=5.0) == 5.0
+
+        # Paused, then waits for refill since the buckets were drained
+        delay = governor.reserve(1)
+        assert delay > 5.0
+        assert governor.throttled_count == 1
+
+        clock.now += 5.0
+        assert governor._pause_remaining() == 0.0
+
+    def test_throttle_without_header_backs_off_exponentially(self, clock):
+        """Test consecutive 429s without Retry-After double the pause."""
+        governor = RateGovernor(60, 1_000_000, clock=clock)
+
+        assert governor.throttle() == 1.0
+        assert governor.throttle() == 2.0
+        assert governor.throttle() == 4.0
+
+        governor.settle(1, 1)
+        assert governor.throttle() == 1.0
+
+    def test_throttle_trims_rate_and_success_restores_it(self, clock):
+        """Test the effective rate drops after a 429 and recovers on success."""
+        governor = RateGovernor(60, 1_000_000, clock=clock)
+
+        governor.throttle(retry_after=0.0)
+        assert governor.get_statistics()["effective_rate_scale"] == 0.9
+
+        for _ in range(20):
+            governor.settle(1, 1)
+        assert governor.get_statistics()["effective_rate_scale"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_for_delay(self, clock):
+        """Test acquire waits for the reserved delay."""
+        governor = RateGovernor(1, 1_000_000, clock=clock)
+        await governor.acquire(1)
+
+        with patch("asyncio.sleep", new=AsyncMock()) as sleep:
+            await governor.acquire(1)
+
+        sleep.assert_awaited_once()
+        assert sleep.await_args.args[0] == pytest.approx(60.0)
+        assert governor.get_statistics()["rate_limit_wait_seconds"] == 60.0
+
+    def test_get_rate_governor_is_shared(self):
+        """Test generators using the same model share one governor."""
+        first = get_rate_governor("shared-test-model", 100, 1000)
+        second = get_rate_governor("shared-test-model", 100, 1000)
+
+        assert first is second
+        assert get_rate_governor("other-test-model", 100, 1000) is not first
+
+
+class TestRateLimitErrors:
+    """Test 429 detection and Retry-After parsing."""
+
+    def test_is_rate_limit_error(self):
+        """Test errors are recognized by status code."""
+        assert is_rate_limit_error(MagicMock(status_code=429))
+        assert not is_rate_limit_error(MagicMock(status_code=500))
+        assert not is_rate_limit_error(ValueError("boom"))
+
+    def test_retry_after_headers(self):
+        """Test Retry-After headers are read in seconds or milliseconds."""
+        error = MagicMock()
+
+        error.response.headers = {"retry-after-ms": "1500"}
+        assert retry_after_seconds(error) == 1.5
+
+        error.response.headers = {"retry-after": "7"}
+        assert retry_after_seconds(error) == 7.0
+
+        error.response.headers = {"retry-after": "soon"}
+        assert retry_after_seconds(error) is None
+
+        assert retry_after_seconds(ValueError("boom")) is None
@@ -9,9 +9,11 @@ import asyncio
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import asyncpg
 import pytest
 
 from models import AcademicSource, ResearchFindings
+from rag.findings_snapshot import decode_findings, encode_findings
 from rag.retriever import ResearchRetriever, RetrievalStatistics
 
 
@@ -150,6 +152,14 @@ class TestResearchRetriever:
 
             # Configure mocks
             mock_config.return_value.cache_similarity_threshold = 0.8
+            mock_config.return_value.ingest_workers = 1
+            mock_config.return_value.ingest_parallel_min_chars = 100_000
+            mock_config.return_value.findings_cache_size = 0
+            mock_config.return_value.findings_cache_ttl_seconds = 300.0
+            mock_config.return_value.speculative_cache_lookup = False
+            mock_config.return_value.research_lock_enabled = False
+            mock_config.return_value.cache_stale_grace_hours = 0.0
+            mock_config.return_value.cache_max_background_refreshes = 2
 
             yield {
                 "config": mock_config,
@@ -231,7 +241,9 @@ class TestResearchRetriever:
         )
 
         # Verify exact cache was checked
-        retriever.storage.get_cached_response.assert_called_once_with("climate change")
+        retriever.storage.get_cached_response.assert_called_once_with(
+            "climate change", max_stale=timedelta(0)
+        )
 
         # Verify research function was not called
         research_function.assert_not_called()
@@ -240,32 +252,89 @@ class TestResearchRetriever:
         assert retriever.stats.exact_hits == 1
         assert retriever.stats.cache_misses == 0
 
-    async def test_semantic_cache_hit(self, mock_components, sample_findings):
-        """Test semantic cache hit scenario."""
-        # Create retriever instance
+    async def test_exact_cache_hit_from_snapshot(
+        self, mock_components, sample_findings
+    ):
+        """Test a hit with a snapshot returns the stored findings unchanged."""
         retriever = ResearchRetriever()
+        retriever.storage.get_cached_response = AsyncMock(
+            return_value={
+                "keyword": "climate change",
+                "research_summary": "outdated summary",
+                "findings_snapshot": encode_findings(sample_findings),
+                "chunks": [],
+            }
+        )
 
-        # Mock exact cache miss
-        retriever.storage.get_cached_response = AsyncMock(return_value=None)
+        result = await retriever.retrieve_or_research("climate change", AsyncMock())
 
-        # Mock embedding generation
-        mock_embedding = Mock()
-        mock_embedding.embedding = [0.1] * 1536
-        retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
+        assert result == sample_findings
+        assert [s.credibility_score for s in result.academic_sources] == [0.95, 0.9]
+        assert retriever.stats.exact_hits == 1
 
-        # Mock semantic search results
-        similar_chunks = [
-            (
-                {
-                    "keyword": "global warming",
-                    "content": "Research summary about global warming...",
-                    "metadata": {"source_type": "research_summary"},
-                },
-                0.85,
-            ),
-            (
+        # A semantic hit reports the requested keyword
+        findings = retriever._reconstruct_findings_from_cache(
+            {"findings_snapshot": encode_findings(sample_findings)},
+            keyword="global warming",
+        )
+        assert findings.keyword == "global warming"
+        assert findings.academic_sources == sample_findings.academic_sources
+
+    async def test_exact_cache_hit_ignores_other_snapshot_versions(
+        self, mock_components, sample_findings
+    ):
+        """Test snapshots of another version fall back to the chunks."""
+        retriever = ResearchRetriever()
+        snapshot = bytes([0]) + encode_findings(sample_findings)[1:]
+
+        findings = retriever._reconstruct_findings_from_cache(
+            {
+                "keyword": "climate change",
+                "research_summary": "Summary rebuilt from the cache entry.",
+                "findings_snapshot": snapshot,
+                "chunks": [],
+            }
+        )
+
+        assert findings.research_summary == "Summary rebuilt from the cache entry."
+        assert findings.academic_sources == []
+
+    async def test_in_process_cache_hit(self, mock_components, sample_findings):
+        """Test repeated lookups are served from memory until invalidated."""
+        mock_components["config"].return_value.findings_cache_size = 10
+        retriever = ResearchRetriever()
+        retriever.storage.get_cached_response = AsyncMock(
+            return_value={
+                "findings_snapshot": encode_findings(sample_findings),
+                "chunks": [],
+            }
+        )
+
+        first = await retriever.retrieve_or_research("Climate Change", AsyncMock())
+        second = await retriever.retrieve_or_research(" climate change", AsyncMock())
+
+        assert second is first
+        retriever.storage.get_cached_response.assert_called_once()
+        assert retriever.stats.exact_hits == 1
+        assert retriever.findings_cache.hits == 1
+        assert ResearchRetriever.get_statistics()["in_process_hits"] >= 1
+        assert retriever.get_instance_statistics()["findings_cache"]["hits"] == 1
+
+        assert ResearchRetriever.invalidate_findings_caches() >= 1
+        await retriever.retrieve_or_research("climate change", AsyncMock())
+        assert retriever.storage.get_cached_response.call_count == 2
+
+    @pytest.fixture
+    def similar_entry(self):
+        """Create a cache entry returned by a semantic topic lookup."""
+        return {
+            "id": "cache_global_warming",
+            "keyword": "global warming",
+            "research_summary": "Research summary about global warming and its effects.",
+            "similarity": 0.91,
+            "metadata": {"main_findings": ["Temperatures are rising"]},
+            "chunks": [
                 {
-                    "keyword": "global warming",
                     "content": "Study on Climate Change\n\nClimate change impacts...",
                     "metadata": {
                         "source_type": "academic_source",
@@ -274,11 +343,28 @@ class TestResearchRetriever:
                         "domain": ".edu",
                         "credibility_score": 0.9,
                     },
-                },
-                0.82,
-            ),
-        ]
-        retriever.storage.search_similar_chunks = AsyncMock(return_value=similar_chunks)
+                }
+            ],
+        }
+
+    async def test_semantic_cache_hit(self, mock_components, similar_entry):
+        """Test semantic cache hit scenario."""
+        # Create retriever instance
+        retriever = ResearchRetriever()
+
+        # Mock exact cache miss
+        retriever.storage.get_cached_response = AsyncMock(return_value=None)
+
+        # Mock embedding generation
+        mock_embedding = Mock()
+        mock_embedding.embedding = [0.1] * 1536
+        retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
+
+        # Mock the topic lookup finding a similar cached keyword
+        retriever.storage.get_similar_cached_response = AsyncMock(
+            return_value=similar_entry
+        )
+        retriever.storage.search_similar_chunks = AsyncMock()
 
         # Mock research function (should not be called)
         research_function = AsyncMock()
@@ -288,11 +374,21 @@ class TestResearchRetriever:
             "climate crisis", research_function
         )
 
-        # Verify semantic search was performed
+        # Verify one topic lookup was performed instead of a chunk search
         retriever.embeddings.generate_embedding.assert_called_once_with(
             "climate crisis"
         )
-        retriever.storage.search_similar_chunks.assert_called_once()
+        retriever.storage.get_similar_cached_response.assert_called_once_with(
+            [0.1] * 1536, similarity_threshold=0.8, record_hit=True
+        )
+        retriever.storage.search_similar_chunks.assert_not_called()
+
+        # Verify the cached findings are returned for the requested keyword
+        assert result.keyword == "climate crisis"
+        assert result.main_findings == ["Temperatures are rising"]
+        assert [s.url for s in result.academic_sources] == [
+            "https://example.edu/study1"
+        ]
 
         # Verify research function was not called
         research_function.assert_not_called()
@@ -301,6 +397,101 @@ class TestResearchRetriever:
         assert retriever.stats.semantic_hits == 1
         assert retriever.stats.cache_misses == 0
 
+    async def test_speculative_semantic_hit(self, mock_components, similar_entry):
+        """Test the semantic search runs during the exact lookup in speculative mode."""
+        mock_components["config"].return_value.speculative_cache_lookup = True
+        retriever = ResearchRetriever()
+        events = []
+
+        async def exact_lookup(keyword, max_stale=None):
+            events.append("exact started")
+            await asyncio.sleep(0.01)
+            events.append("exact missed")
+            return None
+
+        async def similar_lookup(embedding, **kwargs):
+            events.append("semantic searched")
+            return similar_entry
+
+        mock_embedding = Mock()
+        mock_embedding.embedding = [0.1] * 1536
+        retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
+        retriever.storage.get_cached_response = AsyncMock(side_effect=exact_lookup)
+        retriever.storage.get_similar_cached_response = AsyncMock(
+            side_effect=similar_lookup
+        )
+        retriever.storage.record_cache_hit = Mock()
+
+        result = await retriever.retrieve_or_research("climate crisis", AsyncMock())
+
+        # The topic lookup did not wait for the exact miss
+        assert events == ["exact started", "semantic searched", "exact missed"]
+        assert (
+            retriever.storage.get_similar_cached_response.call_args.kwargs["record_hit"]
+            is False
+        )
+        # The hit is counted once the match is actually served
+        retriever.storage.record_cache_hit.assert_called_once_with(
+            "cache_global_warming"
+        )
+        assert result.keyword == "climate crisis"
+        assert retriever.stats.semantic_hits == 1
+
+    async def test_speculative_exact_hit_cancels_semantic_search(
+        self, mock_components, sample_findings, similar_entry
+    ):
+        """Test an exact hit in speculative mode discards the semantic match."""
+        mock_components["config"].return_value.speculative_cache_lookup = True
+        retriever = ResearchRetriever()
+
+        async def exact_lookup(keyword, max_stale=None):
+            await asyncio.sleep(0.01)
+            return {"findings_snapshot": encode_findings(sample_findings)}
+
+        mock_embedding = Mock()
+        mock_embedding.embedding = [0.1] * 1536
+        retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
+        retriever.storage.get_cached_response = AsyncMock(side_effect=exact_lookup)
+        retriever.storage.get_similar_cached_response = AsyncMock(
+            return_value=similar_entry
+        )
+        retriever.storage.record_cache_hit = Mock()
+
+        result = await retriever.retrieve_or_research("climate change", AsyncMock())
+        await asyncio.sleep(0)
+
+        assert result == sample_findings
+        assert retriever.stats.exact_hits == 1
+        assert retriever.stats.semantic_hits == 0
+        retriever.storage.record_cache_hit.assert_not_called()
+
+    async def test_semantic_search_without_topics_table(self, mock_components):
+        """Test semantic search falls back to chunks before the migration."""
+        retriever = ResearchRetriever()
+        retriever.embeddings.generate_embedding = AsyncMock(
+            return_value=Mock(embedding=[0.1] * 1536)
+        )
+        retriever.storage.get_similar_cached_response = AsyncMock(
+            side_effect=asyncpg.UndefinedTableError("cache_topics")
+        )
+        retriever.storage.search_similar_chunks = AsyncMock(
+            return_value=[
+                (
+                    {
+                        "keyword": "global warming",
+                        "content": "Research summary about global warming...",
+                        "metadata": {"source_type": "research_summary"},
+                    },
+                    0.85,
+                )
+            ]
+        )
+
+        result = await retriever._semantic_search("climate crisis")
+
+        assert result.keyword == "climate crisis"
+        retriever.storage.search_similar_chunks.assert_called_once()
+
     async def test_cache_miss(self, mock_components, sample_findings):
         """Test cache miss scenario."""
         # Create retriever instance
@@ -308,7 +499,7 @@ class TestResearchRetriever:
 
         # Mock cache misses
         retriever.storage.get_cached_response = AsyncMock(return_value=None)
-        retriever.storage.search_similar_chunks = AsyncMock(return_value=[])
+        retriever.storage.get_similar_cached_response = AsyncMock(return_value=None)
 
         # Mock embedding generation for semantic search
         mock_embedding = Mock()
@@ -327,6 +518,7 @@ class TestResearchRetriever:
         )
         retriever.storage.store_research_chunks = AsyncMock(return_value=["chunk_id_1"])
         retriever.storage.store_cache_entry = AsyncMock(return_value="cache_id_1")
+        retriever.storage.store_cache_topic = AsyncMock(return_value="cache_id_1")
 
         # Call retrieve_or_research
         result = await retriever.retrieve_or_research("new topic", research_function)
@@ -338,12 +530,165 @@ class TestResearchRetriever:
         retriever.processor.process_research_findings.assert_called_once()
         retriever.storage.store_research_chunks.assert_called_once()
         retriever.storage.store_cache_entry.assert_called_once()
+        retriever.storage.store_cache_topic.assert_called_once_with(
+            sample_findings.keyword, [0.1] * 1536
+        )
+        entry = retriever.storage.store_cache_entry.call_args.kwargs
+        assert entry["keyword"] == sample_findings.keyword
+        assert decode_findings(entry["findings_snapshot"]) == sample_findings
 
         # Verify statistics
         assert retriever.stats.cache_misses == 1
         assert retriever.stats.exact_hits == 0
         assert retriever.stats.semantic_hits == 0
 
+    async def test_concurrent_misses_share_one_research(
+        self, mock_components, sample_findings
+    ):
+        """Test simultaneous misses for one keyword research it once."""
+        retriever = ResearchRetriever()
+        retriever.storage.get_cached_response = AsyncMock(return_value=None)
+        retriever.storage.get_similar_cached_response = AsyncMock(return_value=None)
+        mock_embedding = Mock()
+        mock_embedding.embedding = [0.1] * 1536
+        retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
+        retriever._store_research = AsyncMock()
+
+        async def slow_research():
+            await asyncio.sleep(0.01)
+            return sample_findings
+
+        research_function = AsyncMock(side_effect=slow_research)
+
+        results = await asyncio.gather(
+            retriever.retrieve_or_research("Climate Change", research_function),
+            retriever.retrieve_or_research("climate change ", research_function),
+            retriever.retrieve_or_research("climate change", research_function),
+        )
+
+        research_function.assert_called_once()
+        retriever._store_research.assert_called_once()
+        assert all(result is sample_findings for result in results)
+        assert ResearchRetriever.get_statistics()["coalesced_requests"] >= 2
+
+    async def test_research_lock_rechecks_cache(self, mock_components, sample_findings):
+        """Test research waiting on another worker's lock uses its result."""
+        mock_components["config"].return_value.research_lock_enabled = True
+        mock_components["config"].return_value.research_lock_timeout_seconds = 30.0
+        retriever = ResearchRetriever()
+
+        # Missed before the lock; stored by the other worker once it is held
+        retriever.storage.get_cached_response = AsyncMock(
+            side_effect=[None, {"findings_snapshot": encode_findings(sample_findings)}]
+        )
+        retriever.storage.get_similar_cached_response = AsyncMock(return_value=None)
+        mock_embedding = Mock()
+        mock_embedding.embedding = [0.1] * 1536
+        retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
+
+        lock = MagicMock()
+        lock.__aenter__ = AsyncMock(return_value=True)
+        lock.__aexit__ = AsyncMock(return_value=None)
+        retriever.storage.research_lock = Mock(return_value=lock)
+        research_function = AsyncMock()
+
+        result = await retriever.retrieve_or_research(
+            "climate change", research_function
+        )
+
+        retriever.storage.research_lock.assert_called_once_with(
+            "climate change", timeout=30.0
+        )
+        research_function.assert_not_called()
+        assert result == sample_findings
+        assert retriever.stats.exact_hits == 1
+        assert retriever.stats.cache_misses == 0
+
+    async def test_stale_hit_refreshes_in_background(
+        self, mock_components, sample_findings
+    ):
+        """Test a stale entry is served while it is re-researched."""
+        mock_components["config"].return_value.cache_stale_grace_hours = 24.0
+        retriever = ResearchRetriever()
+
+        stale_entry = {
+            "findings_snapshot": encode_findings(sample_findings),
+            "stale": True,
+        }
+        retriever.storage.get_cached_response = AsyncMock(return_value=stale_entry)
+        retriever._write_research = AsyncMock()
+        fresh_findings = sample_findings.model_copy(
+            update={"research_summary": "Updated summary"}
+        )
+        research_function = AsyncMock(return_value=fresh_findings)
+
+        result = await retriever.retrieve_or_research(
+            "climate change", research_function
+        )
+
+        # The stale findings are returned before the refresh ran
+        assert result == sample_findings
+        retriever.storage.get_cached_response.assert_called_once_with(
+            "climate change", max_stale=timedelta(hours=24)
+        )
+        assert retriever.stats.stale_hits == 1
+
+        # A second stale hit does not start another refresh for the keyword
+        assert not retriever._schedule_refresh("Climate Change", research_function)
+
+        # Cleanup waits for the refresh to store its research
+        retriever.storage.close = AsyncMock()
+        await retriever.cleanup()
+
+        research_function.assert_called_once()
+        retriever._write_research.assert_called_once_with(fresh_findings)
+        assert retriever.stats.refreshes == 1
+        assert retriever._refreshes == {}
+
+    async def test_background_refresh_limit(self, mock_components, sample_findings):
+        """Test stale hits past the refresh limit are served without a refresh."""
+        mock_components["config"].return_value.cache_max_background_refreshes = 1
+        retriever = ResearchRetriever()
+        retriever._write_research = AsyncMock()
+        research_function = AsyncMock(side_effect=RuntimeError("API down"))
+
+        assert retriever._schedule_refresh("first topic", research_function)
+        assert not retriever._schedule_refresh("second topic", research_function)
+        assert retriever.stats.skipped_refreshes == 1
+
+        # A failed refresh keeps the stale entry and frees its slot
+        retriever.storage.close = AsyncMock()
+        await retriever.cleanup()
+        retriever._write_research.assert_not_called()
+        assert retriever.stats.failed_refreshes == 1
+        assert retriever._refreshes == {}
+
+    async def test_refresh_counts_storage_failures(
+        self, mock_components, sample_findings
+    ):
+        """Test a refresh whose research was not stored counts as failed."""
+        mock_components["config"].return_value.findings_cache_size = 16
+        retriever = ResearchRetriever()
+        retriever.storage.store_research_chunks = AsyncMock(return_value=["chunk1"])
+        retriever.storage.store_cache_entry = AsyncMock(
+            side_effect=asyncpg.PostgresConnectionError("connection lost")
+        )
+        retriever.processor.process_research_findings = Mock(
+            return_value=[Mock(content="chunk1")]
+        )
+        mock_embedding = Mock()
+        mock_embedding.embedding = [0.1] * 1536
+        retriever.embeddings.generate_embeddings = AsyncMock(
+            return_value=[mock_embedding]
+        )
+        research_function = AsyncMock(return_value=sample_findings)
+
+        await retriever._refresh("climate change", research_function)
+
+        assert retriever.stats.failed_refreshes == 1
+        assert retriever.stats.refreshes == 0
+        assert retriever.findings_cache.get("climate change") is None
+
     async def test_dict_to_findings_conversion(self, mock_components):
         """Test conversion from dictionary to ResearchFindings."""
         # Create retriever instance
@@ -409,10 +754,9 @@ class TestResearchRetriever:
         # Create retriever instance
         retriever = ResearchRetriever()
 
-        # Mock cache checks - first check returns None, second and third return cached
-        # (since retrieve_or_research calls _check_exact_cache internally)
+        # Mock cache checks - exact checks for both keywords run first, then
+        # retrieve_or_research checks topic1 again internally
         cache_responses = [
-            None,
             None,
             {
                 "keyword": "topic2",
@@ -420,6 +764,7 @@ class TestResearchRetriever:
                 "metadata": {},
                 "chunks": [],
             },
+            None,
         ]
         retriever.storage.get_cached_response = AsyncMock(side_effect=cache_responses)
 
@@ -427,6 +772,7 @@ class TestResearchRetriever:
         mock_embedding = Mock(embedding=[0.1] * 1536)
         retriever.embeddings.generate_embedding = AsyncMock(return_value=mock_embedding)
         retriever.storage.search_similar_chunks = AsyncMock(return_value=[])
+        retriever.storage.bulk_search = AsyncMock(return_value=[[]])
         retriever.embeddings.generate_embeddings = AsyncMock(
             return_value=[mock_embedding]
         )
@@ -450,6 +796,41 @@ class TestResearchRetriever:
         assert results["keywords"]["topic1"] == "success"
         assert results["keywords"]["topic2"] == "already_cached"
 
+    async def test_semantic_search_many(self, mock_components, similar_entry):
+        """Test several keywords are embedded and matched in one batch."""
+        retriever = ResearchRetriever()
+        retriever.embeddings.generate_embeddings = AsyncMock(
+            return_value=[Mock(embedding=[0.1] * 1536), Mock(embedding=[0.2] * 1536)]
+        )
+        retriever.storage.get_similar_cached_responses = AsyncMock(
+            return_value=[similar_entry, None]
+        )
+
+        results = await retriever._semantic_search_many(["climate crisis", "baking"])
+
+        assert results[0].keyword == "climate crisis"
+        assert results[1] is None
+        retriever.embeddings.generate_embeddings.assert_called_once_with(
+            ["climate crisis", "baking"]
+        )
+        retriever.storage.get_similar_cached_responses.assert_called_once()
+        lookup = retriever.storage.get_similar_cached_responses.call_args
+        assert len(lookup.args[0]) == 2
+
+    async def test_warm_cache_skips_semantic_matches(self, mock_components):
+        """Test keywords covered by similar research are not researched again."""
+        retriever = ResearchRetriever()
+        retriever.storage.get_cached_response = AsyncMock(return_value=None)
+        retriever._semantic_search_many = AsyncMock(return_value=[Mock(), None])
+        retriever.retrieve_or_research = AsyncMock()
+
+        with patch("rag.retriever.asyncio.sleep", AsyncMock()):
+            results = await retriever.warm_cache(["similar", "new"], AsyncMock())
+
+        assert results["keywords"] == {"similar": "already_cached", "new": "success"}
+        retriever._semantic_search_many.assert_called_once_with(["similar", "new"])
+        retriever.retrieve_or_research.assert_called_once()
+
     async def test_cleanup(self, mock_components):
         """Test cleanup functionality."""
         # Create retriever instance
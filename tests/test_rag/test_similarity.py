@@ -0,0 +1,119 @@
+"""
+Tests for the vectorized similarity index.
+
+Covers normalization, top-k selection, thresholds and batched queries,
+and checks results against the scalar cosine similarity implementation.
+"""
+
+import numpy as np
+import pytest
+
+from rag.similarity import SimilarityIndex, normalize_rows, top_k_indices
+
+
+class TestHelpers:
+    """Test module-level helpers."""
+
+    def test_normalize_rows(self):
+        """Test rows are scaled to unit length and zero rows stay zero."""
+        matrix = normalize_rows(np.array([[3.0, 4.0], [0.0, 0.0]]))
+
+        assert matrix.dtype == np.float32
+        assert np.allclose(matrix[0], [0.6, 0.8])
+        assert np.array_equal(matrix[1], [0.0, 0.0])
+
+    def test_top_k_indices_sorted_descending(self):
+        """Test top-k selection returns the best scores in order."""
+        scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+
+        assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+        assert top_k_indices(scores, 0).tolist() == []
+
+
+class TestSimilarityIndex:
+    """Test the SimilarityIndex class."""
+
+    @pytest.fixture
+    def index(self):
+        """Create a small index with known geometry."""
+        return SimilarityIndex.from_pairs(
+            [
+                ("A", [1.0, 0.0, 0.0]),  # Identical
+                ("B", [0.9, 0.1, 0.0]),  # Very similar
+                ("C", [0.0, 1.0, 0.0]),  # Orthogonal
+                ("D", [-1.0, 0.0, 0.0]),  # Opposite
+                ("E", [0.7, 0.3, 0.0]),  # Somewhat similar
+            ]
+        )
+
+    def test_search_top_k(self, index):
+        """Test search returns the most similar candidates first."""
+        results = index.search([1.0, 0.0, 0.0], top_k=3)
+
+        assert [identifier for identifier, _ in results] == ["A", "B", "E"]
+        assert results[0][1] == pytest.approx(1.0)
+        assert results[0][1] > results[1][1] > results[2][1]
+
+    def test_search_threshold(self, index):
+        """Test threshold filters out weak matches."""
+        results = index.search([1.0, 0.0, 0.0], top_k=5, threshold=0.5)
+
+        assert [identifier for identifier, _ in results] == ["A", "B", "E"]
+
+    def test_search_batch_matches_single_queries(self, index):
+        """Test batched queries give the same answers as single queries."""
+        queries = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+
+        batch_results = index.search_batch(queries, top_k=2)
+
+        assert batch_results == [index.search(q, top_k=2) for q in queries]
+        assert batch_results[1][0][0] == "C"
+
+    def test_matches_scalar_cosine(self):
+        """Test scores agree with a straightforward cosine implementation."""
+        rng = np.random.default_rng(42)
+        vectors = rng.normal(size=(50, 16))
+        query = rng.normal(size=16)
+        index = SimilarityIndex(list(range(50)), vectors)
+
+        expected = sorted(
+            (
+                (
+                    i,
+                    float(
+                        np.dot(vectors[i], query)
+                        / (np.linalg.norm(vectors[i]) * np.linalg.norm(query))
+                    ),
+                )
+                for i in range(50)
+            ),
+            key=lambda x: x[1],
+            reverse=True,
+        )[:5]
+        results = index.search(query, top_k=5)
+
+        assert [i for i, _ in results] == [i for i, _ in expected]
+        assert [s for _, s in results] == pytest.approx(
+            [s for _, s in expected], abs=1e-5
+        )
+
+    def test_zero_vectors_score_zero(self):
+        """Test zero candidates and queries score 0.0."""
+        index = SimilarityIndex(["zero", "one"], np.array([[0.0, 0.0], [1.0, 1.0]]))
+
+        assert dict(index.search([1.0, 1.0], top_k=2))["zero"] == 0.0
+        assert all(score == 0.0 for _, score in index.search([0.0, 0.0], top_k=2))
+
+    def test_empty_index(self):
+        """Test an empty index returns no results."""
+        index = SimilarityIndex.from_pairs([])
+
+        assert len(index) == 0
+        assert index.search([1.0, 0.0]) == []
+        assert index.search_batch([[1.0, 0.0], [0.0, 1.0]]) == [[], []]
+
+    def test_mismatched_identifiers(self):
+        """Test building with the wrong number of identifiers fails."""
+        with pytest.raises(ValueError):
+            SimilarityIndex(["only-one"], np.ones((2, 3)))
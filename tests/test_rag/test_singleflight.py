@@ -0,0 +1,123 @@
+"""
+Tests for single-flight request coalescing.
+
+Covers sharing results and errors between concurrent callers, and
+recovery when a leader stops without publishing an outcome.
+"""
+
+import asyncio
+
+import pytest
+
+from rag.singleflight import SingleFlight, SingleFlightAbandoned
+
+
+class TestSingleFlight:
+    """Test the SingleFlight helper."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test concurrent callers with the same key run the work once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*[flight.run("key", work) for _ in range(5)])
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.coalesced_count == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test distinct keys are not coalesced."""
+        flight = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            flight.run("a", lambda: work("a")), flight.run("b", lambda: work("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        """Test followers receive the leader's error."""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *[flight.run("key", work) for _ in range(3)], return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert "key" not in flight
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        """Test a finished request does not satisfy later callers."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.run("key", work) == 1
+        assert await flight.run("key", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_abandoned_leader_lets_follower_retry(self):
+        """Test followers take over when the leader is cancelled."""
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow_work():
+            started.set()
+            await asyncio.sleep(10)
+            return "leader"
+
+        async def fast_work():
+            return "follower"
+
+        leader = asyncio.create_task(flight.run("key", slow_work))
+        await started.wait()
+        follower = asyncio.create_task(flight.run("key", fast_work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await follower == "follower"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.asyncio
+    async def test_release_without_outcome_fails_followers(self):
+        """Test releasing an unfinished future raises SingleFlightAbandoned."""
+        flight = SingleFlight()
+        future, leader = flight.claim("key")
+        shared, follower_leads = flight.claim("key")
+
+        assert leader and not follower_leads
+        assert shared is future
+
+        flight.release("key", future)
+
+        with pytest.raises(SingleFlightAbandoned):
+            await flight.wait(shared)
@@ -11,11 +11,14 @@ import json
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import asyncpg
+import numpy as np
 import pytest
 
+from rag.chunk_filter import ChunkFilter
 from rag.embeddings import EmbeddingResult
 from rag.processor import TextChunk
-from rag.storage import VectorStorage
+from rag.storage import _CACHE_ENTRY_COLUMNS, VectorStorage
 
 
 class TestVectorStorage:
@@ -52,8 +55,12 @@ class TestVectorStorage:
         # Create mock pool
         pool = MagicMock()
 
-        # Mock connection
+        # Mock connection with a working transaction
         mock_conn = AsyncMock()
+        transaction = MagicMock()
+        transaction.__aenter__ = AsyncMock(return_value=None)
+        transaction.__aexit__ = AsyncMock(return_value=None)
+        mock_conn.transaction = MagicMock(return_value=transaction)
 
         # Setup context manager for acquire
         mock_acquire = MagicMock()
@@ -192,26 +199,34 @@ class TestVectorStorage:
 
     @pytest.mark.asyncio
     async def test_store_research_chunks(
-        self, storage_with_mocks, sample_chunks, sample_embeddings
+        self, storage_with_mocks, mock_connection_pool, sample_chunks, sample_embeddings
     ):
         """Test storing research chunks."""
-        # Setup mock response
-        mock_data = [{"id": "chunk1"}, {"id": "chunk2"}]
-        storage_with_mocks.supabase.table().upsert().execute.return_value = MagicMock(
-            data=mock_data
-        )
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        chunk_ids = [
+            storage_with_mocks._generate_chunk_id(chunk) for chunk in sample_chunks
+        ]
 
         # Store chunks
-        result = await storage_with_mocks.store_research_chunks(
-            sample_chunks, sample_embeddings, "test keyword"
-        )
+        with patch(
+            "rag.storage.copy_upsert", AsyncMock(return_value=chunk_ids)
+        ) as mock_copy:
+            result = await storage_with_mocks.store_research_chunks(
+                sample_chunks, sample_embeddings, "test keyword"
+            )
 
         # Verify results
-        assert result == ["chunk1", "chunk2"]
+        assert result == chunk_ids
 
-        # Verify Supabase called correctly
-        storage_with_mocks.supabase.table.assert_called_with("research_chunks")
-        assert storage_with_mocks.supabase.table().upsert.call_count >= 1
+        # Verify one bulk load with a row per chunk
+        conn, table, columns, rows = mock_copy.call_args.args
+        assert conn is mock_conn
+        assert table == "research_chunks"
+        assert [row[columns.index("id")] for row in rows] == chunk_ids
+        assert [row[1] for row in rows] == [chunk.content for chunk in sample_chunks]
+        assert all(row[2].dtype == np.float32 for row in rows)
+        assert all(row[4] == "test keyword" for row in rows)
 
     @pytest.mark.asyncio
     async def test_store_research_chunks_mismatch(
@@ -230,13 +245,11 @@ class TestVectorStorage:
             )
 
     @pytest.mark.asyncio
-    async def test_store_cache_entry(self, storage_with_mocks):
+    async def test_store_cache_entry(self, storage_with_mocks, mock_connection_pool):
         """Test storing a cache entry."""
-        # Setup mock response
-        mock_data = [{"id": "cache123"}]
-        storage_with_mocks.supabase.table().upsert().execute.return_value = MagicMock(
-            data=mock_data
-        )
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = "cache123"
 
         # Store cache entry
         result = await storage_with_mocks.store_cache_entry(
@@ -244,20 +257,54 @@ class TestVectorStorage:
             research_summary="Summary of ML research",
             chunk_ids=["chunk1", "chunk2"],
             metadata={"source_count": 5},
+            findings_snapshot=b"\x01data",
         )
 
         # Verify result
         assert result == "cache123"
 
-        # Verify Supabase called
-        storage_with_mocks.supabase.table.assert_called_with("cache_entries")
-        assert storage_with_mocks.supabase.table().upsert.call_count >= 1
+        # The entry and its snapshot are written by one upsert
+        mock_conn.fetchval.assert_called_once()
+        query, *values = mock_conn.fetchval.call_args.args
+        assert "ON CONFLICT (id) DO UPDATE" in query
+        assert "findings_snapshot = EXCLUDED.findings_snapshot" in query
+        entry = dict(zip(_CACHE_ENTRY_COLUMNS, values))
+        assert entry["id"] == storage_with_mocks._generate_cache_key("machine learning")
+        assert entry["keyword"] == "machine learning"
+        assert entry["research_summary"] == "Summary of ML research"
+        assert entry["chunk_ids"] == ["chunk1", "chunk2"]
+        assert json.loads(entry["metadata"]) == {"source_count": 5}
+        assert entry["findings_snapshot"] == b"\x01data"
+        storage_with_mocks.supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_store_cache_entry_without_snapshot_column(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test entries are stored without snapshots before the migration."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.side_effect = [
+            asyncpg.UndefinedColumnError("findings_snapshot"),
+            "cache123",
+            "cache456",
+        ]
+
+        for keyword in ("keto", "paleo"):
+            await storage_with_mocks.store_cache_entry(
+                keyword=keyword,
+                research_summary="Summary",
+                chunk_ids=[],
+                findings_snapshot=b"\x01data",
+            )
 
-        # Check the data passed
-        call_args = storage_with_mocks.supabase.table().upsert.call_args[0][0]
-        assert call_args["keyword"] == "machine learning"
-        assert call_args["research_summary"] == "Summary of ML research"
-        assert call_args["chunk_ids"] == ["chunk1", "chunk2"]
+        # The missing column is detected once
+        queries = [call.args[0] for call in mock_conn.fetchval.call_args_list]
+        assert "findings_snapshot" in queries[0]
+        assert all("findings_snapshot" not in query for query in queries[1:])
+        assert len(mock_conn.fetchval.call_args_list[2].args[1:]) == (
+            len(_CACHE_ENTRY_COLUMNS) - 1
+        )
 
     @pytest.mark.asyncio
     async def test_search_similar_chunks(
@@ -310,38 +357,146 @@ class TestVectorStorage:
         mock_conn.fetch.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_get_cached_response(self, storage_with_mocks):
+    async def test_search_similar_chunks_uses_index_order(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test the threshold is applied after the index-ordered LIMIT."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        storage_with_mocks.config = storage_with_mocks.config.model_copy(
+            update={"vector_search_ef_search": 40, "vector_search_probes": 7}
+        )
+        mock_conn.fetch.return_value = []
+
+        await storage_with_mocks.search_similar_chunks(
+            [0.1] * 1536, limit=50, similarity_threshold=0.8
+        )
+
+        # ef_search is raised to the requested rows and set for this search only
+        mock_conn.transaction.assert_called_once()
+        settings = mock_conn.execute.call_args.args[0]
+        assert "SET LOCAL hnsw.ef_search = 50" in settings
+        assert "SET LOCAL ivfflat.probes = 7" in settings
+
+        query = mock_conn.fetch.call_args.args[0]
+        inner, outer = query.split(") AS nearest")
+        assert "ORDER BY embedding <=> $1::vector" in inner
+        assert "LIMIT $3" in inner
+        assert ">= $2" not in inner
+        assert "similarity >= $2" in outer
+
+    @pytest.mark.asyncio
+    async def test_search_similar_chunks_filtered(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test filters go inside the index scan and enable iterative scans."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = "0.8.0"
+        mock_conn.fetch.return_value = []
+
+        filters = ChunkFilter(source_types=["academic_source"], min_credibility=0.7)
+        await storage_with_mocks.search_similar_chunks(
+            [0.1] * 1536, limit=10, similarity_threshold=0.5, filters=filters
+        )
+        await storage_with_mocks.search_similar_chunks(
+            [0.1] * 1536, limit=10, similarity_threshold=0.5, filters=filters
+        )
+
+        # The pgvector version is only looked up once
+        mock_conn.fetchval.assert_called_once()
+        settings = mock_conn.execute.call_args.args[0]
+        assert "SET LOCAL hnsw.iterative_scan = relaxed_order" in settings
+
+        query, *args = mock_conn.fetch.call_args.args
+        inner = query.split(") AS nearest")[0]
+        assert "(metadata->>'source_type') = ANY($4::text[])" in inner
+        assert "((metadata->>'credibility_score')::real) >= $5::real" in inner
+        assert inner.index("WHERE") < inner.index("ORDER BY embedding")
+        assert args[1:] == [0.5, 10, ["academic_source"], 0.7]
+
+    @pytest.mark.asyncio
+    async def test_filtered_search_without_iterative_scan(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test older pgvector gets a wider ef_search and quantized numbering."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        storage_with_mocks.config = storage_with_mocks.config.model_copy(
+            update={
+                "embedding_storage_precision": "float16",
+                "embedding_rerank_factor": 2,
+                "vector_search_ef_search": 40,
+            }
+        )
+        mock_conn.fetchval.return_value = "0.7.4"
+        mock_conn.fetch.return_value = []
+
+        await storage_with_mocks.bulk_search(
+            [[0.1] * 512] * 2, 5, 0.5, filters=ChunkFilter(keywords=["keto"])
+        )
+
+        settings = mock_conn.execute.call_args.args[0]
+        assert "iterative_scan" not in settings
+        assert "SET LOCAL hnsw.ef_search = 160" in settings
+
+        query, *args = mock_conn.fetch.call_args.args
+        assert "WHERE keyword = ANY($5::text[])" in query
+        assert args[1:] == [0.5, 5, 2, ["keto"]]
+
+    @pytest.mark.parametrize(
+        "precision, index_expression",
+        [
+            ("float16", "embedding::halfvec(512) <=> $1::halfvec(512)"),
+            ("binary", "binary_quantize(embedding)::bit(512)"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_search_similar_chunks_quantized(
+        self, storage_with_mocks, mock_connection_pool, precision, index_expression
+    ):
+        """Test quantized modes search the compact index and re-rank exactly."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        storage_with_mocks.config = storage_with_mocks.config.model_copy(
+            update={
+                "embedding_storage_precision": precision,
+                "embedding_rerank_factor": 8,
+            }
+        )
+        mock_conn.fetch.return_value = []
+
+        await storage_with_mocks.search_similar_chunks(
+            [0.1] * 512, limit=5, similarity_threshold=0.5
+        )
+
+        query, *args = mock_conn.fetch.call_args.args
+        assert f"ORDER BY {index_expression}" in query
+        assert "LIMIT $3 * $4" in query
+        assert "embedding::vector(512)" in query
+        assert args[1:] == [0.5, 5, 8]
+
+    @pytest.mark.asyncio
+    async def test_get_cached_response(self, storage_with_mocks, mock_connection_pool):
         """Test retrieving cached response."""
-        # Setup mock cache entry
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+
+        # The database returns the entry and its chunks as one JSON document
         cache_entry = {
             "id": "cache123",
             "keyword": "machine learning",
             "research_summary": "ML summary",
             "chunk_ids": ["chunk1", "chunk2"],
-            "hit_count": 5,
+            "hit_count": 6,
             "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
             "metadata": {},
+            "chunks": [
+                {"id": "chunk1", "content": "Content 1", "metadata": {}},
+                {"id": "chunk2", "content": "Content 2", "metadata": {}},
+            ],
         }
-
-        # Setup mock to return cache entry first, then chunks
-        mock_execute = MagicMock()
-
-        # First call returns cache entry
-        mock_execute.side_effect = [
-            MagicMock(data=[cache_entry]),  # First select (cache entry)
-            MagicMock(data=[]),  # Update call
-            MagicMock(
-                data=[
-                    {"id": "chunk1", "content": "Content 1"},
-                    {"id": "chunk2", "content": "Content 2"},
-                ]
-            ),  # Second select (chunks)
-        ]
-
-        storage_with_mocks.supabase.table().select().eq().execute = mock_execute
-        storage_with_mocks.supabase.table().update().eq().execute = mock_execute
-        storage_with_mocks.supabase.table().select().in_().execute = mock_execute
-        storage_with_mocks.supabase.table().execute = mock_execute
+        mock_conn.fetchval.return_value = json.dumps(cache_entry)
 
         # Get cached response
         result = await storage_with_mocks.get_cached_response("machine learning")
@@ -349,39 +504,213 @@ class TestVectorStorage:
         # Verify result
         assert result is not None
         assert result["keyword"] == "machine learning"
-        assert len(result["chunks"]) == 2
+        assert [chunk["id"] for chunk in result["chunks"]] == ["chunk1", "chunk2"]
+
+        # Verify a single read-only query looked up the entry
+        mock_conn.fetchval.assert_called_once()
+        query, cache_key, max_stale = mock_conn.fetchval.call_args.args
+        assert cache_key == storage_with_mocks._generate_cache_key("machine learning")
+        assert max_stale == timedelta(0)
+        assert "UPDATE" not in query
+        assert "c.embedding" not in query
+        storage_with_mocks.supabase.table.assert_not_called()
+
+        # The hit is buffered for the background flusher
+        assert cache_key in storage_with_mocks._access_stats.drain()
+        assert storage_with_mocks._access_stats_task is not None
+        await storage_with_mocks.close()
+        assert storage_with_mocks._access_stats_task is None
 
-        # Verify cache hit update was called
-        assert storage_with_mocks.supabase.table().update.call_count >= 1
+    @pytest.mark.asyncio
+    async def test_get_cached_response_with_snapshot(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test entries with a current snapshot skip their chunks."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = json.dumps(
+            {
+                "id": "cache123",
+                "keyword": "machine learning",
+                "findings_snapshot": "\\x01789c",
+                "chunks": [],
+            }
+        )
+
+        result = await storage_with_mocks.get_cached_response("machine learning")
+
+        assert result["findings_snapshot"] == b"\x01\x78\x9c"
+        query = mock_conn.fetchval.call_args.args[0]
+        assert "starts_with(doc->>'findings_snapshot', '\\x01')" in query
 
     @pytest.mark.asyncio
-    async def test_get_cached_response_expired(self, storage_with_mocks):
-        """Test retrieving expired cached response."""
-        # Setup expired cache entry
-        cache_entry = {
-            "id": "cache123",
-            "expires_at": (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat(),
-        }
+    async def test_get_similar_cached_response(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test a semantic lookup searches topics and counts the hit."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = json.dumps(
+            {"id": "cache_gw", "keyword": "global warming", "similarity": 0.9}
+        )
+
+        result = await storage_with_mocks.get_similar_cached_response(
+            [0.1] * 1536, similarity_threshold=0.85
+        )
+
+        assert result["keyword"] == "global warming"
+        query, vector, threshold, candidates = mock_conn.fetchval.call_args.args
+        assert "FROM cache_topics" in query
+        assert "ORDER BY t.embedding <=> $1::vector" in query
+        # Expired entries are skipped before the candidate topics are cut off
+        assert query.index("expires_at > NOW()") < query.index("LIMIT $3")
+        assert len(vector) == 1536
+        assert (threshold, candidates) == (0.85, 5)
+        assert "cache_gw" in storage_with_mocks._access_stats.drain()
+
+        # A speculative lookup leaves counting the hit to the caller
+        await storage_with_mocks.get_similar_cached_response(
+            [0.1] * 1536, record_hit=False
+        )
+        assert not storage_with_mocks._access_stats.drain()
+
+    @pytest.mark.asyncio
+    async def test_get_similar_cached_responses(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test a batch of lookups runs as one statement, in input order."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetch.return_value = [
+            (json.dumps({"ord": 2, "id": "cache_b", "keyword": "b"}),)
+        ]
+
+        results = await storage_with_mocks.get_similar_cached_responses(
+            [[0.1] * 512, [0.2] * 512, [0.3] * 512]
+        )
+
+        assert results == [None, {"id": "cache_b", "keyword": "b"}, None]
+        query, vectors, threshold, _ = mock_conn.fetch.call_args.args
+        assert "CROSS JOIN LATERAL" in query
+        assert "vector(512)" in query
+        assert len(vectors) == 3 * 512
+        assert threshold == storage_with_mocks.config.cache_similarity_threshold
+        assert await storage_with_mocks.get_similar_cached_responses([]) == []
+
+    @pytest.mark.asyncio
+    async def test_store_cache_topic(self, storage_with_mocks, mock_connection_pool):
+        """Test the topic blends the keyword with the entry's chunk centroid."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = np.array([0.0, 2.0], dtype=np.float32)
+
+        cache_key = await storage_with_mocks.store_cache_topic("keto", [1.0, 0.0])
+
+        assert cache_key == storage_with_mocks._generate_cache_key("keto")
+        assert mock_conn.fetchval.call_args.args[1] == cache_key
+        query, key, keyword, embedding = mock_conn.execute.call_args.args
+        assert "INSERT INTO cache_topics" in query
+        assert (key, keyword) == (cache_key, "keto")
+        np.testing.assert_allclose(embedding, [2**-0.5, 2**-0.5], rtol=1e-6)
 
-        # Mock the query
-        storage_with_mocks.supabase.table().select().eq().execute.return_value = (
-            MagicMock(data=[cache_entry])
+    @pytest.mark.asyncio
+    async def test_research_lock(self, storage_with_mocks):
+        """Test the advisory lock is held on one connection for the block."""
+        connection = AsyncMock()
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=connection)
+        pool.release = AsyncMock()
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+
+        async with storage_with_mocks.research_lock("keto", timeout=5) as locked:
+            assert locked
+            pool.release.assert_not_called()
+
+        (lock_query, key), (unlock_query, unlock_key) = [
+            call.args for call in connection.execute.call_args_list
+        ]
+        assert "pg_advisory_lock" in lock_query
+        assert "pg_advisory_unlock" in unlock_query
+        cache_key = storage_with_mocks._generate_cache_key("keto")
+        assert (
+            key
+            == unlock_key
+            == int.from_bytes(bytes.fromhex(cache_key[:16]), "big", signed=True)
         )
+        pool.release.assert_awaited_once_with(connection)
+
+    @pytest.mark.asyncio
+    async def test_research_lock_timeout(self, storage_with_mocks):
+        """Test research proceeds unlocked if the lock is not granted in time."""
+
+        async def lock_held_elsewhere(*args):
+            await asyncio.sleep(10)
+
+        connection = AsyncMock()
+        connection.execute.side_effect = lock_held_elsewhere
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=connection)
+        pool.release = AsyncMock()
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+
+        async with storage_with_mocks.research_lock("keto", timeout=0.01) as locked:
+            assert not locked
+
+        # The connection went back to the pool without an unlock
+        pool.release.assert_awaited_once_with(connection)
+        assert connection.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_cached_response_expired(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test retrieving expired cached response."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+
+        # Expired entries are filtered out by the query itself
+        mock_conn.fetchval.return_value = None
 
         # Get cached response
         result = await storage_with_mocks.get_cached_response("expired keyword")
 
         # Should return None for expired entry
         assert result is None
+        assert "expires_at > NOW()" in mock_conn.fetchval.call_args.args[0]
 
     @pytest.mark.asyncio
-    async def test_get_cached_response_not_found(self, storage_with_mocks):
-        """Test retrieving non-existent cached response."""
-        # Mock empty result
-        storage_with_mocks.supabase.table().select().eq().execute.return_value = (
-            MagicMock(data=[])
+    async def test_get_cached_response_stale(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test recently expired entries are returned when allowed."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = json.dumps(
+            {"id": "cache123", "keyword": "old keyword", "stale": True, "chunks": []}
+        )
+
+        result = await storage_with_mocks.get_cached_response(
+            "old keyword", max_stale=timedelta(hours=6), record_hit=False
         )
 
+        assert result["stale"] is True
+        query, _, max_stale = mock_conn.fetchval.call_args.args
+        assert "expires_at > NOW() - $2::interval" in query
+        assert max_stale == timedelta(hours=6)
+
+        # Lookups that do not count as hits leave the access stats alone
+        assert storage_with_mocks._access_stats.drain() == {}
+        assert storage_with_mocks._access_stats_task is None
+
+    @pytest.mark.asyncio
+    async def test_get_cached_response_not_found(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test retrieving non-existent cached response."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.return_value = None
+
         # Get cached response
         result = await storage_with_mocks.get_cached_response("not found")
 
@@ -389,14 +718,108 @@ class TestVectorStorage:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_get_statistics(self, storage_with_mocks):
+    async def test_get_cached_response_database_error(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test lookup errors are treated as a cache miss."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchval.side_effect = Exception("connection lost")
+
+        assert await storage_with_mocks.get_cached_response("keyword") is None
+
+    @pytest.mark.asyncio
+    async def test_flush_access_stats(self, storage_with_mocks, mock_connection_pool):
+        """Test buffered hits are written with one batched update."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        earlier = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        later = earlier + timedelta(minutes=5)
+        storage_with_mocks._access_stats.record("a", earlier)
+        storage_with_mocks._access_stats.record("a", later)
+        storage_with_mocks._access_stats.record("b", earlier)
+
+        assert await storage_with_mocks.flush_access_stats() == 2
+
+        mock_conn.execute.assert_called_once()
+        query, keys, hits, accessed = mock_conn.execute.call_args.args
+        assert "UPDATE cache_entries" in query
+        assert keys == ["a", "b"]
+        assert hits == [2, 1]
+        assert accessed == [later, earlier]
+        assert len(storage_with_mocks._access_stats) == 0
+
+        # Nothing pending means no database call
+        assert await storage_with_mocks.flush_access_stats() == 0
+        mock_conn.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_access_stats_failure_keeps_hits(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test hits are kept for the next flush when the update fails."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.execute.side_effect = Exception("connection lost")
+        storage_with_mocks._access_stats.record("a")
+
+        assert await storage_with_mocks.flush_access_stats() == 0
+        assert storage_with_mocks._access_stats.drain()["a"][0] == 1
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_access_stats(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test pending hits are written before the pool is closed."""
+        pool, mock_conn = mock_connection_pool
+        pool.close = AsyncMock()
+        storage_with_mocks._pool = pool
+        storage_with_mocks._access_stats.record("a")
+
+        await storage_with_mocks.close()
+
+        mock_conn.execute.assert_called_once()
+        assert mock_conn.execute.call_args.args[1] == ["a"]
+        pool.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_during_flush_keeps_hits(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test hits survive the periodic flusher being cancelled mid-write."""
+        pool, mock_conn = mock_connection_pool
+        pool.close = AsyncMock()
+        storage_with_mocks._pool = pool
+        storage_with_mocks.config.access_stats_flush_seconds = 0
+        writing = asyncio.Event()
+
+        async def slow_execute(*args):
+            writing.set()
+            await asyncio.sleep(10)
+
+        mock_conn.execute.side_effect = slow_execute
+        storage_with_mocks.record_cache_hit("a")
+        await writing.wait()
+
+        # The final flush in close() writes the cancelled batch instead
+        mock_conn.execute.side_effect = None
+        await storage_with_mocks.close()
+
+        assert mock_conn.execute.call_count == 2
+        assert mock_conn.execute.call_args.args[1] == ["a"]
+        assert mock_conn.execute.call_args.args[2] == [1]
+
+    @pytest.mark.asyncio
+    async def test_get_statistics(self, storage_with_mocks, mock_connection_pool):
         """Test getting storage statistics."""
-        # Mock chunk count
-        storage_with_mocks.supabase.table().select().execute.side_effect = [
-            MagicMock(data=[{"id": "1"}, {"id": "2"}, {"id": "3"}]),  # chunks
-            MagicMock(data=[{"id": "1"}, {"id": "2"}]),  # cache entries
-            MagicMock(data=[{"hit_count": 10}, {"hit_count": 5}]),  # hit counts
-        ]
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchrow.return_value = {
+            "total_chunks": 3,
+            "total_cache_entries": 2,
+            "total_cache_hits": 15,
+            "average_hits_per_entry": 7.5,
+        }
 
         # Get statistics
         stats = await storage_with_mocks.get_statistics()
@@ -409,12 +832,11 @@ class TestVectorStorage:
         assert stats["storage_initialized"] is True
 
     @pytest.mark.asyncio
-    async def test_get_statistics_error(self, storage_with_mocks):
+    async def test_get_statistics_error(self, storage_with_mocks, mock_connection_pool):
         """Test getting statistics with error."""
-        # Mock error
-        storage_with_mocks.supabase.table().select().execute.side_effect = Exception(
-            "DB error"
-        )
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        mock_conn.fetchrow.side_effect = Exception("DB error")
 
         # Get statistics
         stats = await storage_with_mocks.get_statistics()
@@ -441,6 +863,32 @@ class TestVectorStorage:
         # Verify delete called
         assert storage_with_mocks.supabase.table().delete.call_count >= 1
 
+    @pytest.mark.asyncio
+    async def test_cleanup_cache_keeps_shared_chunks(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test clearing keyword A keeps chunks entry B reuses from A."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        table = storage_with_mocks.supabase.table.return_value
+        table.execute.return_value = MagicMock(data=[{"id": "entry-a"}])
+        # Only A's chunks that no remaining entry lists are deleted
+        mock_conn.fetch.return_value = [{"id": "chunk-a2"}]
+        index = MagicMock()
+
+        with patch("rag.storage.open_near_duplicate_index", return_value=index):
+            count = await storage_with_mocks.cleanup_cache(keyword="A")
+
+        assert count == 2
+        # Entry B is not touched
+        table.eq.assert_called_once_with("keyword_normalized", "a")
+        query, pattern = mock_conn.fetch.call_args.args
+        assert "NOT EXISTS" in query
+        assert "unnest(chunk_ids)" in query
+        assert pattern == "%A%"
+        # Chunks B still uses stay in the near-duplicate index
+        index.forget.assert_called_once_with("research_chunks", ["chunk-a2"])
+
     @pytest.mark.asyncio
     async def test_bulk_search(self, storage_with_mocks, mock_connection_pool):
         """Test bulk similarity search."""
@@ -449,27 +897,78 @@ class TestVectorStorage:
         # Mock the _get_pool method
         storage_with_mocks._get_pool = AsyncMock(return_value=pool)
 
-        # Mock query results for each search
-        mock_conn.fetch.return_value = [
-            {
-                "id": "chunk1",
+        # Rows for every query come back together, tagged with the query position
+        def row(ord, chunk_id, similarity):
+            return {
+                "ord": ord,
+                "id": chunk_id,
                 "content": "Content",
-                "metadata": {},
+                "metadata": "{}",
                 "keyword": "test",
                 "chunk_index": 0,
                 "source_id": "doc1",
                 "created_at": "2024-01-01",
-                "similarity": 0.9,
+                "similarity": similarity,
             }
+
+        mock_conn.fetch.return_value = [
+            row(1, "chunk1", 0.9),
+            row(1, "chunk2", 0.8),
+            row(3, "chunk3", 0.7),
         ]
 
         # Perform bulk search
         embeddings = [[0.1] * 1536, [0.2] * 1536, [0.3] * 1536]
-        results = await storage_with_mocks.bulk_search(embeddings, limit_per_query=5)
+        results = await storage_with_mocks.bulk_search(
+            embeddings, limit_per_query=5, similarity_threshold=0.6
+        )
 
-        # Verify results
-        assert len(results) == 3
-        assert all(len(r) == 1 for r in results)  # Each has 1 result
+        # Verify results are grouped per query in input order
+        assert [[chunk["id"] for chunk, _ in r] for r in results] == [
+            ["chunk1", "chunk2"],
+            [],
+            ["chunk3"],
+        ]
+        assert results[0][0][0]["metadata"] == {}
 
-        # Verify queries executed
-        assert mock_conn.fetch.call_count == 3
+        # Verify all vectors were sent in one statement
+        mock_conn.fetch.assert_called_once()
+        query, vectors, threshold, limit = mock_conn.fetch.call_args.args
+        assert "CROSS JOIN LATERAL" in query
+        assert "q.embedding::vector" in query
+        assert len(vectors) == 3 * 1536
+        assert vectors[1536] == pytest.approx(0.2)
+        assert (threshold, limit) == (0.6, 5)
+
+    @pytest.mark.asyncio
+    async def test_bulk_search_quantized(
+        self, storage_with_mocks, mock_connection_pool
+    ):
+        """Test bulk search re-ranks quantized candidates for each query."""
+        pool, mock_conn = mock_connection_pool
+        storage_with_mocks._get_pool = AsyncMock(return_value=pool)
+        storage_with_mocks.config = storage_with_mocks.config.model_copy(
+            update={
+                "embedding_storage_precision": "float16",
+                "embedding_rerank_factor": 4,
+            }
+        )
+        mock_conn.fetch.return_value = []
+
+        results = await storage_with_mocks.bulk_search([[0.1] * 512] * 2, 5, 0.5)
+
+        assert results == [[], []]
+        query, *args = mock_conn.fetch.call_args.args
+        assert "embedding::halfvec(512) <=> q.embedding::halfvec(512)" in query
+        assert "$1" not in query.split("CROSS JOIN LATERAL")[1]
+        assert args[1:] == [0.5, 5, 4]
+
+    @pytest.mark.asyncio
+    async def test_bulk_search_empty_and_mismatched(self, storage_with_mocks):
+        """Test empty batches skip the database and mixed sizes are rejected."""
+        storage_with_mocks._get_pool = AsyncMock()
+
+        assert await storage_with_mocks.bulk_search([]) == []
+        with pytest.raises(ValueError):
+            await storage_with_mocks.bulk_search([[0.1] * 512, [0.1] * 256])
+        storage_with_mocks._get_pool.assert_not_called()
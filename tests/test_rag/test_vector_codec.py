@@ -0,0 +1,91 @@
+"""
+Tests for the binary pgvector codecs.
+
+Covers the wire format against pgvector's send functions, zero-copy
+decoding and registration on asyncpg connections.
+"""
+
+import struct
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from rag.vector_codec import (
+    decode_halfvec,
+    decode_vector,
+    encode_halfvec,
+    encode_vector,
+    register_vector_codecs,
+)
+
+
+class TestVectorCodec:
+    """Test encoding and decoding."""
+
+    def test_vector_wire_format(self):
+        """Test vectors encode as dimensions, unused, big-endian float4s."""
+        data = encode_vector([1.0, -2.5, 0.25])
+
+        assert data == struct.pack(">HH3f", 3, 0, 1.0, -2.5, 0.25)
+
+    def test_halfvec_wire_format(self):
+        """Test halfvecs encode as big-endian float16s."""
+        data = encode_halfvec(np.array([1.0, -2.0], dtype=np.float32))
+
+        assert data == struct.pack(">HH2e", 2, 0, 1.0, -2.0)
+
+    def test_round_trip(self):
+        """Test decoding returns the encoded float32 values."""
+        vector = np.random.default_rng(0).standard_normal(1536).astype(np.float32)
+
+        decoded = decode_vector(encode_vector(vector))
+
+        assert decoded.shape == (1536,)
+        np.testing.assert_array_equal(decoded, vector)
+        np.testing.assert_allclose(
+            decode_halfvec(encode_halfvec(vector)), vector, rtol=1e-3, atol=1e-3
+        )
+
+    def test_decode_is_a_view(self):
+        """Test decoding wraps the received buffer without copying."""
+        data = encode_vector([0.5, 0.75])
+
+        decoded = decode_vector(data)
+
+        assert not decoded.flags.owndata
+        assert not decoded.flags.writeable
+        assert float(np.dot(decoded, decoded)) == pytest.approx(0.8125)
+
+
+class TestRegisterVectorCodecs:
+    """Test codec registration."""
+
+    @pytest.mark.asyncio
+    async def test_registers_types_in_their_schema(self):
+        """Test codecs are registered for the schema pgvector lives in."""
+        connection = AsyncMock()
+        connection.fetch.return_value = [
+            {"typname": "vector", "schema": "extensions"},
+            {"typname": "halfvec", "schema": "extensions"},
+        ]
+
+        await register_vector_codecs(connection)
+
+        registered = {
+            call.args[0]: call.kwargs
+            for call in connection.set_type_codec.call_args_list
+        }
+        assert set(registered) == {"vector", "halfvec"}
+        assert registered["vector"]["schema"] == "extensions"
+        assert registered["vector"]["format"] == "binary"
+
+    @pytest.mark.asyncio
+    async def test_missing_extension_registers_nothing(self):
+        """Test connections to databases without pgvector still open."""
+        connection = AsyncMock()
+        connection.fetch.return_value = []
+
+        await register_vector_codecs(connection)
+
+        connection.set_type_codec.assert_not_called()
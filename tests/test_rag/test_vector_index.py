@@ -0,0 +1,181 @@
+"""
+Tests for vector index management.
+
+Covers HNSW parameter sizing, index inspection and the rebuild decisions
+made by optimize_vector_index.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rag.vector_index import (
+    describe_index,
+    optimize_vector_index,
+    plan_hnsw_parameters,
+    supports_iterative_scan,
+)
+
+
+@pytest.fixture
+def connection():
+    """Create a mock asyncpg connection for a table of 250,000 rows."""
+    connection = AsyncMock()
+    connection.fetchval.return_value = 250_000
+    return connection
+
+
+def executed(connection):
+    """Return the SQL statements run through execute."""
+    return [call.args[0] for call in connection.execute.call_args_list]
+
+
+class TestPlanHNSWParameters:
+    """Test plan_hnsw_parameters."""
+
+    @pytest.mark.parametrize(
+        "rows, m, ef_construction, ef_search",
+        [(0, 16, 64, 40), (250_000, 16, 128, 100), (5_000_000, 24, 200, 200)],
+    )
+    def test_parameters_grow_with_table(self, rows, m, ef_construction, ef_search):
+        """Test larger tables get wider graphs and searches."""
+        plan = plan_hnsw_parameters(rows)
+        assert (plan.m, plan.ef_construction, plan.ef_search) == (
+            m,
+            ef_construction,
+            ef_search,
+        )
+
+
+class TestSupportsIterativeScan:
+    """Test supports_iterative_scan."""
+
+    @pytest.mark.parametrize(
+        "version, expected",
+        [("0.8.0", True), ("0.10.1", True), ("0.7.4", False), (None, False)],
+    )
+    @pytest.mark.asyncio
+    async def test_version_check(self, connection, version, expected):
+        """Test iterative scans are detected from the extension version."""
+        connection.fetchval.return_value = version
+        assert await supports_iterative_scan(connection) is expected
+
+
+class TestOptimizeVectorIndex:
+    """Test describe_index and optimize_vector_index."""
+
+    @pytest.mark.asyncio
+    async def test_describe_index(self, connection):
+        """Test reloptions are returned as a dict."""
+        connection.fetchrow.return_value = {
+            "method": "hnsw",
+            "reloptions": ["m=16", "ef_construction=64"],
+            "valid": True,
+        }
+
+        info = await describe_index(connection, "idx_chunks_embedding")
+
+        assert info == {
+            "method": "hnsw",
+            "options": {"m": "16", "ef_construction": "64"},
+            "valid": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_replaces_ivfflat_index(self, connection):
+        """Test an IVFFlat index is swapped for a concurrently built HNSW one."""
+        connection.fetchrow.return_value = {
+            "method": "ivfflat",
+            "reloptions": ["lists=100"],
+            "valid": True,
+        }
+
+        report = await optimize_vector_index(connection)
+
+        statements = executed(connection)
+        create = next(s for s in statements if s.startswith("CREATE INDEX"))
+        assert 'CONCURRENTLY "idx_chunks_embedding_rebuild"' in create
+        assert "USING hnsw" in create
+        assert "m = 16, ef_construction = 128" in create
+        assert 'DROP INDEX CONCURRENTLY "idx_chunks_embedding"' in statements
+        assert any("RENAME TO" in s for s in statements)
+        assert statements[-1] == 'ANALYZE "research_chunks"'
+        assert report["rebuilt"] and report["analyzed"]
+        assert report["recommended_ef_search"] == 100
+
+    @pytest.mark.asyncio
+    async def test_matching_index_is_only_analyzed(self, connection):
+        """Test an index built with the planned parameters is kept."""
+        connection.fetchrow.return_value = {
+            "method": "hnsw",
+            "reloptions": ["m=16", "ef_construction=128"],
+            "valid": True,
+        }
+
+        report = await optimize_vector_index(connection)
+
+        assert executed(connection) == ['ANALYZE "research_chunks"']
+        assert report["rebuilt"] is False
+
+    @pytest.mark.asyncio
+    async def test_missing_index_is_created(self, connection):
+        """Test a missing index is built without dropping anything."""
+        connection.fetchrow.return_value = None
+
+        report = await optimize_vector_index(connection)
+
+        statements = executed(connection)
+        assert 'DROP INDEX CONCURRENTLY "idx_chunks_embedding"' not in statements
+        assert report["rebuilt"] is True
+
+    @pytest.mark.asyncio
+    async def test_dry_run_changes_nothing(self, connection):
+        """Test a dry run reports the plan without running DDL."""
+        connection.fetchrow.return_value = None
+
+        report = await optimize_vector_index(connection, dry_run=True)
+
+        connection.execute.assert_not_called()
+        assert report["would_rebuild"] is True
+
+    @pytest.mark.parametrize(
+        "precision, index, definition",
+        [
+            (
+                "float16",
+                "idx_chunks_embedding_halfvec",
+                '("embedding"::halfvec(512)) halfvec_cosine_ops',
+            ),
+            (
+                "binary",
+                "idx_chunks_embedding_binary",
+                '(binary_quantize("embedding")::bit(512)) bit_hamming_ops',
+            ),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_quantized_precision_builds_its_own_index(
+        self, connection, precision, index, definition
+    ):
+        """Test quantized storage rebuilds its expression index, not the full one."""
+        connection.fetchrow.return_value = None
+
+        report = await optimize_vector_index(
+            connection, precision=precision, dimensions=512
+        )
+
+        connection.fetchrow.assert_called_once()
+        assert connection.fetchrow.call_args.args[1] == index
+        create = next(s for s in executed(connection) if s.startswith("CREATE INDEX"))
+        assert f'"{index}_rebuild"' in create
+        assert f"USING hnsw ({definition})" in create
+        assert not any('"idx_chunks_embedding"' in s for s in executed(connection))
+        assert report["index"] == index
+
+    @pytest.mark.asyncio
+    async def test_quantized_precision_needs_dimensions(self, connection):
+        """Test a quantized index cannot be built without its dimensions."""
+        with pytest.raises(ValueError):
+            await optimize_vector_index(connection, precision="binary")
+
+        connection.execute.assert_not_called()
@@ -36,7 +36,7 @@ class TestEmbeddingResult:
         )
 
         assert result.text == "Test text"
-        assert result.embedding == [0.1, 0.2, 0.3]
+        assert result.embedding == pytest.approx([0.1, 0.2, 0.3])
         assert result.model == "text-embedding-ada-002"
         assert result.token_count == 10
 
@@ -72,7 +72,7 @@ class TestEmbeddingResult:
             model="model",
             token_count=0,
         )
-        assert result.embedding == []
+        assert len(result.embedding) == 0
 
 
 class TestEmbeddingCache:
@@ -227,7 +227,11 @@ class TestEmbeddingGenerator:
 
         rag_config = Mock()
         rag_config.embedding_model_name = "text-embedding-3-small"
+        rag_config.embedding_dimensions = 1536
         rag_config.embedding_batch_size = 10
+        rag_config.embedding_max_batch_tokens = 250_000
+        rag_config.embedding_requests_per_minute = 3_000
+        rag_config.embedding_tokens_per_minute = 1_000_000
 
         return main_config, rag_config
 
@@ -346,7 +350,10 @@ class TestEmbeddingGenerator:
             with patch("rag.embeddings.get_rag_config", return_value=rag_config):
                 generator = EmbeddingGenerator()
 
-                # Mock the OpenAI client
+                # Mock the OpenAI client with one vector per input
+                mock_openai_response.data = [
+                    Mock(embedding=[0.1] * 1536, index=i) for i in range(3)
+                ]
                 generator.client.embeddings.create = AsyncMock(
                     return_value=mock_openai_response
                 )
@@ -354,6 +361,8 @@ class TestEmbeddingGenerator:
                 texts = ["Text 1", "Text 2", "Text 3"]
                 results = await generator.generate_embeddings(texts)
 
+                # All texts fit in a single request
+                generator.client.embeddings.create.assert_called_once()
                 assert len(results) == 3
                 for i, result in enumerate(results):
                     assert result.text == texts[i]
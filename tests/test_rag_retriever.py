@@ -137,6 +137,14 @@ class TestResearchRetriever:
         config = Mock()
         config.cache_similarity_threshold = 0.8
         config.cache_ttl_hours = 24
+        config.ingest_workers = 1
+        config.ingest_parallel_min_chars = 100_000
+        config.findings_cache_size = 0
+        config.findings_cache_ttl_seconds = 300.0
+        config.speculative_cache_lookup = False
+        config.research_lock_enabled = False
+        config.cache_stale_grace_hours = 0.0
+        config.cache_max_background_refreshes = 2
         return config
 
     @pytest.fixture
@@ -17,6 +17,7 @@ from rag.config import RAGConfig
 from rag.embeddings import EmbeddingResult
 from rag.processor import TextChunk
 from rag.storage import VectorStorage
+from rag.vector_codec import register_vector_codecs
 
 
 class TestVectorStorage:
@@ -36,6 +37,18 @@ class TestVectorStorage:
         config.similarity_threshold = 0.7
         return config
 
+    @pytest.fixture
+    def mock_pool(self):
+        """Create a mock connection pool and the connection it hands out."""
+        pool = MagicMock()
+        conn = AsyncMock()
+        conn.transaction = MagicMock()
+        conn.transaction.return_value.__aenter__ = AsyncMock(return_value=None)
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=None)
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+        return pool, conn
+
     @pytest.fixture
     def sample_chunks(self):
         """Create sample text chunks for testing."""
@@ -133,6 +146,7 @@ class TestVectorStorage:
                     max_inactive_connection_lifetime=300,
                     command_timeout=mock_rag_config.connection_timeout,
                     statement_cache_size=0,
+                    init=register_vector_codecs,
                 )
 
     @pytest.mark.asyncio
@@ -181,22 +195,14 @@ class TestVectorStorage:
             assert "must match" in str(exc_info.value)
 
     @pytest.mark.asyncio
-    async def test_store_cache_entry(self, mock_rag_config):
+    async def test_store_cache_entry(self, mock_rag_config, mock_pool):
         """Test storing cache entries."""
-        with patch("rag.storage.create_client") as mock_create_client:
-            mock_client = Mock()
-            mock_table = Mock()
-            mock_upsert = Mock()
-            mock_execute = Mock()
-
-            # Setup mock chain
-            mock_execute.return_value = Mock(data=[{"id": "cache123"}])
-            mock_upsert.return_value = mock_execute
-            mock_table.return_value.upsert = mock_upsert
-            mock_client.table = mock_table
-            mock_create_client.return_value = mock_client
+        pool, conn = mock_pool
+        conn.fetchval.return_value = "cache123"
 
+        with patch("rag.storage.create_client"):
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
             result = await storage.store_cache_entry(
                 "test keyword",
                 "Research summary",
@@ -205,7 +211,7 @@ class TestVectorStorage:
             )
 
             assert result == "cache123"
-            mock_client.table.assert_called_with("cache_entries")
+            assert "INSERT INTO cache_entries" in conn.fetchval.call_args.args[0]
 
     @pytest.mark.asyncio
     async def test_search_similar_chunks(self, mock_rag_config):
@@ -334,39 +340,26 @@ class TestVectorStorage:
             assert result is None
 
     @pytest.mark.asyncio
-    async def test_get_statistics(self, mock_rag_config):
+    async def test_get_statistics(self, mock_rag_config, mock_pool):
         """Test getting storage statistics."""
-        with patch("rag.storage.create_client") as mock_create_client:
-            mock_client = Mock()
-            mock_table = Mock()
-            mock_select = Mock()
-            mock_execute = Mock()
-
-            # Mock chunks count
-            mock_execute.return_value = Mock(
-                data=[{"id": f"chunk{i}"} for i in range(10)]
-            )
-            mock_select.return_value = mock_execute
-            mock_table.return_value.select = mock_select
-
-            # Mock cache entries with hit counts
-            cache_data = [{"hit_count": 5}, {"hit_count": 10}, {"hit_count": 3}]
-            mock_select.return_value.execute.side_effect = [
-                Mock(data=[{"id": f"chunk{i}"} for i in range(10)]),
-                Mock(data=[{"id": f"cache{i}"} for i in range(3)]),
-                Mock(data=cache_data),
-            ]
-
-            mock_client.table = mock_table
-            mock_create_client.return_value = mock_client
+        pool, conn = mock_pool
+        conn.fetchrow.return_value = {
+            "total_chunks": 10,
+            "total_cache_entries": 3,
+            "total_cache_hits": 18,
+            "average_hits_per_entry": 6.0,
+        }
 
+        with patch("rag.storage.create_client"):
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
             stats = await storage.get_statistics()
 
             assert stats["total_chunks"] == 10
             assert stats["total_cache_entries"] == 3
             assert stats["total_cache_hits"] == 18
             assert stats["average_hits_per_entry"] == 6.0
+            storage.supabase.table.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_cleanup_expired_cache(self, mock_rag_config):
@@ -396,121 +389,80 @@ class TestVectorStorage:
             mock_delete.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_bulk_search(self, mock_rag_config):
+    async def test_bulk_search(self, mock_rag_config, mock_pool):
         """Test bulk similarity search."""
+        pool, conn = mock_pool
+        conn.fetch.return_value = [
+            {
+                "ord": 2,
+                "id": "chunk1",
+                "content": "Test",
+                "metadata": {},
+                "keyword": "test",
+                "chunk_index": 0,
+                "source_id": None,
+                "created_at": None,
+                "similarity": 0.9,
+            }
+        ]
+
         with patch("rag.storage.create_client"):
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
 
-            # Mock search_similar_chunks
-            with patch.object(storage, "search_similar_chunks") as mock_search:
-                mock_search.return_value = [({"id": "chunk1", "content": "Test"}, 0.9)]
-
-                embeddings = [[0.1] * 1536, [0.2] * 1536]
-                results = await storage.bulk_search(embeddings, limit_per_query=3)
+            embeddings = [[0.1] * 1536, [0.2] * 1536]
+            results = await storage.bulk_search(embeddings, limit_per_query=3)
 
-                assert len(results) == 2
-                assert mock_search.call_count == 2
+            assert len(results) == 2
+            assert results[0] == []
+            assert results[1][0][0]["id"] == "chunk1"
+            conn.fetch.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_cleanup_cache_by_age(self, mock_rag_config):
+    async def test_cleanup_cache_by_age(self, mock_rag_config, mock_pool):
         """Test cache cleanup by age."""
+        pool, conn = mock_pool
+        conn.fetch.return_value = [{"id": f"chunk{i}"} for i in range(5)]
+
         with patch("rag.storage.create_client") as mock_create_client:
             mock_client = Mock()
-            mock_table = Mock()
-            mock_delete = Mock()
-            mock_lt = Mock()
-            mock_execute = Mock()
-
-            # Setup mock chains for both tables
-            mock_execute.return_value = Mock(data=[{"id": f"old{i}"} for i in range(3)])
-            mock_lt.return_value = mock_execute
-            mock_delete.return_value.lt = mock_lt
-            mock_table.return_value.delete = mock_delete
-
-            # Different return values for each table
-            mock_table.side_effect = [
-                Mock(
-                    delete=Mock(
-                        return_value=Mock(
-                            lt=Mock(
-                                return_value=Mock(
-                                    execute=Mock(
-                                        return_value=Mock(
-                                            data=[{"id": f"cache{i}"} for i in range(3)]
-                                        )
-                                    )
-                                )
-                            )
-                        )
-                    )
-                ),
-                Mock(
-                    delete=Mock(
-                        return_value=Mock(
-                            lt=Mock(
-                                return_value=Mock(
-                                    execute=Mock(
-                                        return_value=Mock(
-                                            data=[{"id": f"chunk{i}"} for i in range(5)]
-                                        )
-                                    )
-                                )
-                            )
-                        )
-                    )
-                ),
-            ]
-
-            mock_client.table = mock_table
+            mock_client.table.return_value.delete.return_value.lt.return_value.execute.return_value = Mock(
+                data=[{"id": f"cache{i}"} for i in range(3)]
+            )
             mock_create_client.return_value = mock_client
 
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
             deleted_count = await storage.cleanup_cache(older_than_days=7)
 
             assert deleted_count == 8  # 3 cache entries + 5 chunks
+            mock_client.table.assert_called_once_with("cache_entries")
+            query, cutoff = conn.fetch.call_args.args
+            assert "c.created_at < $1" in query
+            assert "NOT EXISTS" in query
+            assert cutoff < datetime.now(timezone.utc) - timedelta(days=6)
 
     @pytest.mark.asyncio
-    async def test_cleanup_cache_by_keyword(self, mock_rag_config):
+    async def test_cleanup_cache_by_keyword(self, mock_rag_config, mock_pool):
         """Test cache cleanup by keyword."""
+        pool, conn = mock_pool
+        conn.fetch.return_value = [{"id": f"chunk{i}"} for i in range(3)]
+
         with patch("rag.storage.create_client") as mock_create_client:
             mock_client = Mock()
-            mock_table = Mock()
-
-            # Setup different mocks for different tables
-            cache_table_mock = Mock()
-            chunks_table_mock = Mock()
-
-            # Cache entries deletion
-            cache_delete = Mock()
-            cache_eq = Mock(
-                return_value=Mock(
-                    execute=Mock(return_value=Mock(data=[{"id": "cache1"}]))
-                )
-            )
-            cache_delete.return_value.eq = cache_eq
-            cache_table_mock.delete = Mock(return_value=cache_delete)
-
-            # Chunks deletion
-            chunks_delete = Mock()
-            chunks_ilike = Mock(
-                return_value=Mock(
-                    execute=Mock(
-                        return_value=Mock(data=[{"id": f"chunk{i}"} for i in range(3)])
-                    )
-                )
+            mock_client.table.return_value.delete.return_value.eq.return_value.execute.return_value = Mock(
+                data=[{"id": "cache1"}]
             )
-            chunks_delete.return_value.ilike = chunks_ilike
-            chunks_table_mock.delete = Mock(return_value=chunks_delete)
-
-            # Return different table mocks based on call
-            mock_table.side_effect = [cache_table_mock, chunks_table_mock]
-            mock_client.table = mock_table
             mock_create_client.return_value = mock_client
 
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
             deleted_count = await storage.cleanup_cache(keyword="test keyword")
 
             assert deleted_count == 4  # 1 cache entry + 3 chunks
+            query, pattern = conn.fetch.call_args.args
+            assert "c.keyword ILIKE $1" in query
+            assert pattern == "%test keyword%"
 
     @pytest.mark.asyncio
     async def test_warm_pool(self, mock_rag_config):
@@ -573,71 +525,80 @@ class TestVectorStorage:
             assert key1 == key2
 
     @pytest.mark.asyncio
-    async def test_get_cache_stats(self, mock_rag_config):
+    async def test_get_cache_stats(self, mock_rag_config, mock_pool):
         """Test comprehensive cache statistics."""
-        with patch("rag.storage.create_client") as mock_create_client:
-            mock_client = Mock()
-            mock_table = Mock()
-
-            # Mock responses for different queries
-            chunks_data = [
-                {"content": "x" * 100, "keyword": "test1"},
-                {"content": "y" * 200, "keyword": "test2"},
-            ]
-            cache_data = [
-                {
-                    "keyword": "test1",
-                    "created_at": "2024-01-01T00:00:00Z",
-                }
-            ]
-
-            mock_select = Mock()
-            mock_select.return_value.execute.side_effect = [
-                Mock(data=chunks_data),  # chunks query
-                Mock(data=cache_data),  # cache query
-            ]
-            mock_table.return_value.select = mock_select
-            mock_client.table = mock_table
-            mock_create_client.return_value = mock_client
+        pool, conn = mock_pool
+        conn.fetchrow.return_value = {
+            "research_chunks": 2,
+            "avg_chunk_size": 150.0,
+            "cache_entries": 1,
+            "unique_keywords": 1,
+            "storage_bytes": 512,
+            "oldest_entry": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "newest_entry": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        }
 
+        with patch("rag.storage.create_client"):
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
             stats = await storage.get_cache_stats()
 
             assert stats["research_chunks"] == 2
             assert stats["cache_entries"] == 1
+            assert stats["total_entries"] == 3
             assert stats["unique_keywords"] == 1
             assert stats["avg_chunk_size"] == 150
+            assert stats["oldest_entry"] == "2024-01-01T00:00:00+00:00"
+
+            # Aggregated in one query without reading rows back
+            conn.fetchrow.assert_called_once()
+            query = conn.fetchrow.call_args.args[0]
+            assert "count(*)" in query
+            assert "embedding" not in query
+            storage.supabase.table.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_get_keyword_distribution(self, mock_rag_config):
-        """Test keyword distribution analysis."""
-        with patch("rag.storage.create_client") as mock_create_client:
-            mock_client = Mock()
-            mock_table = Mock()
-            mock_select = Mock()
-            mock_execute = Mock()
+    async def test_get_cache_stats_empty(self, mock_rag_config, mock_pool):
+        """Test statistics for empty tables."""
+        pool, conn = mock_pool
+        conn.fetchrow.return_value = {
+            "research_chunks": 0,
+            "avg_chunk_size": 0.0,
+            "cache_entries": 0,
+            "unique_keywords": 0,
+            "storage_bytes": 0,
+            "oldest_entry": None,
+            "newest_entry": None,
+        }
 
-            # Mock keyword data
-            chunks_data = [
-                {"keyword": "AI"},
-                {"keyword": "AI"},
-                {"keyword": "ML"},
-                {"keyword": "AI"},
-                {"keyword": "ML"},
-                {"keyword": "DL"},
-            ]
-            mock_execute.return_value = Mock(data=chunks_data)
-            mock_select.return_value = mock_execute
-            mock_table.return_value.select = mock_select
-            mock_client.table = mock_table
-            mock_create_client.return_value = mock_client
+        with patch("rag.storage.create_client"):
+            storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
+            stats = await storage.get_cache_stats()
+
+            assert stats["total_entries"] == 0
+            assert stats["oldest_entry"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_distribution(self, mock_rag_config, mock_pool):
+        """Test keyword distribution analysis."""
+        pool, conn = mock_pool
+        conn.fetch.return_value = [
+            {"keyword": "AI", "chunks": 3},
+            {"keyword": "ML", "chunks": 2},
+        ]
 
+        with patch("rag.storage.create_client"):
             storage = VectorStorage(mock_rag_config)
+            storage._pool = pool
             distribution = await storage.get_keyword_distribution(limit=2)
 
-            assert len(distribution) == 2
-            assert distribution[0] == ("AI", 3)
-            assert distribution[1] == ("ML", 2)
+            assert distribution == [("AI", 3), ("ML", 2)]
+
+            # Counted and limited by the database
+            query, limit = conn.fetch.call_args.args
+            assert "GROUP BY keyword" in query
+            assert limit == 2
 
     @pytest.mark.asyncio
     async def test_search_similar_empty_results(self, mock_rag_config):
@@ -20,7 +20,7 @@ from config import Config
 from models import TavilySearchResponse, TavilySearchResult
 
 # Import tools and utilities to test
-from research_agent.tools import search_academic
+from research_agent.tools import close_retriever, search_academic
 from tools import (
     TavilyAPIError,
     TavilyAuthError,
@@ -112,6 +112,23 @@ class TestResearchAgentTools:
             with pytest.raises(TavilyAPIError):
                 await search_academic(ctx, "test query", config)
 
+    @pytest.mark.asyncio
+    async def test_close_retriever(self):
+        """Test closing the global retriever flushes it and drops the instance."""
+        retriever = Mock()
+        retriever.cleanup = AsyncMock(side_effect=RuntimeError("pool closed"))
+
+        with patch("research_agent.tools._retriever_instance", retriever):
+            # Cleanup errors are logged, not raised
+            await close_retriever()
+            # The instance was dropped, so closing again does nothing
+            await close_retriever()
+            retriever.cleanup.assert_awaited_once()
+
+            # Nothing to close the second time
+            await close_retriever()
+            retriever.cleanup.assert_awaited_once()
+
 
 class TestTavilyClient:
     """Test cases for Tavily API client."""